@@ -0,0 +1,63 @@
+"""Micro-benchmark of the per-call overhead of docval argument parsing.
+
+Compares the compiled fast-path parser that docval generates for each decorated function against the generic
+argument parser that is used when a check fails, for a few representative docval signatures.
+
+Usage: python benchmarks/docval_overhead.py [number of calls]
+"""
+import sys
+import timeit
+
+import numpy as np
+
+import hdmf.utils
+from hdmf.utils import docval, get_docval
+
+# the generic parser that was used for every call before docval compiled per-function parsers
+_parse_args = vars(hdmf.utils)['__parse_args']
+
+
+class Foo:
+
+    @docval({'name': 'name', 'type': str, 'doc': 'the name'},
+            {'name': 'value', 'type': int, 'doc': 'an int'})
+    def two_args(self, **kwargs):
+        return kwargs
+
+    @docval({'name': 'name', 'type': str, 'doc': 'the name'},
+            {'name': 'description', 'type': str, 'doc': 'a description', 'default': 'no description'},
+            {'name': 'data', 'type': ('array_data', 'data'), 'doc': 'the data', 'default': list()},
+            {'name': 'table', 'type': 'Foo', 'doc': 'a table', 'default': None},
+            {'name': 'scale', 'type': float, 'doc': 'a float', 'default': 1.0})
+    def vector_data_like(self, **kwargs):
+        return kwargs
+
+    @docval({'name': 'data', 'type': 'array_data', 'doc': 'the data', 'shape': (None, 2)},
+            {'name': 'enum', 'type': str, 'doc': 'an enum', 'enum': ['a', 'b'], 'default': 'a'},
+            {'name': 'extra', 'type': dict, 'doc': 'a dict', 'default': None},
+            allow_extra=True)
+    def shape_enum_extra(self, **kwargs):
+        return kwargs
+
+
+def bench(number):
+    foo = Foo()
+    data = np.zeros((10, 2))
+    cases = [
+        ('two_args', foo.two_args, ('a', 1), dict()),
+        ('vector_data_like', foo.vector_data_like, ('a', ), dict(data=[1, 2, 3], table=foo)),
+        ('shape_enum_extra', foo.shape_enum_extra, (data, ), dict(enum='b', other=1)),
+    ]
+    print('%-20s %16s %16s %10s' % ('signature', 'generic (us)', 'compiled (us)', 'speedup'))
+    for name, func, args, kwargs in cases:
+        validator = list(get_docval(func))
+        opts = dict(allow_extra=func.__docval__['allow_extra'])
+        generic = timeit.timeit(lambda: _parse_args(validator, args, kwargs, **opts), number=number)
+        compiled = timeit.timeit(lambda: func(*args, **kwargs), number=number)
+        generic_us = generic / number * 1e6
+        compiled_us = compiled / number * 1e6
+        print('%-20s %16.2f %16.2f %9.1fx' % (name, generic_us, compiled_us, generic_us / compiled_us))
+
+
+if __name__ == '__main__':
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
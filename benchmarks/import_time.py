@@ -0,0 +1,48 @@
+"""Benchmark of the time it takes to import HDMF in a fresh Python process.
+
+Runs ``python -X importtime -c "import <module>"`` several times in subprocesses and reports the median total import
+time along with the modules that take the most time to import (including the modules they import).
+
+Usage: python benchmarks/import_time.py [module, default: hdmf.common] [number of runs, default: 5]
+"""
+import re
+import statistics
+import subprocess
+import sys
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+def import_times(module):
+    """Import the module in a new process and return a dict mapping each imported module to its cumulative time (us)
+    and the total time (us) to import the module"""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import %s' % module],
+                          capture_output=True, text=True, check=True)
+    times = dict()
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match is not None:
+            times[match.group(4)] = int(match.group(2))
+    return times, times[module]
+
+
+def bench(module, runs, top=15):
+    totals = list()
+    cumulative = dict()
+    for _ in range(runs):
+        times, total = import_times(module)
+        totals.append(total)
+        for name, t in times.items():
+            cumulative.setdefault(name, list()).append(t)
+    print('import %s: median %.1f ms over %d runs (min %.1f ms, max %.1f ms)'
+          % (module, statistics.median(totals) / 1e3, runs, min(totals) / 1e3, max(totals) / 1e3))
+    print()
+    print('%-50s %12s' % ('module (cumulative)', 'median (ms)'))
+    medians = sorted(((statistics.median(t), name) for name, t in cumulative.items()), reverse=True)
+    for t, name in medians[:top]:
+        print('%-50s %12.1f' % (name, t / 1e3))
+
+
+if __name__ == '__main__':
+    bench(sys.argv[1] if len(sys.argv) > 1 else 'hdmf.common',
+          int(sys.argv[2]) if len(sys.argv) > 2 else 5)
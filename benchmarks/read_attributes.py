@@ -0,0 +1,76 @@
+"""Benchmark of reading the attributes of a file with many small groups.
+
+Writes a synthetic file with many groups that each have the attributes of a typical data type and a small dataset,
+then compares reading all attributes with the high-level h5py API (as HDF5IO did before it used the low-level API)
+against the attribute reader of HDF5IO, and reports the time of HDF5IO.read_builder.
+
+Usage: python benchmarks/read_attributes.py [number of groups, default: 20000]
+"""
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+import h5py
+import numpy as np
+
+from hdmf.backends.hdf5 import HDF5IO
+
+
+def write_file(path, num_groups):
+    with h5py.File(path, 'w') as f:
+        for i in range(num_groups):
+            group = f.create_group('group%d' % i)
+            group.attrs['data_type'] = 'DynamicTable'
+            group.attrs['namespace'] = 'hdmf-common'
+            group.attrs['object_id'] = str(uuid.uuid4())
+            group.attrs['description'] = 'a small table'
+            group.attrs['colnames'] = np.array(['x'], dtype=h5py.string_dtype())
+            dset = group.create_dataset('x', data=np.arange(3))
+            dset.attrs['data_type'] = 'VectorData'
+            dset.attrs['namespace'] = 'hdmf-common'
+            dset.attrs['object_id'] = str(uuid.uuid4())
+            dset.attrs['description'] = 'a column'
+            dset.attrs['resolution'] = 0.5
+
+
+def read_attrs_high_level(h5obj):
+    ret = dict()
+    for k, v in h5obj.attrs.items():
+        if isinstance(v, bytes):
+            v = v.decode('UTF-8')
+        ret[k] = v
+    return ret
+
+
+def bench(num_groups):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'attributes.h5')
+        write_file(path, num_groups)
+        with HDF5IO(path, mode='r') as io:
+            f = io._file
+            names = list()
+            f.visit(names.append)
+            num_attrs = sum(len(f[name].attrs) for name in names)
+            read_attrs = getattr(io, '_HDF5IO__read_attrs')
+            start = time.perf_counter()
+            for name in names:
+                read_attrs_high_level(f[name])
+            high_level = time.perf_counter() - start
+            start = time.perf_counter()
+            for name in names:
+                read_attrs(f[name])
+            low_level = time.perf_counter() - start
+        with HDF5IO(path, mode='r') as io:
+            start = time.perf_counter()
+            io.read_builder()
+            read_builder = time.perf_counter() - start
+    print('%d objects with %d attributes' % (len(names), num_attrs))
+    print('%-30s %10.3f s' % ('h5py attrs.items()', high_level))
+    print('%-30s %10.3f s (%.1fx)' % ('HDF5IO attribute reader', low_level, high_level / low_level))
+    print('%-30s %10.3f s' % ('HDF5IO.read_builder', read_builder))
+
+
+if __name__ == '__main__':
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
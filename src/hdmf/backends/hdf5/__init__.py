@@ -1,3 +1,4 @@
-from . import h5_utils, h5tools
+from . import h5_index, h5_layout, h5_utils, h5tools
+from .h5_layout import H5LayoutPlanner
 from .h5_utils import H5RegionSlicer, H5DataIO
 from .h5tools import HDF5IO, H5SpecWriter, H5SpecReader
@@ -0,0 +1,129 @@
+"""
+Sidecar index files that store the builder tree of an HDF5 file, used by HDF5IO to rebuild the builder tree of a file
+without reading the attributes and links of every group and dataset in the file
+
+The index is a JSON file that stores a tree of tuples and the size and modification time of the indexed file, so that
+an index of a file that has changed since the index was written is not used. Tuples, dicts, bytes, and NumPy scalars and
+arrays are stored as JSON objects with a single key that names their type, so that they are read back unchanged
+without unpickling or evaluating anything from the index file.
+"""
+import base64
+import json
+import os
+
+import numpy as np
+
+INDEX_VERSION = 2
+
+__all__ = ['INDEX_VERSION', 'get_index_key', 'load_index', 'save_index']
+
+# the kinds of NumPy arrays and scalars that can be stored in an index
+_ARRAY_KINDS = 'biufSUO'
+
+
+def _encode_index_value(obj):
+    """Convert a value of the tree to an object that can be written to JSON"""
+    if obj is None or type(obj) in (str, bool, int, float):
+        return obj
+    if isinstance(obj, list):
+        return [_encode_index_value(v) for v in obj]
+    if isinstance(obj, tuple):
+        return {'__tuple__': [_encode_index_value(v) for v in obj]}
+    if isinstance(obj, dict):
+        if not all(isinstance(k, str) for k in obj):
+            raise TypeError("Dicts with keys that are not strings cannot be indexed")
+        return {'__dict__': {k: _encode_index_value(v) for k, v in obj.items()}}
+    if type(obj) is bytes:
+        return {'__bytes__': base64.b64encode(obj).decode('ascii')}
+    if isinstance(obj, (np.ndarray, np.generic)) and obj.dtype.kind in _ARRAY_KINDS:
+        if isinstance(obj, np.generic):
+            return {'__scalar__': [obj.dtype.str, _encode_index_value(obj.item())]}
+        values = [_encode_index_value(v) for v in obj.ravel().tolist()]
+        return {'__ndarray__': [obj.dtype.str, list(obj.shape), values]}
+    raise TypeError("Object of type %s cannot be indexed" % type(obj).__name__)
+
+
+def _decode_index_value(obj):
+    """Convert an object read from JSON to a value of the tree"""
+    if isinstance(obj, list):
+        return [_decode_index_value(v) for v in obj]
+    if not isinstance(obj, dict):
+        return obj
+    (tag, value), = obj.items()
+    if tag == '__tuple__':
+        return tuple(_decode_index_value(v) for v in value)
+    if tag == '__dict__':
+        return {k: _decode_index_value(v) for k, v in value.items()}
+    if tag == '__bytes__':
+        return base64.b64decode(value)
+    if tag == '__scalar__':
+        dtype, item = value
+        return np.dtype(dtype).type(_decode_index_value(item))
+    if tag == '__ndarray__':
+        dtype, shape, values = value
+        dtype = np.dtype(dtype)
+        if dtype.kind not in _ARRAY_KINDS:
+            raise ValueError("Arrays of dtype %s cannot be indexed" % dtype)
+        values = [_decode_index_value(v) for v in values]
+        if dtype.kind == 'O':
+            ret = np.empty(len(values), dtype=dtype)
+            ret[:] = values
+        else:
+            ret = np.array(values, dtype=dtype)
+        return ret.reshape(shape)
+    raise ValueError("Unknown index value type '%s'" % tag)
+
+
+def get_index_key(path):
+    """
+    Get the key that identifies the current version of a file
+
+    :param path: the path to the file
+    :type path: str
+    :return: the absolute path, size, and modification time in nanoseconds of the file
+    :rtype: tuple
+    """
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+
+def load_index(index_path, key):
+    """
+    Load the tree stored in an index file
+
+    :param index_path: the path to the index file
+    :type index_path: str
+    :param key: the key of the indexed file, as returned by :py:func:`get_index_key`
+    :type key: tuple
+    :return: the stored tree, or None if the index file does not exist, cannot be read, or is stale
+    """
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        if index['version'] != INDEX_VERSION or tuple(index['key']) != tuple(key):
+            return None
+        return _decode_index_value(index['tree'])
+    except Exception:
+        return None
+
+
+def save_index(index_path, key, tree):
+    """
+    Save a tree to an index file. The index file is replaced atomically.
+
+    :param index_path: the path to the index file
+    :type index_path: str
+    :param key: the key of the indexed file, as returned by :py:func:`get_index_key`
+    :type key: tuple
+    :param tree: the tree to store
+    :raises TypeError: if the tree contains values that cannot be stored in an index
+    """
+    text = json.dumps({'version': INDEX_VERSION, 'key': list(key), 'tree': _encode_index_value(tree)})
+    tmp_path = '%s.%d.tmp' % (index_path, os.getpid())
+    try:
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, index_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
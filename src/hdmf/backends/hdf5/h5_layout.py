@@ -0,0 +1,279 @@
+"""
+Planning of the chunk shapes and compression filters of the datasets of a builder tree before it is written to HDF5
+"""
+import math
+
+import numpy as np
+from h5py import Dataset
+
+from ...build import GroupBuilder
+from ...data_utils import DataIO, AbstractDataChunkIterator
+from ...spec import DatasetSpec, GroupSpec, NamespaceCatalog
+from ...utils import docval, getargs, popargs, get_data_shape
+
+
+class H5LayoutPlanner:
+    """
+    Choose the chunk shape and compression filters of each dataset of a GroupBuilder tree from the shape and dtype of
+    the dataset, the dims of its spec, and the pattern in which the dataset will be read. HDF5IO creates the datasets
+    with the planned chunk shapes and filters without changing the DatasetBuilders.
+
+    The access patterns are:
+
+    - 'row': each chunk contains whole rows, i.e., spans all axes but the first
+    - 'column': each chunk contains a part of a single column, i.e., spans only the first axis
+    - 'timeseries': each chunk spans the time axis and up to ``TIMESERIES_MAX_CHANNELS`` elements along each other axis.
+      The time axis is the first axis whose name in the spec dims contains 'time', or the first axis.
+
+    Datasets that are scalar, smaller than ``min_bytes``, not numeric, compound, already wrapped in a DataIO, written
+    from a DataChunkIterator, or read from a file are not changed. Subclasses can override :py:meth:`get_chunk_shape`
+    and :py:meth:`get_filters` to customize the layout.
+    """
+
+    ACCESS_PATTERNS = ('row', 'column', 'timeseries')
+
+    TIMESERIES_MAX_CHANNELS = 64
+
+    @docval({'name': 'access_pattern', 'type': str, 'enum': ACCESS_PATTERNS,
+             'doc': 'the default access pattern of the datasets', 'default': 'row'},
+            {'name': 'access_patterns', 'type': dict,
+             'doc': ('the access patterns of specific datasets, keyed by the path of the dataset, the data type of '
+                     'the dataset, or the data type of the group that contains the dataset, in this order of '
+                     'precedence'),
+             'default': None},
+            {'name': 'chunk_bytes', 'type': int, 'doc': 'the target number of bytes of each chunk',
+             'default': 1024 ** 2},
+            {'name': 'min_bytes', 'type': int, 'doc': 'the number of bytes below which datasets are not chunked',
+             'default': 64 * 1024},
+            {'name': 'compression', 'type': str, 'doc': 'the compression filter to use, or None for no compression',
+             'default': 'gzip', 'allow_none': True},
+            {'name': 'compression_opts', 'type': int, 'doc': 'the option of the compression filter, e.g., the level',
+             'default': 4, 'allow_none': True},
+            {'name': 'shuffle', 'type': bool,
+             'doc': 'whether to use the shuffle filter for dtypes with more than one byte', 'default': True})
+    def __init__(self, **kwargs):
+        access_patterns = popargs('access_patterns', kwargs) or dict()
+        for pattern in access_patterns.values():
+            if pattern not in self.ACCESS_PATTERNS:
+                raise ValueError("access pattern must be one of %s, got '%s'" % (self.ACCESS_PATTERNS, pattern))
+        self.__access_patterns = access_patterns
+        self.__access_pattern, self.__chunk_bytes, self.__min_bytes = popargs('access_pattern', 'chunk_bytes',
+                                                                              'min_bytes', kwargs)
+        self.__compression, self.__compression_opts, self.__shuffle = popargs('compression', 'compression_opts',
+                                                                              'shuffle', kwargs)
+
+    @property
+    def access_pattern(self):
+        """The default access pattern of the datasets"""
+        return self.__access_pattern
+
+    @property
+    def chunk_bytes(self):
+        """The target number of bytes of each chunk"""
+        return self.__chunk_bytes
+
+    @staticmethod
+    def __get_path(builder):
+        names = list()
+        while builder.parent is not None:
+            names.append(builder.name)
+            builder = builder.parent
+        return '/' + '/'.join(reversed(names))
+
+    @staticmethod
+    def __get_dtype(builder):
+        """Get the NumPy dtype of the data of the DatasetBuilder, or None if it cannot be determined cheaply"""
+        data = builder.data
+        if hasattr(data, 'dtype'):
+            return np.dtype(data.dtype)
+        if isinstance(builder.dtype, str):
+            try:
+                return np.dtype(builder.dtype)
+            except TypeError:
+                return None
+        while isinstance(data, (list, tuple)) and len(data) > 0:
+            data = data[0]
+        if isinstance(data, (bool, int, float, np.number, np.bool_)):
+            return np.asarray(data).dtype
+        return None
+
+    @staticmethod
+    def __get_type_keys(namespace_catalog):
+        """Get the names of the attributes that store the data types of datasets and groups"""
+        if namespace_catalog is None:
+            return DatasetSpec.type_key(), GroupSpec.type_key()
+        return namespace_catalog.dataset_spec_cls.type_key(), namespace_catalog.group_spec_cls.type_key()
+
+    def __get_access_pattern(self, builder, path, namespace_catalog):
+        dataset_type_key, group_type_key = self.__get_type_keys(namespace_catalog)
+        parent = builder.parent
+        for key in (path, builder.attributes.get(dataset_type_key),
+                    parent.attributes.get(group_type_key) if parent is not None else None):
+            if key is not None and key in self.__access_patterns:
+                return self.__access_patterns[key]
+        return self.__access_pattern
+
+    @classmethod
+    def __get_dims(cls, builder, shape, namespace_catalog):
+        """Get the dims of the spec of the dataset that match the number of dimensions of the dataset, or None"""
+        if namespace_catalog is None:
+            return None
+        dataset_type_key, group_type_key = cls.__get_type_keys(namespace_catalog)
+        spec = None
+        try:
+            if dataset_type_key in builder.attributes:
+                spec = namespace_catalog.get_spec(builder.attributes['namespace'], builder.attributes[dataset_type_key])
+            elif builder.parent is not None and group_type_key in builder.parent.attributes:
+                parent_spec = namespace_catalog.get_spec(builder.parent.attributes['namespace'],
+                                                         builder.parent.attributes[group_type_key])
+                spec = parent_spec.get_dataset(builder.name)
+        except (KeyError, ValueError):
+            return None
+        dims = getattr(spec, 'dims', None)
+        if not dims:
+            return None
+        options = dims if isinstance(dims[0], (list, tuple)) else [dims]
+        for option in options:
+            if len(option) == len(shape):
+                return tuple(option)
+        return None
+
+    def get_chunk_shape(self, shape, itemsize, access_pattern, dims=None):
+        """
+        Get the chunk shape of a dataset
+
+        :param shape: the shape of the dataset
+        :type shape: tuple
+        :param itemsize: the number of bytes of each element of the dataset
+        :type itemsize: int
+        :param access_pattern: the access pattern of the dataset, one of ACCESS_PATTERNS
+        :type access_pattern: str
+        :param dims: the names of the dimensions of the dataset from its spec, if available
+        :type dims: tuple
+        :return: the chunk shape
+        :rtype: tuple
+        """
+        budget = max(1, self.__chunk_bytes // itemsize)  # the number of elements of each chunk
+        if access_pattern == 'column':
+            return (min(shape[0], budget), ) + (1, ) * (len(shape) - 1)
+        if access_pattern == 'timeseries':
+            time_axis = 0
+            if dims is not None:
+                time_axis = next((i for i, d in enumerate(dims) if 'time' in d), 0)
+            chunks = [min(n, self.TIMESERIES_MAX_CHANNELS) for n in shape]
+            other = math.prod(chunks) // chunks[time_axis]
+            chunks[time_axis] = min(shape[time_axis], max(1, budget // other))
+            return tuple(chunks)
+        # row: whole rows, and halve the largest other axis while a single row does not fit into a chunk
+        chunks = list(shape)
+        while len(chunks) > 1 and math.prod(chunks[1:]) > budget:
+            axis = max(range(1, len(chunks)), key=lambda i: chunks[i])
+            chunks[axis] = -(-chunks[axis] // 2)
+        chunks[0] = min(shape[0], max(1, budget // math.prod(chunks[1:])))
+        return tuple(chunks)
+
+    def get_filters(self, dtype):
+        """
+        Get the filter settings of a dataset as keyword arguments for H5DataIO
+
+        :param dtype: the dtype of the dataset
+        :type dtype: numpy.dtype
+        :return: the filter settings
+        :rtype: dict
+        """
+        filters = dict()
+        if self.__compression is not None:
+            filters['compression'] = self.__compression
+            if self.__compression_opts is not None:
+                filters['compression_opts'] = self.__compression_opts
+            if self.__shuffle and dtype.itemsize > 1:
+                filters['shuffle'] = True
+        return filters
+
+    def plan_dataset(self, builder, namespace_catalog=None):
+        """
+        Plan the layout of a dataset
+
+        :param builder: the builder of the dataset
+        :type builder: DatasetBuilder
+        :param namespace_catalog: the catalog used to get the spec dims of the dataset
+        :type namespace_catalog: NamespaceCatalog
+        :return: the layout of the dataset, or None if the layout of the dataset is not changed
+        :rtype: dict
+        """
+        data = builder.data
+        if data is None or isinstance(data, (DataIO, AbstractDataChunkIterator, Dataset, str, bytes)):
+            return None
+        if builder.dtype is not None and not isinstance(builder.dtype, str):
+            return None  # compound dtype, whose data is 1-D even if get_data_shape reports more dimensions
+        if not isinstance(data, (np.ndarray, list, tuple)):
+            return None
+        dtype = self.__get_dtype(builder)
+        if dtype is None or dtype.kind not in 'biuf':
+            return None
+        shape = tuple(get_data_shape(data))
+        if len(shape) == 0 or 0 in shape or math.prod(shape) * dtype.itemsize < self.__min_bytes:
+            return None
+        path = self.__get_path(builder)
+        access_pattern = self.__get_access_pattern(builder, path, namespace_catalog)
+        dims = self.__get_dims(builder, shape, namespace_catalog)
+        chunks = self.get_chunk_shape(shape, dtype.itemsize, access_pattern, dims)
+        num_chunks = math.prod(-(-n // c) for n, c in zip(shape, chunks))
+        return dict(path=path, shape=shape, dtype=dtype, dims=dims, access_pattern=access_pattern, chunks=chunks,
+                    num_chunks=num_chunks, chunk_bytes=math.prod(chunks) * dtype.itemsize,
+                    filters=self.get_filters(dtype))
+
+    def __iter_layouts(self, builder, namespace_catalog):
+        """Iterate over the DatasetBuilders of a builder tree whose layout is planned and their layouts"""
+        stack = [builder]
+        while len(stack) > 0:
+            group = stack.pop()
+            for dset in group.datasets.values():
+                layout = self.plan_dataset(dset, namespace_catalog)
+                if layout is not None:
+                    yield dset, layout
+            stack.extend(group.groups.values())
+
+    @docval({'name': 'builder', 'type': GroupBuilder, 'doc': 'the root of the builder tree to plan'},
+            {'name': 'namespace_catalog', 'type': NamespaceCatalog,
+             'doc': 'the catalog used to get the spec dims of the datasets', 'default': None},
+            returns='the layouts of the datasets whose layout is planned, keyed by the path of the dataset',
+            rtype=dict)
+    def plan(self, **kwargs):
+        """Plan the layout of the datasets of a builder tree without changing the builders"""
+        builder, namespace_catalog = getargs('builder', 'namespace_catalog', kwargs)
+        return {layout['path']: layout for _, layout in self.__iter_layouts(builder, namespace_catalog)}
+
+    @staticmethod
+    def get_io_settings(layout):
+        """
+        Get the settings for creating a dataset with the given layout as keyword arguments for h5py create_dataset
+
+        :param layout: the layout of the dataset, as returned by :py:meth:`plan_dataset`
+        :type layout: dict
+        :return: the dataset creation settings
+        :rtype: dict
+        """
+        return dict(chunks=layout['chunks'], **layout['filters'])
+
+    @staticmethod
+    def format_report(layouts):
+        """
+        Format the layouts returned by :py:meth:`plan` as a table of the chunk shape, number of
+        chunks, and size of the chunks of each dataset
+
+        :param layouts: the layouts of the datasets, keyed by the path of the dataset
+        :type layouts: dict
+        :return: the report
+        :rtype: str
+        """
+        lines = ['%-50s %-12s %-20s %-20s %10s %12s %s' % ('dataset', 'access', 'shape', 'chunks', 'num chunks',
+                                                          'chunk bytes', 'filters')]
+        for path in sorted(layouts):
+            layout = layouts[path]
+            filters = ','.join('%s=%s' % item for item in sorted(layout['filters'].items())) or '-'
+            lines.append('%-50s %-12s %-20s %-20s %10d %12d %s' % (path, layout['access_pattern'],
+                                                                   layout['shape'], layout['chunks'],
+                                                                   layout['num_chunks'], layout['chunk_bytes'],
+                                                                   filters))
+        return '\n'.join(lines)
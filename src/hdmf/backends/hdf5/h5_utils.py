@@ -7,9 +7,16 @@ from collections import deque
 from abc import ABCMeta, abstractmethod
 from collections.abc import Iterable
 from copy import copy
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+import threading
+from time import perf_counter
+import zlib
 
-from h5py import Group, Dataset, RegionReference, Reference, special_dtype
+from h5py import Group, Dataset, RegionReference, Reference, special_dtype, check_dtype
 from h5py import filters as h5py_filters
+from h5py import h5s, h5t, h5z
+from h5py._hl import selections
 import json
 import numpy as np
 import warnings
@@ -30,11 +37,90 @@ class HDF5IODataChunkIteratorQueue(deque):
 
     Each queue element must be a tuple of two elements:
     1) the dataset to write to and 2) the AbstractDataChunkIterator with the data
+
+    If prefetch is greater than 0, the queue is exhausted by reading the next DataChunks from the DataChunkIterators
+    in read_workers background threads while the current DataChunk is written, so that reading the source data
+    overlaps with writing (and compressing) the data. Each DataChunkIterator is read by at most one thread at a time,
+    and all DataChunks are written by the calling thread. At most prefetch DataChunks, and as many as fit into
+    prefetch_bytes bytes (but always at least one DataChunk), are buffered.
+
+    If compression_workers is greater than 0, DataChunks are written with a H5DirectChunkWriter that compresses
+    the HDF5 chunks in compression_workers threads, if the filters of the dataset are supported.
+
+    If flush_interval is not None, the file of a dataset is flushed after writing a DataChunk to it if at least
+    flush_interval seconds passed since the last flush, and all written files are flushed when the queue is exhausted,
+    e.g., so that readers of a file in SWMR mode see the data as it is written.
     """
-    def __init__(self):
+
+    DEFAULT_PREFETCH_BYTES = 256 * 1024 ** 2
+
+    def __init__(self, prefetch=0, prefetch_bytes=DEFAULT_PREFETCH_BYTES, compression_workers=0, read_workers=1,
+                 flush_interval=None):
         self.logger = logging.getLogger('%s.%s' % (self.__class__.__module__, self.__class__.__qualname__))
+        if prefetch < 0:
+            raise ValueError("prefetch must be a non-negative integer, got %s" % prefetch)
+        if prefetch_bytes <= 0:
+            raise ValueError("prefetch_bytes must be a positive integer, got %s" % prefetch_bytes)
+        if compression_workers < 0:
+            raise ValueError("compression_workers must be a non-negative integer, got %s" % compression_workers)
+        if read_workers < 1:
+            raise ValueError("read_workers must be a positive integer, got %s" % read_workers)
+        if flush_interval is not None and flush_interval < 0:
+            raise ValueError("flush_interval must be a non-negative number or None, got %s" % flush_interval)
+        self.__prefetch = prefetch
+        self.__prefetch_bytes = prefetch_bytes
+        self.__compression_workers = compression_workers
+        self.__read_workers = read_workers
+        self.__flush_interval = flush_interval
+        self.__last_flush = None
+        self.__written_files = dict()  # the files written to since the queue started to be exhausted, keyed by id
+        self.__direct_chunk_writer = None
+        self.__stats = dict()
+        self.__stats_lock = threading.Lock()
         super().__init__()
 
+    @property
+    def prefetch(self):
+        """The maximum number of DataChunks to read ahead while writing. 0 if prefetching is disabled."""
+        return self.__prefetch
+
+    @property
+    def prefetch_bytes(self):
+        """The maximum number of bytes of DataChunks to read ahead while writing."""
+        return self.__prefetch_bytes
+
+    @property
+    def compression_workers(self):
+        """The number of threads used to compress HDF5 chunks. 0 if chunks are compressed by HDF5."""
+        return self.__compression_workers
+
+    @property
+    def read_workers(self):
+        """The number of threads that read from DataChunkIterators at the same time if prefetch is greater than 0."""
+        return self.__read_workers
+
+    @property
+    def flush_interval(self):
+        """The minimum number of seconds between flushes of the written files. None if files are not flushed."""
+        return self.__flush_interval
+
+    @property
+    def stats(self):
+        """
+        The statistics of the DataChunks written by this queue, keyed by the name of the dataset written to
+
+        Each value is a dict with the number of DataChunks ('chunks'), the number of bytes of the DataChunks ('bytes'),
+        and the total time in seconds spent reading the DataChunks from the DataChunkIterator ('read_time') and
+        writing them to the dataset ('write_time').
+        """
+        return self.__stats
+
+    def __add_stats(self, dset, **stats):
+        with self.__stats_lock:
+            dset_stats = self.__stats.setdefault(dset.name, dict(chunks=0, bytes=0, read_time=0., write_time=0.))
+            for k, v in stats.items():
+                dset_stats[k] += v
+
     @classmethod
     def _write_chunk(cls, dset, data):
         """
@@ -53,6 +139,19 @@ class HDF5IODataChunkIteratorQueue(deque):
             chunk_i = next(data)
         except StopIteration:
             return False
+        cls._write_data_chunk(dset, chunk_i)
+        return True
+
+    @classmethod
+    def _write_data_chunk(cls, dset, chunk_i):
+        """
+        Write a DataChunk to the given Dataset
+
+        :param dset: The Dataset to write to
+        :type dset: Dataset
+        :param chunk_i: The DataChunk to write
+        :type chunk_i: DataChunk
+        """
         # Determine the minimum array size required to store the chunk
         max_bounds = chunk_i.get_min_bounds()
         # Expand the dataset if needed
@@ -60,17 +159,133 @@ class HDF5IODataChunkIteratorQueue(deque):
         # Write the data
         dset[chunk_i.selection] = chunk_i.data
 
-        return True
+    def __read_data_chunk(self, dset, data):
+        """Read the next DataChunk from the DataChunkIterator. Return the DataChunk and its size, or None"""
+        t0 = perf_counter()
+        try:
+            chunk_i = next(data)
+        except StopIteration:
+            return None, 0
+        nbytes = getattr(chunk_i.data, 'nbytes', 0)
+        self.__add_stats(dset, chunks=1, bytes=nbytes, read_time=perf_counter() - t0)
+        return chunk_i, nbytes
+
+    def __write_data_chunk(self, dset, chunk_i):
+        """Write a DataChunk with direct chunk writes if possible, and with _write_data_chunk otherwise"""
+        t0 = perf_counter()
+        if self.__direct_chunk_writer is None or not self.__direct_chunk_writer.write(dset, chunk_i):
+            self._write_data_chunk(dset, chunk_i)
+        if self.__flush_interval is not None:
+            self.__written_files[dset.file.id] = dset.file
+            if t0 - self.__last_flush >= self.__flush_interval:
+                dset.file.flush()
+                self.__last_flush = perf_counter()
+        self.__add_stats(dset, write_time=perf_counter() - t0)
+
+    def __flush(self):
+        """Flush the files written to since the queue started to be exhausted"""
+        for f in self.__written_files.values():
+            if f:
+                f.flush()
+        self.__written_files.clear()
 
     def exhaust_queue(self):
         """
         Read and write from any queued DataChunkIterators in a round-robin fashion
         """
-        while len(self) > 0:
-            self.logger.debug("Exhausting DataChunkIterator from queue (length %d)" % len(self))
-            dset, data = self.popleft()
-            if self._write_chunk(dset, data):
-                self.append(dataset=dset, data=data)
+        if len(self) == 0:
+            return
+        if self.__compression_workers > 0:
+            self.__direct_chunk_writer = H5DirectChunkWriter(max_workers=self.__compression_workers)
+        self.__last_flush = perf_counter()
+        try:
+            if self.__prefetch > 0:
+                self.__exhaust_queue_prefetch()
+            while len(self) > 0:
+                self.logger.debug("Exhausting DataChunkIterator from queue (length %d)" % len(self))
+                dset, data = self.popleft()
+                chunk_i, _ = self.__read_data_chunk(dset, data)
+                if chunk_i is not None:
+                    self.__write_data_chunk(dset, chunk_i)
+                    self.append(dataset=dset, data=data)
+        finally:
+            if self.__direct_chunk_writer is not None:
+                self.__direct_chunk_writer.close()
+                self.__direct_chunk_writer = None
+            self.__flush()
+
+    def __exhaust_queue_prefetch(self):
+        """
+        Exhaust the queue by reading the DataChunks in read_workers background threads and writing them in the
+        calling thread, since h5py objects may not be written concurrently. With one read worker, the DataChunks are
+        read and written in the same round-robin order as without prefetching.
+        """
+        cond = threading.Condition()
+        buffer = deque()  # the (dataset, DataChunk, nbytes) tuples that have been read but not yet written
+        state = {'nbytes': 0, 'reading': 0, 'running': self.__read_workers, 'stop': False}
+
+        def read():
+            try:
+                while True:
+                    with cond:
+                        # wait for a DataChunkIterator that is not being read by another thread
+                        while not state['stop'] and len(self) == 0 and state['reading'] > 0:
+                            cond.wait()
+                        if state['stop'] or len(self) == 0:
+                            return
+                        dset, data = self.popleft()
+                        state['reading'] += 1
+                    try:
+                        chunk_i, nbytes = self.__read_data_chunk(dset, data)
+                        if chunk_i is None:
+                            continue
+                        with cond:
+                            # backpressure: wait until the writer has made room for the chunk
+                            while (not state['stop'] and len(buffer) > 0 and
+                                   (len(buffer) >= self.__prefetch or
+                                    state['nbytes'] + nbytes > self.__prefetch_bytes)):
+                                cond.wait()
+                            if state['stop']:
+                                return
+                            buffer.append((dset, chunk_i, nbytes))
+                            state['nbytes'] += nbytes
+                            # requeue the DataChunkIterator only after its DataChunk to keep its DataChunks in order
+                            self.append(dataset=dset, data=data)
+                    finally:
+                        with cond:
+                            state['reading'] -= 1
+                            cond.notify_all()
+            except BaseException:
+                with cond:
+                    state['stop'] = True
+                raise
+            finally:
+                with cond:
+                    state['running'] -= 1
+                    cond.notify_all()
+
+        with ThreadPoolExecutor(max_workers=self.__read_workers, thread_name_prefix='hdmf-dci-read') as executor:
+            futures = [executor.submit(read) for _ in range(self.__read_workers)]
+            try:
+                while True:
+                    with cond:
+                        while len(buffer) == 0 and state['running'] > 0:
+                            cond.wait()
+                        if len(buffer) == 0:
+                            break
+                        dset, chunk_i, nbytes = buffer.popleft()
+                    self.logger.debug("Writing prefetched DataChunk (%d DataChunks prefetched)" % len(buffer))
+                    self.__write_data_chunk(dset, chunk_i)
+                    with cond:
+                        state['nbytes'] -= nbytes
+                        cond.notify_all()
+            finally:
+                with cond:
+                    state['stop'] = True
+                    cond.notify_all()
+        # raise any error that occurred while reading the data
+        for future in futures:
+            future.result()
 
     def append(self, dataset, data):
         """
@@ -84,6 +299,117 @@ class HDF5IODataChunkIteratorQueue(deque):
         super().append((dataset, data))
 
 
+class H5DirectChunkWriter:
+    """
+    Write DataChunks to chunked HDF5 datasets by compressing the HDF5 chunks that are fully covered by a DataChunk
+    in a thread pool and writing the compressed chunks with write_direct_chunk
+
+    Only datasets with numeric or bool dtypes whose filter pipeline consists of the deflate (gzip) filter, optionally
+    preceded by the shuffle filter, are supported. The parts of a DataChunk that do not cover whole HDF5 chunks,
+    e.g., at the edges of the dataset, are written with a regular write.
+    """
+
+    def __init__(self, max_workers):
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hdmf-compress')
+
+    def close(self):
+        """Shut down the thread pool"""
+        self.__executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @staticmethod
+    def __shuffle(itemsize, buf):
+        """Apply the HDF5 shuffle filter, i.e., store the n-th bytes of all elements together"""
+        if itemsize == 1:
+            return buf
+        return np.frombuffer(buf, dtype=np.uint8).reshape(-1, itemsize).T.tobytes()
+
+    @classmethod
+    def get_filters(cls, dset):
+        """
+        Get the filter pipeline of the dataset as a list of functions that take and return bytes-like objects
+
+        :param dset: The Dataset to get the filters for
+        :type dset: Dataset
+        :return: the filter functions in the order they are applied, or None if the dataset is not supported
+        :rtype: list
+        """
+        if dset.chunks is None or dset.dtype.kind not in 'biuf':
+            return None
+        filters = list()
+        compressed = False
+        plist = dset.id.get_create_plist()
+        for i in range(plist.get_nfilters()):
+            code, _, values = plist.get_filter(i)[:3]
+            if code == h5z.FILTER_SHUFFLE and not compressed:
+                filters.append(lambda buf, itemsize=dset.dtype.itemsize: cls.__shuffle(itemsize, buf))
+            elif code == h5z.FILTER_DEFLATE and not compressed:
+                filters.append(lambda buf, level=(values[0] if len(values) > 0 else 6): zlib.compress(buf, level))
+                compressed = True
+            else:
+                return None
+        return filters if compressed else None
+
+    @staticmethod
+    def __compress(data, dtype, filters):
+        buf = np.ascontiguousarray(data, dtype=dtype).data.cast('B')
+        for f in filters:
+            buf = f(buf)
+        return buf
+
+    def write(self, dset, chunk_i):
+        """
+        Write a DataChunk to the given Dataset
+
+        :param dset: The Dataset to write to
+        :type dset: Dataset
+        :param chunk_i: The DataChunk to write
+        :type chunk_i: DataChunk
+        :return: True if the DataChunk was written, False if the dataset or the DataChunk is not supported and
+                 nothing was written
+        :rtype: bool
+        """
+        filters = self.get_filters(dset)
+        if filters is None:
+            return False
+        selection = chunk_i.selection if isinstance(chunk_i.selection, tuple) else (chunk_i.selection, )
+        data = np.asarray(chunk_i.data)
+        if (len(selection) != len(dset.chunks) or data.ndim != len(dset.chunks) or
+                not all(isinstance(s, slice) and s.step in (None, 1) for s in selection)):
+            return False
+        start = tuple(s.start or 0 for s in selection)
+        stop = tuple(a + n if s.stop is None else s.stop for s, a, n in zip(selection, start, data.shape))
+        if data.shape != tuple(b - a for a, b in zip(start, stop)):
+            return False
+        # the region of whole HDF5 chunks that is covered by the DataChunk
+        box_start = tuple(-(-a // c) * c for a, c in zip(start, dset.chunks))
+        box_stop = tuple(b // c * c for b, c in zip(stop, dset.chunks))
+        if any(a >= b for a, b in zip(box_start, box_stop)):
+            return False
+        dset.id.extend(chunk_i.get_min_bounds())
+        # compress the whole HDF5 chunks in the thread pool
+        futures = list()
+        for offset in product(*(range(a, b, c) for a, b, c in zip(box_start, box_stop, dset.chunks))):
+            local = tuple(slice(o - a, o - a + c) for o, a, c in zip(offset, start, dset.chunks))
+            futures.append((offset, self.__executor.submit(self.__compress, data[local], dset.dtype, filters)))
+        # while they are compressed, write the rest of the DataChunk, split into up to two slabs per dimension
+        for d in range(len(start)):
+            for a, b in ((start[d], box_start[d]), (box_stop[d], stop[d])):
+                if a < b:
+                    region = (tuple(zip(box_start[:d], box_stop[:d])) + ((a, b), ) +
+                              tuple(zip(start[d + 1:], stop[d + 1:])))
+                    dset[tuple(slice(lo, hi) for lo, hi in region)] = \
+                        data[tuple(slice(lo - s, hi - s) for (lo, hi), s in zip(region, start))]
+        for offset, future in futures:
+            dset.id.write_direct_chunk(offset, future.result())
+        return True
+
+
 class H5Dataset(HDMFDataset):
     @docval({'name': 'dataset', 'type': (Dataset, Array), 'doc': 'the HDF5 file lazily evaluate'},
             {'name': 'io', 'type': 'HDF5IO', 'doc': 'the IO object that was used to read the underlying dataset'})
@@ -107,6 +433,52 @@ class H5Dataset(HDMFDataset):
     def shape(self):
         return self.dataset.shape
 
+    def refresh(self):
+        """Refresh the shape and data of the dataset to what was written to a file open for writing in SWMR mode"""
+        self.dataset.refresh()
+
+
+class H5MemmapDataset(H5Dataset):
+    """
+    A dataset that is read from a read-only numpy.memmap of the data of an HDF5 dataset, which is stored contiguously
+    without filters in a local file
+
+    The h5py.Dataset is kept as the dataset, so that the dataset is linked to or copied like other read datasets when
+    it is written to another file, while all reads bypass the HDF5 library.
+    """
+
+    @docval({'name': 'dataset', 'type': Dataset, 'doc': 'the HDF5 dataset that is memory-mapped'},
+            {'name': 'io', 'type': 'HDF5IO', 'doc': 'the IO object that was used to read the underlying dataset'},
+            {'name': 'memmap', 'type': np.memmap, 'doc': 'the read-only memory map of the data of the dataset'})
+    def __init__(self, **kwargs):
+        self.__memmap = popargs('memmap', kwargs)
+        super().__init__(**kwargs)
+
+    @property
+    def memmap(self):
+        """The read-only numpy.memmap of the data of the dataset"""
+        return self.__memmap
+
+    @property
+    def ndim(self):
+        return self.__memmap.ndim
+
+    @property
+    def size(self):
+        return self.__memmap.size
+
+    def __getitem__(self, key):
+        return self.__memmap[key]
+
+    def __iter__(self):
+        return iter(self.__memmap)
+
+    def __array__(self, dtype=None):
+        return np.asarray(self.__memmap, dtype=dtype)
+
+    def astype(self, dtype):
+        return self.__memmap.astype(dtype)
+
 
 class DatasetOfReferences(H5Dataset, ReferenceResolver, metaclass=ABCMeta):
     """
@@ -138,6 +510,71 @@ class DatasetOfReferences(H5Dataset, ReferenceResolver, metaclass=ABCMeta):
     def _get_ref(self, ref):
         return self.get_object(self.dataset.file[ref])
 
+    @abstractmethod
+    def get_object_from_builder(self, builder):
+        """
+        A method that maps the Builder of an HDF5 object to a Builder or Container
+        """
+        pass
+
+    def __read_ref_addresses(self, arg, field=None):
+        """
+        Read the addresses of the objects that a selection of the dataset, or of a field of a compound dataset,
+        references without creating h5py Reference objects. Returns None if the addresses cannot be read this way.
+        """
+        dset = self.dataset
+        if not isinstance(dset, Dataset):
+            return None
+        if check_dtype(ref=dset.dtype if field is None else dset.dtype[field]) is not Reference:
+            return None
+        try:
+            selection = selections.select(dset.shape, arg if isinstance(arg, tuple) else (arg, ), dataset=dset)
+        except Exception:
+            return None
+        addrs = np.zeros(selection.array_shape, dtype=np.uint64)
+        if selection.nselect == 0:
+            return addrs
+        mtype = h5t.STD_REF_OBJ
+        if field is not None:
+            mtype = h5t.create(h5t.COMPOUND, mtype.get_size())
+            mtype.insert(field.encode('utf-8'), 0, h5t.STD_REF_OBJ)
+        dset.id.read(h5s.create_simple(selection.mshape), selection.id, addrs, mtype=mtype)
+        return addrs
+
+    def _get_refs(self, refs, arg, field=None):
+        """
+        Resolve the object references read from a selection of the dataset, or of a field of a compound dataset.
+
+        Each distinct referenced object is resolved once, and the Builders of the referenced objects are cached for
+        each file by the IO object, so that other selections and datasets of the same file do not resolve them again.
+
+        :param refs: the references read from the selection
+        :type refs: numpy.ndarray
+        :param arg: the selection
+        :param field: the name of the field of the compound dataset that contains the references
+        :type field: str
+        :return: the resolved references, with the shape of refs
+        :rtype: numpy.ndarray
+        """
+        ret = np.empty(refs.shape, dtype=object)
+        addrs = self.__read_ref_addresses(arg, field)
+        if addrs is None or addrs.shape != refs.shape:
+            for i, ref in np.ndenumerate(refs):
+                ret[i] = self._get_ref(ref)
+            return ret
+        file = self.dataset.file
+        cache = self.io._get_ref_cache(file.filename)
+        addrs, flat_refs = addrs.ravel(), refs.ravel()
+        unique, first, inverse = np.unique(addrs, return_index=True, return_inverse=True)
+        objs = np.empty(len(unique), dtype=object)
+        for i, (addr, first_index) in enumerate(zip(unique.tolist(), first.tolist())):
+            builder = cache.get(addr)
+            if builder is None:
+                builder = cache[addr] = self.io.get_builder(file[flat_refs[first_index]])
+            objs[i] = self.get_object_from_builder(builder)
+        ret.ravel()[:] = objs[inverse.ravel()]
+        return ret
+
     def __iter__(self):
         for ref in super().__iter__():
             yield self._get_ref(ref)
@@ -158,6 +595,12 @@ class BuilderResolverMixin(BuilderResolver):
         """
         return self.io.get_builder(h5obj)
 
+    def get_object_from_builder(self, builder):
+        """
+        A method that maps the Builder of an HDF5 object to the Builder
+        """
+        return builder
+
 
 class ContainerResolverMixin(ContainerResolver):
     """
@@ -171,6 +614,12 @@ class ContainerResolverMixin(ContainerResolver):
         """
         return self.io.get_container(h5obj)
 
+    def get_object_from_builder(self, builder):
+        """
+        A method that maps the Builder of an HDF5 object to a Container
+        """
+        return self.io.manager.construct(builder)
+
 
 class AbstractH5TableDataset(DatasetOfReferences):
 
@@ -226,14 +675,22 @@ class AbstractH5TableDataset(DatasetOfReferences):
         if np.issubdtype(type(arg), np.integer):
             self.__swap_refs(rows)
         else:
-            for row in rows:
-                self.__swap_refs(row)
+            # resolve the object references of each column at once, and the other columns row by row
+            names = rows.dtype.names
+            resolved = {i: self._get_refs(rows[names[i]], arg, names[i])
+                        for i, t in enumerate(self.__types) if t is Reference}
+            for i, column in resolved.items():
+                rows[names[i]] = column
+            if len(resolved) < len(self.__refgetters):
+                for row in rows:
+                    self.__swap_refs(row, skip=resolved)
         return rows
 
-    def __swap_refs(self, row):
+    def __swap_refs(self, row, skip=()):
         for i in self.__refgetters:
-            getref = self.__refgetters[i]
-            row[i] = getref(row[i])
+            if i not in skip:
+                getref = self.__refgetters[i]
+                row[i] = getref(row[i])
 
     def _get_utf(self, string):
         """
@@ -258,7 +715,7 @@ class AbstractH5ReferenceDataset(DatasetOfReferences):
     def __getitem__(self, arg):
         ref = super().__getitem__(arg)
         if isinstance(ref, np.ndarray):
-            return [self._get_ref(x) for x in ref]
+            return self._get_refs(ref, arg).tolist()
         else:
             return self._get_ref(ref)
 
@@ -497,7 +954,7 @@ class H5DataIO(DataIO):
         # Consume allow_plugin_filters parameter
         self.__allow_plugin_filters = popargs('allow_plugin_filters', kwargs)
         # Check for possible collision with other parameters
-        if not isinstance(getargs('data', kwargs), Dataset) and self.__link_data:
+        if not isinstance(getargs('data', kwargs), (Dataset, H5MemmapDataset)) and self.__link_data:
             self.__link_data = False
             warnings.warn('link_data parameter in H5DataIO will be ignored')
         # Call the super constructor and consume the data parameter
@@ -535,7 +992,7 @@ class H5DataIO(DataIO):
                 msg += " Set `allow_plugin_filters=True` to enable the use of dynamically-loaded plugin filters."
             raise ValueError(msg)
         # Check possible parameter collisions
-        if isinstance(self.data, Dataset):
+        if isinstance(self.data, (Dataset, H5MemmapDataset)):
             for k in self.__iosettings.keys():
                 warnings.warn("%s in H5DataIO will be ignored with H5DataIO.data being an HDF5 dataset" % k)
 
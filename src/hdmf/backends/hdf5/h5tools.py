@@ -2,25 +2,30 @@ import logging
 import os.path
 import warnings
 from collections import deque
+from collections.abc import Iterator
+from fnmatch import fnmatchcase
 from functools import partial
+from itertools import chain, islice
 from pathlib import Path, PurePosixPath as pp
 
 import numpy as np
 import h5py
 from h5py import File, Group, Dataset, special_dtype, SoftLink, ExternalLink, Reference, RegionReference, check_dtype
 
+from .h5_index import get_index_key, load_index, save_index
+from .h5_layout import H5LayoutPlanner
 from .h5_utils import (BuilderH5ReferenceDataset, BuilderH5RegionDataset, BuilderH5TableDataset, H5DataIO,
-                       H5SpecReader, H5SpecWriter, HDF5IODataChunkIteratorQueue)
+                       H5Dataset, H5MemmapDataset, H5SpecReader, H5SpecWriter, HDF5IODataChunkIteratorQueue)
 from ..io import HDMFIO
 from ..errors import UnsupportedOperation
 from ..warnings import BrokenLinkWarning
-from ...build import (Builder, GroupBuilder, DatasetBuilder, LinkBuilder, BuildManager, RegionBuilder,
-                      ReferenceBuilder, TypeMap, ObjectMapper)
+from ...build import (Builder, GroupBuilder, DatasetBuilder, LazyGroupBuilder, LinkBuilder, BuildManager,
+                      RegionBuilder, ReferenceBuilder, TypeMap, ObjectMapper)
 from ...container import Container
 from ...term_set import TermSetWrapper
 from ...data_utils import AbstractDataChunkIterator
 from ...spec import RefSpec, DtypeSpec, NamespaceCatalog
-from ...utils import docval, getargs, popargs, get_data_shape, get_docval, StrDataset
+from ...utils import docval, getargs, popargs, get_data_shape, get_docval, StrDataset, trusted_calls
 from ..utils import NamespaceToBuilderHelper, WriteStatusTracker
 
 ROOT_NAME = 'root'
@@ -39,6 +44,11 @@ class HDF5IO(HDMFIO):
 
     __ns_spec_path = 'namespace'  # path to the namespace dataset within a namespace group
 
+    __MAX_ATTR_TYPES = 64  # the maximum number of attribute datatypes whose dtype is cached
+
+    # the read states of the objects of a file that is read with include and exclude filters
+    __INCLUDED, __KEPT, __PRUNED = 'included', 'kept', 'pruned'
+
     @staticmethod
     def can_read(path):
         """Determines whether a given path is readable by the HDF5IO class"""
@@ -64,15 +74,82 @@ class HDF5IO(HDMFIO):
              'doc': 'a pre-existing h5py.File, S3File, or RemFile object', 'default': None},
             {'name': 'driver', 'type': str, 'doc': 'driver for h5py to use when opening HDF5 file', 'default': None},
             {'name': 'herd_path', 'type': str,
-             'doc': 'The path to read/write the HERD file', 'default': None},)
+             'doc': 'The path to read/write the HERD file', 'default': None},
+            {'name': 'lazy', 'type': bool,
+             'doc': ('whether to read the groups in the file lazily, i.e., read the attributes, subgroups, datasets, '
+                     'and links of a group only when they are first accessed'),
+             'default': False},
+            {'name': 'dci_prefetch', 'type': int,
+             'doc': ('the maximum number of DataChunks to read ahead from DataChunkIterators in a background thread '
+                     'while writing the current DataChunk. 0 disables prefetching'),
+             'default': 0},
+            {'name': 'dci_prefetch_bytes', 'type': int,
+             'doc': 'the maximum number of bytes of DataChunks to read ahead from DataChunkIterators',
+             'default': HDF5IODataChunkIteratorQueue.DEFAULT_PREFETCH_BYTES},
+            {'name': 'dci_compression_workers', 'type': int,
+             'doc': ('the number of threads used to compress the HDF5 chunks of datasets written from '
+                     'DataChunkIterators with gzip compression, which are then written with direct chunk writes. '
+                     '0 lets HDF5 compress the chunks'),
+             'default': 0},
+            {'name': 'dci_read_workers', 'type': int,
+             'doc': ('the number of threads that read DataChunks from different DataChunkIterators at the same time '
+                     'when dci_prefetch is greater than 0, e.g., when writing with exhaust_dci=False'),
+             'default': 1},
+            {'name': 'write_block_size', 'type': int,
+             'doc': ('the number of rows of lists, iterators, compound data, and references that are converted to '
+                     'arrays and written at once'),
+             'default': 100000},
+            {'name': 'layout_planner', 'type': H5LayoutPlanner,
+             'doc': ('the planner used to choose the chunk shapes and compression filters of the datasets of the '
+                     'builders that are written'),
+             'default': None},
+            {'name': 'swmr', 'type': bool,
+             'doc': ('whether to use single-writer/multiple-reader (SWMR) mode. When writing, the file is opened with '
+                     "libver='latest', SWMR mode is enabled after all groups, datasets, and attributes are written, "
+                     'and the DataChunkIterators are then written while the file is flushed periodically, so that '
+                     "readers can follow the data as it is written. In mode 'r', the file is opened for reading in "
+                     'SWMR mode, and refresh updates the read datasets to the data written so far'),
+             'default': False},
+            {'name': 'dci_flush_interval', 'type': (int, float),
+             'doc': ('the minimum number of seconds between flushes of the file while writing DataChunkIterators. '
+                     'If None, the file is flushed every second in SWMR mode and not flushed otherwise'),
+             'default': None},
+            {'name': 'index_path', 'type': (str, Path),
+             'doc': ("the path to a sidecar index of the builder tree of the file, used in mode 'r' to read the "
+                     'builder tree without reading the attributes and links of every group and dataset in the file. '
+                     'The index is written when the file is read if it does not exist or the file has changed since '
+                     'it was written'),
+             'default': None},
+            {'name': 'memmap', 'type': bool,
+             'doc': ("whether to read the numeric datasets that are stored contiguously without filters in mode 'r' "
+                     'from read-only numpy.memmap arrays. Reads then bypass the HDF5 library. The datasets are read as '
+                     'H5MemmapDataset objects, which keep the h5py.Dataset so that they are linked to or copied like '
+                     'other datasets when they are written to another file'),
+             'default': False},)
     def __init__(self, **kwargs):
         """Open an HDF5 file for IO.
         """
         self.logger = logging.getLogger('%s.%s' % (self.__class__.__module__, self.__class__.__qualname__))
-        path, manager, mode, comm, file_obj, driver, herd_path = popargs('path', 'manager', 'mode',
-                                                                                       'comm', 'file', 'driver',
-                                                                                       'herd_path',
-                                                                                       kwargs)
+        path, manager, mode, comm, file_obj, driver, herd_path, lazy = popargs('path', 'manager', 'mode',
+                                                                               'comm', 'file', 'driver',
+                                                                               'herd_path', 'lazy',
+                                                                               kwargs)
+        dci_prefetch, dci_prefetch_bytes, dci_compression_workers, dci_read_workers = popargs(
+            'dci_prefetch', 'dci_prefetch_bytes', 'dci_compression_workers', 'dci_read_workers', kwargs)
+        write_block_size, layout_planner = popargs('write_block_size', 'layout_planner', kwargs)
+        if write_block_size < 1:
+            raise ValueError("write_block_size must be a positive integer, got %d" % write_block_size)
+        swmr, dci_flush_interval = popargs('swmr', 'dci_flush_interval', kwargs)
+        if swmr and comm is not None:
+            raise ValueError("SWMR mode cannot be used with MPI (comm)")
+        if swmr and dci_flush_interval is None:
+            dci_flush_interval = 1.0
+        index_path = popargs('index_path', kwargs)
+        if index_path is not None and mode != 'r':
+            raise ValueError("index_path can only be used in mode 'r', got mode '%s'" % mode)
+        memmap = popargs('memmap', kwargs)
+        if memmap and (mode != 'r' or swmr):
+            raise ValueError("memmap can only be used in mode 'r' without SWMR mode")
 
         self.__open_links = []  # keep track of other files opened from links in this file
         self.__file = None  # This will be set below, but set to None first in case an error occurs and we need to close
@@ -93,6 +170,18 @@ class HDF5IO(HDMFIO):
             manager = BuildManager(manager)
         self.__driver = driver
         self.__comm = comm
+        self.__lazy = lazy
+        self.__swmr = swmr
+        self.__index_path = None if index_path is None else str(index_path)
+        self.__indexed = False  # whether the builder tree was read from the index
+        self.__attr_types = list()  # the dtype of each HDF5 datatype of the attributes read
+        self.__memmap = memmap
+        self.__read_filters = None  # the include and exclude filters of the read
+        self.__read_selection = None  # the read states of the objects of the file with the include and exclude filters
+        self.__write_block_size = write_block_size
+        self.__layout_planner = layout_planner
+        self.__planned_layouts = dict()
+        self.__pending_layouts = dict()  # the planned layouts of the builder that is being written, keyed by path
         self.__mode = mode
         self.__file = file_obj
         super().__init__(manager, source=path, herd_path=herd_path)
@@ -100,7 +189,15 @@ class HDF5IO(HDMFIO):
         self.__built = dict() # keep track of each builder for each dataset/group/link for each file
         self.__read = dict() # keep track of which files have been read. Key is the filename value is the builder
         self.__ref_queue = deque()  # a queue of the references that need to be added
-        self.__dci_queue = HDF5IODataChunkIteratorQueue()  # a queue of DataChunkIterators that need to be exhausted
+        self.__ref_cache = None  # the HDF5 object and reference of each builder referenced while adding references
+        self.__ref_builders = dict()  # the builders of the objects referenced from read datasets, for each file
+        self.__export_src_io = None  # the HDF5IO that is being exported from, used to copy unmodified groups
+        self.__skip_unchanged = False  # whether to skip the written builders that were not rebuilt by the manager
+        # a queue of DataChunkIterators that need to be exhausted
+        self.__dci_queue = HDF5IODataChunkIteratorQueue(prefetch=dci_prefetch, prefetch_bytes=dci_prefetch_bytes,
+                                                        compression_workers=dci_compression_workers,
+                                                        read_workers=dci_read_workers,
+                                                        flush_interval=dci_flush_interval)
         ObjectMapper.no_convert(Dataset)
         self._written_builders = WriteStatusTracker()  # track which builders were written (or read) by this IO object
 
@@ -117,6 +214,42 @@ class HDF5IO(HDMFIO):
     def driver(self):
         return self.__driver
 
+    @property
+    def lazy(self):
+        """Whether the groups in the file are read lazily."""
+        return self.__lazy
+
+    @property
+    def memmap(self):
+        """Whether contiguous datasets without filters are read from read-only numpy.memmap arrays."""
+        return self.__memmap
+
+    @property
+    def index_path(self):
+        """The path to the sidecar index of the builder tree of the file."""
+        return self.__index_path
+
+    @property
+    def swmr(self):
+        """Whether the file is written or read in single-writer/multiple-reader (SWMR) mode"""
+        return self.__swmr
+
+    @property
+    def layout_planner(self):
+        """The planner used to choose the chunk shapes and compression filters of the datasets that are written."""
+        return self.__layout_planner
+
+    @property
+    def planned_layouts(self):
+        """The layouts that the layout planner chose for the datasets of the last builder written, keyed by path.
+        See H5LayoutPlanner.format_report to format them as a report."""
+        return self.__planned_layouts
+
+    @property
+    def dci_stats(self):
+        """The statistics of the DataChunkIterators written by this HDF5IO. See HDF5IODataChunkIteratorQueue.stats."""
+        return self.__dci_queue.stats
+
     @classmethod
     def __check_path_file_obj(cls, path, file_obj):
         if isinstance(path, Path):
@@ -372,8 +505,17 @@ class HDF5IO(HDMFIO):
                                        % (self.source, self.__mode))
 
         cache_spec = popargs('cache_spec', kwargs)
-        super().write(**kwargs)
-        if cache_spec:
+        if cache_spec and self.__swmr:
+            # no groups or attributes can be created after SWMR mode is enabled
+            self.__cache_spec()
+        # the builders of the containers that were not modified since they were written or read are not rebuilt, so
+        # their subtrees do not need to be traversed again, e.g., when appending to a file
+        self.__skip_unchanged = True
+        try:
+            super().write(**kwargs)
+        finally:
+            self.__skip_unchanged = False
+        if cache_spec and not self.__swmr:
             self.__cache_spec()
 
     def __cache_spec(self):
@@ -419,6 +561,8 @@ class HDF5IO(HDMFIO):
         if self.__mode != 'w':
             raise UnsupportedOperation("Cannot export to file %s in mode '%s'. Please use mode 'w'."
                                        % (self.source, self.__mode))
+        if self.__swmr:
+            raise UnsupportedOperation("Cannot export to file %s in SWMR mode." % self.source)
 
         src_io = getargs('src_io', kwargs)
         write_args, cache_spec = popargs('write_args', 'cache_spec', kwargs)
@@ -434,7 +578,11 @@ class HDF5IO(HDMFIO):
         ckwargs['write_args'] = write_args
         if not write_args.get('link_data', True):
             ckwargs['clear_cache'] = True
-        super().export(**ckwargs)
+        self.__export_src_io = src_io if isinstance(src_io, HDF5IO) else None
+        try:
+            super().export(**ckwargs)
+        finally:
+            self.__export_src_io = None
         if cache_spec:
             # add any namespaces from the src_io that have not yet been loaded
             for namespace in src_io.manager.namespace_catalog.namespaces:
@@ -471,10 +619,31 @@ class HDF5IO(HDMFIO):
         with HDF5IO(path=path, comm=comm, mode='w') as write_io:
             write_io.export(**kwargs)
 
+    @docval(*get_docval(HDMFIO.read),
+            {'name': 'include', 'type': (list, tuple),
+             'doc': ("the parts of the file to read, as path globs, e.g., '/processing/*', or the names of data types, "
+                     'e.g., DynamicTable. Objects that match, the objects in groups that match, the groups on the path '
+                     'to them, and the objects without a data type in these groups are read. Links and references to '
+                     'other groups are read when they are first accessed. If None, the whole file is read'),
+             'default': None},
+            {'name': 'exclude', 'type': (list, tuple),
+             'doc': ('the parts of the file not to read, as path globs or the names of data types. Takes precedence '
+                     'over include'),
+             'default': None},
+            returns='the Container object that was read in', rtype=Container)
     def read(self, **kwargs):
+        include, exclude = popargs('include', 'exclude', kwargs)
         if self.__mode == 'w' or self.__mode == 'w-' or self.__mode == 'x':
             raise UnsupportedOperation("Cannot read from file %s in mode '%s'. Please use mode 'r', 'r+', or 'a'."
                                        % (self.source, self.__mode))
+        read_filters = None
+        if include is not None or exclude is not None:
+            read_filters = (None if include is None else tuple(include), None if exclude is None else tuple(exclude))
+        if self.__file and self.__file in self.__read and read_filters != self.__read_filters:
+            raise UnsupportedOperation("Cannot read file %s with include=%s and exclude=%s after it was read with "
+                                       "different filters. Please use a new HDF5IO object."
+                                       % (self.source, include, exclude))
+        self.__read_filters = read_filters
         try:
             return super().read(**kwargs)
         except UnsupportedOperation as e:
@@ -500,10 +669,203 @@ class HDF5IO(HDMFIO):
         if specloc is not None:
             ignore.add(self.__file[specloc].name)
         if f_builder is None:
-            f_builder = self.__read_group(self.__file, ROOT_NAME, ignore=ignore)
+            index_key = None
+            if self.__read_filters is not None:
+                self.__read_selection = self.__select_read_paths(*self.__read_filters)
+            elif self.__index_path is not None:
+                try:
+                    index_key = get_index_key(self.__file.filename)
+                except OSError:
+                    self.logger.debug("Cannot index file %s, which is not a local file" % self.__file.filename)
+            with trusted_calls():
+                tree = None if index_key is None else load_index(self.__index_path, index_key)
+                if tree is not None:
+                    f_builder = self.__read_index(tree)
+                else:
+                    f_builder = self.__read_group(self.__file, ROOT_NAME, ignore=ignore)
+                    if index_key is not None:
+                        self.__write_index(f_builder, index_key)
             self.__read[self.__file] = f_builder
         return f_builder
 
+    @staticmethod
+    def __get_index_path(builder, root):
+        """Get the path of a read builder in its file"""
+        if builder is root:
+            return '/'
+        return pp(builder.location, builder.name).as_posix()
+
+    @staticmethod
+    def __get_index_dataset_kind(data):
+        """Get the kind of data of a read DatasetBuilder used in the index"""
+        if isinstance(data, BuilderH5TableDataset):
+            return 'table'
+        if isinstance(data, BuilderH5RegionDataset):
+            return 'region'
+        if isinstance(data, BuilderH5ReferenceDataset):
+            return 'ref'
+        if isinstance(data, StrDataset):
+            return 'str'
+        if isinstance(data, (Dataset, H5MemmapDataset)):
+            return 'h5'
+        if isinstance(data, (ReferenceBuilder, RegionBuilder)):
+            return 'read'  # scalar references are read from the file
+        return 'scalar'
+
+    def __get_index_node(self, builder, path, root):
+        """Get the node of the index of a read GroupBuilder or DatasetBuilder and its children"""
+        attributes = dict()
+        for key, value in builder.attributes.items():
+            if isinstance(value, Builder):
+                value = ('ref', self.__get_index_path(value, root))
+            attributes[key] = value
+        if isinstance(builder, DatasetBuilder):
+            kind = self.__get_index_dataset_kind(builder.data)
+            return ('d', builder.name, attributes, kind, builder.data if kind == 'scalar' else None)
+        children = list()
+        for name, child in chain(builder.groups.items(), builder.datasets.items()):
+            child_path = pp(path, name).as_posix()
+            if child.parent is builder:
+                children.append(self.__get_index_node(child, child_path, root))
+            else:  # the same object is in another group as well
+                children.append(('s', name, self.__get_index_path(child, root)))
+        for name, link in builder.links.items():
+            target = link.builder
+            external = target.source != root.source
+            children.append(('l', name, self.__get_index_path(target, root), external))
+        return ('g', builder.name, attributes, children)
+
+    def __write_index(self, builder, index_key):
+        """Write the index of the builder tree read from the file"""
+        try:
+            save_index(self.__index_path, index_key, self.__get_index_node(builder, '/', builder))
+        except Exception as e:
+            warnings.warn("Could not write the index of file %s to %s: %s"
+                          % (self.__file.filename, self.__index_path, e))
+
+    def __read_index(self, tree):
+        """Build the builder tree of the file from its index"""
+        self.logger.debug("Reading builder tree of file %s from index %s" % (self.__file.filename, self.__index_path))
+        self.__indexed = True
+        source = os.path.abspath(self.__file.filename)
+        paths = dict()
+        deferred = list()  # references, links, and scalar references are resolved once the tree is built
+        root = self.__read_index_node(tree, '/', source, None, paths, deferred)
+        self.__read[self.__file] = root  # needed to find the builders of the objects that are not in the index
+        for resolve in deferred:
+            resolve()
+        return root
+
+    def __read_index_node(self, node, path, source, parent, paths, deferred):
+        """Build the builder of a node of the index and add it to its parent"""
+        kind, name = node[0], node[1]
+        if kind not in ('g', 'd'):
+            deferred.append(partial(self.__read_index_link, node, path, source, parent, paths))
+            return
+        if kind == 'd' and node[3] == 'read':
+            deferred.append(partial(self.__read_index_scalar_ref, path, name, parent))
+            return
+        attributes = dict()
+        for key, value in node[2].items():
+            if isinstance(value, tuple):  # a reference, which is set once the tree is built
+                deferred.append(partial(self.__read_index_ref_attr, path, key, value[1], paths))
+            else:
+                attributes[key] = value
+        if kind == 'g':
+            builder = GroupBuilder(name, attributes=attributes, source=source)
+            prefix = path if path != '/' else ''
+            for child in node[3]:
+                self.__read_index_node(child, prefix + '/' + child[1], source, builder, paths, deferred)
+        else:
+            h5obj = Dataset(h5py.h5d.open(self.__file.id, path.encode('utf-8')))
+            builder = self.__read_index_dataset(h5obj, name, attributes, node[3], node[4], source)
+            self.__set_built(self.__file.filename, h5obj.id, builder)
+        builder.location = path[:path.rindex('/')] or '/'
+        self.__set_written(builder)
+        paths[path] = builder
+        if parent is not None:
+            if kind == 'g':
+                parent.set_group(builder)
+            else:
+                parent.set_dataset(builder)
+        return builder
+
+    def __read_index_dataset(self, h5obj, name, attributes, kind, value, source):
+        """Build the DatasetBuilder of a dataset in the index from the kind of its data"""
+        kwargs = {'attributes': attributes, 'dtype': h5obj.dtype, 'maxshape': h5obj.maxshape, 'source': source}
+        if kind == 'scalar':
+            data = value
+        elif kind == 'str':
+            data = StrDataset(h5obj, None)
+        elif kind == 'ref':
+            data = BuilderH5ReferenceDataset(h5obj, self)
+            kwargs['dtype'] = data.dtype
+        elif kind == 'region':
+            data = BuilderH5RegionDataset(h5obj, self)
+            kwargs['dtype'] = data.dtype
+        elif kind == 'table':
+            data, kwargs['dtype'] = self.__read_table(h5obj)
+        else:
+            data = self.__get_memmap(h5obj)
+        return DatasetBuilder(name, data=data, **kwargs)
+
+    def __read_index_builder(self, path, paths):
+        """Get the builder of an object of the file that is in the index, or read it from the file"""
+        builder = paths.get(path)
+        if builder is None:
+            builder = self.__read_ref(self.__file[path])
+        return builder
+
+    def __read_index_ref_attr(self, path, key, target_path, paths):
+        paths[path].set_attribute(key, self.__read_index_builder(target_path, paths))
+
+    def __read_index_scalar_ref(self, path, name, parent):
+        h5obj = self.__file[path]
+        builder = self.__read_dataset(h5obj, name)
+        self.__set_built(self.__file.filename, h5obj.id, builder)
+        parent.set_dataset(builder)
+
+    def __read_index_link(self, node, path, source, parent, paths):
+        kind, name, target_path = node[:3]
+        if kind == 's':
+            builder = self.__read_index_builder(target_path, paths)
+            if isinstance(builder, GroupBuilder):
+                parent.set_group(builder)
+            else:
+                parent.set_dataset(builder)
+            return
+        if node[3]:  # external link
+            sub_h5obj = self.__file[path]
+            builder = self.__read_ref(sub_h5obj)
+            self.__open_links.append(sub_h5obj)
+        else:
+            builder = self.__read_index_builder(target_path, paths)
+        link_builder = LinkBuilder(builder=builder, name=name, source=source)
+        link_builder.location = os.path.dirname(path)
+        self.__set_written(link_builder)
+        parent.set_link(link_builder)
+
+    def refresh(self):
+        """Refresh the datasets read from a file opened in SWMR mode with mode 'r' to the data written so far.
+
+        The shapes of the h5py.Dataset objects of the read builders and containers are cached until they are refreshed.
+        """
+        if not self.__swmr or self.__mode != 'r':
+            raise UnsupportedOperation("Cannot refresh file %s in mode '%s' with swmr=%s. Please use mode 'r' with "
+                                       "swmr=True." % (self.source, self.__mode, self.__swmr))
+        for builder in self.__built.get(self.__file.filename, dict()).values():
+            if isinstance(builder, DatasetBuilder):
+                data = builder.data
+                if isinstance(data, (Dataset, H5Dataset)):
+                    data.refresh()
+
+    def _get_ref_cache(self, fpath):
+        """Get the cache of the builders of the objects referenced from the datasets of references read from a file.
+
+        The builders are keyed by the address of the referenced object in the file.
+        """
+        return self.__ref_builders.setdefault(fpath, dict())
+
     def __set_written(self, builder):
         """
         Helper function used to set the written status for builders
@@ -564,6 +926,10 @@ class HDF5IO(HDMFIO):
         h5obj = getargs('h5obj', kwargs)
         fpath = h5obj.file.filename
         builder = self.__get_built(fpath, h5obj.id)
+        if builder is None and (self.__lazy or self.__indexed):
+            builder = self.__find_builder(h5obj)
+        if builder is None and self.__is_pruned(h5obj):
+            builder = self.__read_ref(h5obj)
         if builder is None:
             msg = '%s:%s has not been built' % (fpath, h5obj.name)
             raise ValueError(msg)
@@ -582,80 +948,226 @@ class HDF5IO(HDMFIO):
         container = self.manager.construct(builder)
         return container
 
-    def __read_group(self, h5obj, name=None, ignore=set()):
-        kwargs = {
-            "attributes": self.__read_attrs(h5obj),
-            "groups": dict(),
-            "datasets": dict(),
-            "links": dict()
-        }
-
-        for key, val in kwargs['attributes'].items():
-            if isinstance(val, bytes):
-                kwargs['attributes'][key] = val.decode('UTF-8')
-
+    def __read_group(self, h5obj, name=None, ignore=set(), prune=True):
         if name is None:
             name = str(os.path.basename(h5obj.name))
-        for k in h5obj:
-            sub_h5obj = h5obj.get(k)
-            if sub_h5obj is not None:
-                if sub_h5obj.name in ignore:
-                    continue
-                link_type = h5obj.get(k, getlink=True)
-                if isinstance(link_type, (SoftLink, ExternalLink)):
-                    # Reading links might be better suited in its own function
-                    # get path of link (the key used for tracking what's been built)
-                    target_path = link_type.path
-                    target_obj = sub_h5obj.file[target_path]
-                    builder_name = os.path.basename(target_path)
-                    # get builder if already read, else build it
-                    builder = self.__get_built(sub_h5obj.file.filename, target_obj.id)
-                    if builder is None:
-                        # NOTE: all links must have absolute paths
-                        if isinstance(target_obj, Dataset):
-                            builder = self.__read_dataset(target_obj, builder_name)
-                        else:
-                            builder = self.__read_group(target_obj, builder_name, ignore=ignore)
-                        self.__set_built(sub_h5obj.file.filename, target_obj.id, builder)
-                    link_builder = LinkBuilder(builder=builder, name=k, source=os.path.abspath(h5obj.file.filename))
-                    link_builder.location = h5obj.name
-                    self.__set_written(link_builder)
-                    kwargs['links'][builder_name] = link_builder
-                    if isinstance(link_type, ExternalLink):
-                        self.__open_links.append(sub_h5obj)
-                else:
-                    builder = self.__get_built(sub_h5obj.file.filename, sub_h5obj.id)
-                    obj_type = None
-                    read_method = None
-                    if isinstance(sub_h5obj, Dataset):
-                        read_method = self.__read_dataset
-                        obj_type = kwargs['datasets']
-                    else:
-                        read_method = partial(self.__read_group, ignore=ignore)
-                        obj_type = kwargs['groups']
-                    if builder is None:
-                        builder = read_method(sub_h5obj)
-                        self.__set_built(sub_h5obj.file.filename, sub_h5obj.id, builder)
-                    obj_type[builder.name] = builder
-            else:
-                warnings.warn('Path to Group altered/broken at ' + os.path.join(h5obj.name, k), BrokenLinkWarning)
-                kwargs['datasets'][k] = None
-                continue
-        kwargs['source'] = os.path.abspath(h5obj.file.filename)
-        ret = GroupBuilder(name, **kwargs)
+        source = os.path.abspath(h5obj.file.filename)
+        if prune and self.__is_pruned(h5obj):
+            # groups outside of the selected part of the file are read entirely when they are first accessed
+            ret = LazyGroupBuilder(name, loader=partial(self.__load_group, h5obj, ignore=ignore, prune=False),
+                                   source=source)
+        elif self.__lazy:
+            ret = LazyGroupBuilder(name, loader=partial(self.__load_group, h5obj, ignore=ignore, prune=prune),
+                                   source=source)
+        else:
+            ret = GroupBuilder(name, source=source)
+            self.__load_group(h5obj, ret, ignore=ignore, prune=prune)
         ret.location = os.path.dirname(h5obj.name)
         self.__set_written(ret)
         return ret
 
+    def __is_pruned(self, h5obj):
+        """Whether an HDF5 object in this file is outside of the part of the file selected with include and exclude"""
+        if self.__read_selection is None or h5obj.file != self.__file:
+            return False
+        return self.__get_read_state(h5obj.name, h5obj) == self.__PRUNED
+
+    def __get_type_key(self, h5obj):
+        """Get the name of the attribute that stores the data type of an HDF5 object"""
+        if isinstance(h5obj, Group):
+            return self.manager.namespace_catalog.group_spec_cls.type_key()
+        return self.manager.namespace_catalog.dataset_spec_cls.type_key()
+
+    def __get_data_type(self, h5obj):
+        """Get the data type of an HDF5 object, or None if it does not have one"""
+        data_type = h5obj.attrs.get(self.__get_type_key(h5obj))
+        return data_type.decode('utf-8') if isinstance(data_type, bytes) else data_type
+
+    def __has_data_type(self, h5obj):
+        """Whether an HDF5 object has a data type, without reading the data type"""
+        return self.__get_type_key(h5obj) in h5obj.attrs
+
+    def __match_read_filter(self, patterns, path, get_h5obj):
+        """Whether the path or data type of an object matches any of the given path globs or data type names.
+        The object is only opened with get_h5obj and its data type read if one of the patterns is a data type name."""
+        data_type = None
+        for pattern in patterns:
+            if '/' in pattern:
+                if fnmatchcase(path, pattern):
+                    return True
+            else:
+                if data_type is None:
+                    data_type = self.__get_data_type(get_h5obj()) or ''
+                if fnmatchcase(data_type, pattern):
+                    return True
+        return False
+
+    def __select_read_paths(self, include, exclude):
+        """Find the objects that match include and the groups on the path to them.
+
+        Returns a dict that maps paths to their read state: INCLUDED for objects that match include (or all objects if
+        include is None), KEPT for the groups on the path to them, and PRUNED for the objects that match exclude. The
+        objects in these groups are not visited; their state is determined when they are read. Objects are only opened
+        to read their data type if a filter is a data type name, or to visit the objects in groups.
+        """
+        selection = {'/': self.__INCLUDED if include is None else self.__KEPT}
+        if include is None:
+            return selection
+        visited = set()
+        stack = [('/', self.__file.id)]
+        while stack:
+            path, gid = stack.pop()
+            prefix = path.rstrip('/') + '/'
+            for name in gid:
+                if gid.links.get_info(name).type != h5py.h5l.TYPE_HARD:
+                    continue  # the targets of links are read where they are in the file
+                child_path = prefix + name.decode('utf-8')
+                get_h5obj = partial(self.__file.get, child_path)
+                if exclude and self.__match_read_filter(exclude, child_path, get_h5obj):
+                    selection[child_path] = self.__PRUNED
+                elif self.__match_read_filter(include, child_path, get_h5obj):
+                    selection[child_path] = self.__INCLUDED
+                    ancestor = path
+                    while ancestor not in selection:
+                        selection[ancestor] = self.__KEPT
+                        ancestor = ancestor.rsplit('/', 1)[0] or '/'
+                else:
+                    info = h5py.h5o.get_info(gid, name)
+                    if info.type == h5py.h5o.TYPE_GROUP and info.addr not in visited:
+                        visited.add(info.addr)
+                        stack.append((child_path, h5py.h5g.open(gid, name)))
+        return selection
+
+    def __get_read_state(self, path, h5obj=None):
+        """Get the read state of the object at the given path of this file with the include and exclude filters.
+
+        Objects in excluded groups and objects that match exclude are PRUNED. Objects in included groups are INCLUDED.
+        Objects without a data type in the groups on the path to the included objects are KEPT, and the other objects
+        in these groups are PRUNED.
+        """
+        state = self.__read_selection.get(path)
+        if state is None:
+            parent_state = self.__get_read_state(path.rsplit('/', 1)[0] or '/')
+            get_h5obj = partial(self.__file.get, path) if h5obj is None else lambda: h5obj
+            exclude = self.__read_filters[1]
+            if parent_state == self.__PRUNED or (exclude and self.__match_read_filter(exclude, path, get_h5obj)):
+                state = self.__PRUNED
+            elif parent_state == self.__INCLUDED:
+                state = self.__INCLUDED
+            elif not self.__has_data_type(get_h5obj()):
+                state = self.__KEPT
+            else:
+                state = self.__PRUNED
+            self.__read_selection[path] = state
+        return state
+
+    def __load_group(self, h5obj, group_builder, ignore=set(), prune=True):
+        """Read the attributes, subgroups, datasets, and links of the given HDF5 group into the given GroupBuilder.
+
+        If prune is True, the subgroups and datasets outside of the part of the file selected with include and exclude
+        are not read.
+        """
+        with trusted_calls():
+            attributes = self.__read_attrs(h5obj)
+            groups = dict()
+            datasets = dict()
+            links = dict()
+            select = prune and self.__read_selection is not None and h5obj.file == self.__file
+            prefix = h5obj.name.rstrip('/') + '/'
+            for k in h5obj:
+                if select and not isinstance(h5obj.get(k, getlink=True), (SoftLink, ExternalLink)):
+                    # skip the pruned objects, but keep links
+                    if self.__get_read_state(prefix + k) == self.__PRUNED:
+                        continue
+                sub_h5obj = h5obj.get(k)
+                if sub_h5obj is not None:
+                    if sub_h5obj.name in ignore:
+                        continue
+                    link_type = h5obj.get(k, getlink=True)
+                    if isinstance(link_type, (SoftLink, ExternalLink)):
+                        # Reading links might be better suited in its own function
+                        # get path of link (the key used for tracking what's been built)
+                        target_path = link_type.path
+                        target_obj = sub_h5obj.file[target_path]
+                        builder_name = os.path.basename(target_path)
+                        # get builder if already read, else build it
+                        builder = self.__get_built(sub_h5obj.file.filename, target_obj.id)
+                        if builder is None and (self.__lazy or self.__indexed):
+                            builder = self.__find_builder(target_obj)
+                        if builder is None:
+                            # NOTE: all links must have absolute paths
+                            if isinstance(target_obj, Dataset):
+                                builder = self.__read_dataset(target_obj, builder_name)
+                            else:
+                                builder = self.__read_group(target_obj, builder_name, ignore=ignore, prune=prune)
+                            self.__set_built(sub_h5obj.file.filename, target_obj.id, builder)
+                        link_builder = LinkBuilder(builder=builder, name=k,
+                                                   source=os.path.abspath(h5obj.file.filename))
+                        link_builder.location = h5obj.name
+                        self.__set_written(link_builder)
+                        links[builder_name] = link_builder
+                        if isinstance(link_type, ExternalLink):
+                            self.__open_links.append(sub_h5obj)
+                    else:
+                        builder = self.__get_built(sub_h5obj.file.filename, sub_h5obj.id)
+                        obj_type = None
+                        read_method = None
+                        if isinstance(sub_h5obj, Dataset):
+                            read_method = self.__read_dataset
+                            obj_type = datasets
+                        else:
+                            read_method = partial(self.__read_group, ignore=ignore, prune=prune)
+                            obj_type = groups
+                        if builder is None:
+                            builder = read_method(sub_h5obj)
+                            self.__set_built(sub_h5obj.file.filename, sub_h5obj.id, builder)
+                        obj_type[builder.name] = builder
+                else:
+                    warnings.warn('Path to Group altered/broken at ' + os.path.join(h5obj.name, k), BrokenLinkWarning)
+                    datasets[k] = None
+                    continue
+
+            for key, val in attributes.items():
+                group_builder.set_attribute(key, val)
+            for builder in groups.values():
+                group_builder.set_group(builder)
+            for builder in datasets.values():
+                if builder is not None:
+                    group_builder.set_dataset(builder)
+            for builder in links.values():
+                group_builder.set_link(builder)
+
+    def __find_builder(self, h5obj):
+        """Find the builder for an HDF5 object in this file by loading the lazily read groups on the path to it.
+
+        Returns None if the object is not in this file, the file has not been read yet, or the object cannot be
+        reached from the root builder (e.g., because one of the groups on the path is still being loaded).
+        """
+        builder = self.__read.get(self.__file)
+        if builder is None or h5obj.file != self.__file:
+            return None
+        for name in h5obj.name.split('/'):
+            if not name:
+                continue
+            if not isinstance(builder, GroupBuilder):
+                return None
+            child = builder.groups.get(name)
+            if child is None:
+                child = builder.datasets.get(name)
+            if child is None:
+                link = builder.links.get(name)
+                child = link.builder if link is not None else None
+            if child is None:
+                return None
+            builder = child
+        return builder
+
     def __read_dataset(self, h5obj, name=None):
         kwargs = {
             "attributes": self.__read_attrs(h5obj),
             "dtype": h5obj.dtype,
             "maxshape": h5obj.maxshape
         }
-        for key, val in kwargs['attributes'].items():
-            if isinstance(val, bytes):
-                kwargs['attributes'][key] = val.decode('UTF-8')
 
         if name is None:
             name = str(os.path.basename(h5obj.name))
@@ -692,18 +1204,37 @@ class HDF5IO(HDMFIO):
                     d = BuilderH5ReferenceDataset(h5obj, self)
                     kwargs['dtype'] = d.dtype
             elif h5obj.dtype.kind == 'V':  # table / compound data type
-                cpd_dt = h5obj.dtype
-                ref_cols = [check_dtype(ref=cpd_dt[i]) or check_dtype(vlen=cpd_dt[i]) for i in range(len(cpd_dt))]
-                d = BuilderH5TableDataset(h5obj, self, ref_cols)
-                kwargs['dtype'] = HDF5IO.__compound_dtype_to_list(h5obj.dtype, d.dtype)
+                d, kwargs['dtype'] = self.__read_table(h5obj)
             else:
-                d = h5obj
+                d = self.__get_memmap(h5obj)
             kwargs["data"] = d
         ret = DatasetBuilder(name, **kwargs)
         ret.location = os.path.dirname(h5obj.name)
         self.__set_written(ret)
         return ret
 
+    def __get_memmap(self, h5obj):
+        """Get a dataset that reads from a read-only memory map of a numeric dataset that is stored contiguously
+        without filters in a local file.
+
+        Returns the dataset itself if memory mapping is not enabled or the dataset cannot be memory-mapped, e.g.,
+        because it is chunked, compact, stored externally, not allocated, or in a file that is not on disk.
+        """
+        if not self.__memmap or h5obj.dtype.kind not in 'iufc' or h5obj.size == 0 or h5obj.external is not None:
+            return h5obj
+        offset = h5obj.id.get_offset()  # None unless the layout is contiguous, which excludes filters
+        if offset is None or h5obj.file.driver != 'sec2' or h5obj.id.get_storage_size() != h5obj.nbytes:
+            return h5obj
+        memmap = np.memmap(h5obj.file.filename, dtype=h5obj.dtype, mode='r', offset=offset, shape=h5obj.shape)
+        return H5MemmapDataset(h5obj, self, memmap)
+
+    def __read_table(self, h5obj):
+        """Get the data and dtype of the DatasetBuilder of a dataset with a compound data type"""
+        cpd_dt = h5obj.dtype
+        ref_cols = [check_dtype(ref=cpd_dt[i]) or check_dtype(vlen=cpd_dt[i]) for i in range(len(cpd_dt))]
+        d = BuilderH5TableDataset(h5obj, self, ref_cols)
+        return d, HDF5IO.__compound_dtype_to_list(h5obj.dtype, d.dtype)
+
     def _check_str_dtype(self, h5obj):
         dtype = h5obj.dtype
         if dtype.kind == 'O':
@@ -718,22 +1249,76 @@ class HDF5IO(HDMFIO):
             ret.append({'name': name, 'dtype': dtype})
         return ret
 
+    def __get_attr_type(self, attr):
+        """Get the dtype, memory type, and whether the type is a variable-length string of an attribute.
+
+        These are cached for each HDF5 datatype, because files typically have many attributes with a few datatypes.
+        """
+        tid = attr.get_type()
+        for cached_tid, attr_type in self.__attr_types:
+            if cached_tid == tid:
+                return attr_type
+        dtype = tid.dtype
+        string_info = h5py.check_string_dtype(dtype)
+        attr_type = (dtype, h5py.h5t.py_create(dtype), string_info is not None and string_info.length is None)
+        # committed datatypes belong to a file, so they are not cached
+        if not tid.committed() and len(self.__attr_types) < self.__MAX_ATTR_TYPES:
+            self.__attr_types.append((tid, attr_type))
+        return attr_type
+
     def __read_attrs(self, h5obj):
+        """Read the attributes of an HDF5 object with the low-level h5py API.
+
+        Scalar bytes are decoded, and object references are resolved to the builders of the referenced objects.
+        """
         ret = dict()
-        for k, v in h5obj.attrs.items():
+        obj_id = h5obj['/'].id if isinstance(h5obj, File) else h5obj.id  # the attributes of a file are on its root
+        refs = dict()
+        plist = obj_id.get_create_plist()
+        if plist.get_attr_creation_order() & h5py.h5p.CRT_ORDER_TRACKED:  # match the order of h5py
+            index_type = h5py.h5.INDEX_CRT_ORDER
+        else:
+            index_type = h5py.h5.INDEX_NAME
+        for i in range(h5py.h5a.get_num_attrs(obj_id)):
+            attr = h5py.h5a.open(obj_id, index=i, index_type=index_type)
+            k = attr.name.decode('utf-8', 'surrogateescape')
             if k == SPEC_LOC_ATTR:  # ignore cached spec
                 continue
-            if isinstance(v, RegionReference):
+            shape = attr.shape
+            dtype, htype, vlen_str = self.__get_attr_type(attr)
+            if shape is None or dtype.subdtype is not None:  # empty attributes and array types are rare
+                v = h5obj.attrs[k]
+            else:
+                v = np.empty(shape, dtype=dtype)
+                attr.read(v, mtype=htype)
+                if vlen_str:
+                    if len(shape) == 0:
+                        v = v[()].decode('utf-8', 'surrogateescape')
+                    else:
+                        v = np.array([b.decode('utf-8', 'surrogateescape') for b in v.flat],
+                                     dtype=dtype).reshape(shape)
+                elif len(shape) == 0:
+                    v = v[()]
+            if isinstance(v, bytes):
+                v = v.decode('UTF-8')
+            elif isinstance(v, RegionReference):
                 raise ValueError("cannot read region reference attributes yet")
             elif isinstance(v, Reference):
-                ret[k] = self.__read_ref(h5obj.file[v])
-            else:
-                ret[k] = v
+                refs[k] = v
+            ret[k] = v
+        if refs:
+            # look up the builders of the referenced objects by ID and only open the objects that have not been read
+            fpath = h5obj.file.filename
+            for k, v in refs.items():
+                builder = self.__get_built(fpath, h5py.h5r.dereference(v, obj_id))
+                ret[k] = builder if builder is not None else self.__read_ref(h5obj.file[v])
         return ret
 
     def __read_ref(self, h5obj):
         ret = None
         ret = self.__get_built(h5obj.file.filename, h5obj.id)
+        if ret is None and (self.__lazy or self.__indexed):
+            ret = self.__find_builder(h5obj)
         if ret is None:
             if isinstance(h5obj, Dataset):
                 ret = self.__read_dataset(h5obj)
@@ -754,6 +1339,11 @@ class HDF5IO(HDMFIO):
             if self.driver is not None:
                 kwargs.update(driver=self.driver)
 
+            if self.__swmr:
+                kwargs.update(libver='latest')
+                if open_flag == 'r':
+                    kwargs.update(swmr=True)
+
             self.__file = File(self.source, open_flag, **kwargs)
 
     def close(self, close_links=True):
@@ -767,6 +1357,7 @@ class HDF5IO(HDMFIO):
         try:
             if self.__file is not None:
                 self.__file.close()
+            self.__ref_builders = dict()
         except AttributeError:
             # Do not do anything in case that self._file does not exist. This
             # may happen in case that an error occurs before HDF5IO has been fully
@@ -805,17 +1396,33 @@ class HDF5IO(HDMFIO):
              'doc': 'The source of the builders when exporting', 'default': None})
     def write_builder(self, **kwargs):
         f_builder = popargs('builder', kwargs)
+        if self.__swmr:
+            if self.__file.swmr_mode:
+                raise UnsupportedOperation("Cannot write to file %s after SWMR mode was enabled." % self.source)
+            # write the DataChunkIterators after SWMR mode is enabled
+            kwargs['exhaust_dci'] = False
         link_data, exhaust_dci, export_source = getargs('link_data', 'exhaust_dci', 'export_source', kwargs)
         self.logger.debug("Writing GroupBuilder '%s' to path '%s' with kwargs=%s"
                           % (f_builder.name, self.source, kwargs))
-        for name, gbldr in f_builder.groups.items():
-            self.write_group(self.__file, gbldr, **kwargs)
-        for name, dbldr in f_builder.datasets.items():
-            self.write_dataset(self.__file, dbldr, **kwargs)
-        for name, lbldr in f_builder.links.items():
-            self.write_link(self.__file, lbldr, export_source=kwargs.get("export_source"))
-        self.set_attributes(self.__file, f_builder.attributes)
-        self.__add_refs()
+        if self.__layout_planner is not None:
+            self.__planned_layouts = self.__layout_planner.plan(f_builder, self.manager.namespace_catalog)
+            self.__pending_layouts = self.__planned_layouts
+        try:
+            with trusted_calls():
+                for name, gbldr in f_builder.groups.items():
+                    self.write_group(self.__file, gbldr, **kwargs)
+                for name, dbldr in f_builder.datasets.items():
+                    self.write_dataset(self.__file, dbldr, **kwargs)
+                for name, lbldr in f_builder.links.items():
+                    self.write_link(self.__file, lbldr, export_source=kwargs.get("export_source"))
+                self.set_attributes(self.__file, f_builder.attributes)
+                self.__add_refs()
+        finally:
+            self.__pending_layouts = dict()
+        if self.__swmr:
+            self.logger.debug("Enabling SWMR mode for file '%s'" % self.source)
+            self.__file.flush()
+            self.__file.swmr_mode = True
         self.__dci_queue.exhaust_queue()
         self.__set_written(f_builder)
         self.logger.debug("Done writing %s '%s' to path '%s'" %
@@ -831,18 +1438,22 @@ class HDF5IO(HDMFIO):
         will be references, and then write them after we write everything else.
         '''
         failed = set()
-        while len(self.__ref_queue) > 0:
-            call = self.__ref_queue.popleft()
-            self.logger.debug("Adding reference with call id %d from queue (length %d)"
-                              % (id(call), len(self.__ref_queue)))
-            try:
-                call()
-            except KeyError:
-                if id(call) in failed:
-                    raise RuntimeError('Unable to resolve reference')
-                self.logger.debug("Adding reference with call id %d failed. Appending call to queue" % id(call))
-                failed.add(id(call))
-                self.__ref_queue.append(call)
+        self.__ref_cache = dict()
+        try:
+            while len(self.__ref_queue) > 0:
+                call = self.__ref_queue.popleft()
+                self.logger.debug("Adding reference with call id %d from queue (length %d)"
+                                  % (id(call), len(self.__ref_queue)))
+                try:
+                    call()
+                except KeyError:
+                    if id(call) in failed:
+                        raise RuntimeError('Unable to resolve reference')
+                    self.logger.debug("Adding reference with call id %d failed. Appending call to queue" % id(call))
+                    failed.add(id(call))
+                    self.__ref_queue.append(call)
+        finally:
+            self.__ref_cache = None
 
     @classmethod
     def get_type(cls, data):
@@ -958,13 +1569,10 @@ class HDF5IO(HDMFIO):
                           % (obj.__class__.__name__, obj.name, key, value.__class__.__name__))
         if isinstance(value, (tuple, list)):
             def _filler():
-                ret = list()
-                for item in value:
-                    ret.append(self.__get_ref(item))
-                obj.attrs[key] = ret
+                obj.attrs[key] = [self.__resolve_ref(item) for item in value]
         else:
             def _filler():
-                obj.attrs[key] = self.__get_ref(value)
+                obj.attrs[key] = self.__resolve_ref(value)
         return _filler
 
     @docval({'name': 'parent', 'type': Group, 'doc': 'the parent HDF5 object'},
@@ -983,6 +1591,12 @@ class HDF5IO(HDMFIO):
         if self.get_written(builder):
             self.logger.debug("    GroupBuilder '%s' is already written" % builder.name)
             group = parent[builder.name]
+            if self.__is_unchanged(builder):
+                self.logger.debug("    GroupBuilder '%s' is unchanged" % builder.name)
+                return group
+        elif kwargs.get('export_source') is not None and self.__copy_unmodified_group(parent, builder):
+            self.__set_written(builder)
+            return parent[builder.name]
         else:
             self.logger.debug("    Creating group '%s'" % builder.name)
             group = parent.create_group(builder.name)
@@ -1007,6 +1621,130 @@ class HDF5IO(HDMFIO):
         self.__set_written(builder)
         return group
 
+    def __is_unchanged(self, builder):
+        """Return whether a written GroupBuilder was not changed by the build of the container that is being written.
+
+        A builder is changed if it was built or rebuilt by the manager, or if it is an untyped group of such a builder.
+        """
+        if not self.__skip_unchanged:
+            return False
+        if isinstance(builder, LazyGroupBuilder) and not builder.loaded:
+            return True  # the builder was not accessed since it was read
+        type_key = self.manager.namespace_catalog.group_spec_cls.type_key()
+        while not self.manager.was_built(builder):
+            if type_key in builder.attributes or builder.parent is None:
+                return True
+            builder = builder.parent
+        return False
+
+    def __copy_unmodified_group(self, parent, builder):
+        """Copy the group of an unmodified GroupBuilder read from the file being exported with a single H5Ocopy.
+
+        The group is copied only if the builder is the builder read from the source file at the same path, i.e., its
+        container and the containers below it were not modified, and its subtree does not contain external links or
+        region references. The object references in the copied subtree are remapped to the destination file by path
+        after all objects are written.
+
+        :return: True if the group was copied, False if it needs to be written from the builder
+        """
+        src_io = self.__export_src_io
+        if src_io is None or not src_io._file:
+            return False
+        src_file = src_io._file
+        path = self.__get_path(builder)
+        src_group = src_file.get(path)
+        if (not isinstance(src_group, Group) or path != pp(parent.name, builder.name).as_posix()
+                or src_io.__get_built(src_file.filename, src_group.id) is not builder):
+            return False
+        refs = self.__find_refs(src_group)
+        if refs is None:
+            return False
+        self.logger.debug("    Copying unmodified group '%s://%s' to '%s'" % (src_file.filename, path, path))
+        parent.copy(source=src_group, dest=parent, name=builder.name, expand_soft=False, expand_external=False)
+        dsets, attrs = refs
+        if dsets or attrs:
+            self.__queue_ref(partial(self.__remap_refs, src_group, parent[builder.name], dsets, attrs))
+        return True
+
+    @staticmethod
+    def __find_refs(group):
+        """Find the object references in the subtree of an HDF5 group.
+
+        :return: the relative paths of the datasets with object references and the (relative path, name) pairs of the
+                 attributes with object references, or None if the subtree contains region references or external links
+        """
+        dsets, attrs = list(), list()
+
+        def ref_type(dtype):
+            if dtype.names is not None:
+                types = {ref_type(dtype[name]) for name in dtype.names}
+                return RegionReference if RegionReference in types else (Reference if Reference in types else None)
+            return check_dtype(ref=dtype)
+
+        def visit(name, obj):
+            for key in obj.attrs:
+                rtype = ref_type(obj.attrs.get_id(key).dtype)
+                if rtype is RegionReference:
+                    return True
+                if rtype is Reference:
+                    attrs.append((name, key))
+            if isinstance(obj, Dataset):
+                rtype = ref_type(obj.dtype)
+                if rtype is RegionReference:
+                    return True
+                if rtype is Reference:
+                    dsets.append(name)
+            elif any(isinstance(obj.get(key, getlink=True), ExternalLink) for key in obj):
+                return True
+            return None
+
+        if visit('.', group) or group.visititems(visit):
+            return None
+        return dsets, attrs
+
+    def __remap_refs(self, src_group, dst_group, dsets, attrs):
+        """Rewrite the object references of a copied subtree from the values in the source file, with each reference
+        pointing to the object at the same path in this file"""
+        src_id = src_group.file.id
+        refs = dict()
+
+        def remap(ref):
+            if not ref:
+                return ref
+            name = h5py.h5r.get_name(ref, src_id)
+            ret = refs.get(name)
+            if ret is None:
+                ret = refs[name] = self.__file[name.decode('utf-8')].ref
+            return ret
+
+        def remap_array(data):
+            if data.dtype.names is not None:
+                data = data.copy()
+                for field in data.dtype.names:
+                    if check_dtype(ref=data.dtype[field]) is Reference:
+                        data[field] = remap_array(data[field])
+                return data
+            ret = np.empty(data.shape, dtype=H5_REF)
+            for idx, ref in np.ndenumerate(data):
+                ret[idx] = remap(ref)
+            return ret
+
+        for name in dsets:
+            src, dst = src_group[name], dst_group[name]
+            if src.shape == ():
+                value = src[()]
+                dst[()] = remap(value) if isinstance(value, Reference) else remap_array(np.asarray(value))[()]
+                continue
+            for start in range(0, src.shape[0], self.__write_block_size):
+                sl = slice(start, start + self.__write_block_size)
+                dst[sl] = remap_array(src[sl])
+        for name, key in attrs:
+            value = src_group[name].attrs[key]
+            if isinstance(value, Reference):
+                dst_group[name].attrs[key] = remap(value)
+            else:
+                dst_group[name].attrs.create(key, remap_array(np.asarray(value)), dtype=value.dtype)
+
     def __get_path(self, builder):
         """Get the path to the builder.
 
@@ -1100,12 +1838,19 @@ class HDF5IO(HDMFIO):
             data = data.data
         else:
             options['io_settings'] = {}
+            layout = self.__pending_layouts.get(pp(parent.name, name).as_posix())
+            if layout is not None:
+                options['io_settings'] = self.__layout_planner.get_io_settings(layout)
         if isinstance(data, TermSetWrapper):
             # This is for when the wrapped item is a dataset
             # (refer to objectmapper.py for wrapped attributes)
             data = data.value
+        if isinstance(data, H5MemmapDataset):
+            # link to or copy the memory-mapped dataset like other read datasets
+            data = data.dataset
         attributes = builder.attributes
         options['dtype'] = builder.dtype
+        options['block_size'] = self.__write_block_size
         dset = None
         link = None
 
@@ -1195,18 +1940,15 @@ class HDF5IO(HDMFIO):
                     self.logger.debug("Resolving object references and setting attribute on dataset '%s' "
                                       "containing attributes: %s"
                                       % (name, list(attributes.keys())))
-                    ret = list()
-                    for item in data:
-                        new_item = list(item)
-                        for i in refs:
-                            new_item[i] = self.__get_ref(item[i])
-                        ret.append(tuple(new_item))
                     dset = parent[name]
-                    dset[:] = ret
+                    # resolve the references of each reference column of a block of rows at once
+                    convert = {i: partial(self.__get_refs, dtype=dset.dtype[i]) for i in refs}
+                    self.__write_compound(dset, data, self.__write_block_size, convert)
                     self.set_attributes(dset, attributes)
 
                 return
-            # If the compound data type contains only regular data (i.e., no references) then we can write it as usual
+            # If the compound data type contains only regular data (i.e., no references) then we can write it as usual,
+            # i.e., in blocks of rows
             else:
                 dset = self.__list_fill__(parent, name, data, options)
         # Write a dataset containing references, i.e., a region or object reference.
@@ -1226,7 +1968,7 @@ class HDF5IO(HDMFIO):
                     self.logger.debug("Resolving region reference and setting attribute on dataset '%s' "
                                       "containing attributes: %s"
                                       % (name, list(attributes.keys())))
-                    ref = self.__get_ref(data.builder, data.region)
+                    ref = self.__resolve_ref(data.builder, data.region)
                     dset = parent[name]
                     dset[()] = ref
                     self.set_attributes(dset, attributes)
@@ -1243,7 +1985,7 @@ class HDF5IO(HDMFIO):
                     self.logger.debug("Resolving object reference and setting attribute on dataset '%s' "
                                       "containing attributes: %s"
                                       % (name, list(attributes.keys())))
-                    ref = self.__get_ref(data.builder)
+                    ref = self.__resolve_ref(data.builder)
                     dset = parent[name]
                     dset[()] = ref
                     self.set_attributes(dset, attributes)
@@ -1262,11 +2004,9 @@ class HDF5IO(HDMFIO):
                         self.logger.debug("Resolving region references and setting attribute on dataset '%s' "
                                           "containing attributes: %s"
                                           % (name, list(attributes.keys())))
-                        refs = list()
-                        for item in data:
-                            refs.append(self.__get_ref(item.builder, item.region))
                         dset = parent[name]
-                        dset[()] = refs
+                        for start, block in self.__iter_blocks(data, self.__write_block_size):
+                            dset[start:start + len(block)] = self.__get_refs(block, dset.dtype)
                         self.set_attributes(dset, attributes)
                 # Write array of object references
                 else:
@@ -1281,11 +2021,9 @@ class HDF5IO(HDMFIO):
                         self.logger.debug("Resolving object references and setting attribute on dataset '%s' "
                                           "containing attributes: %s"
                                           % (name, list(attributes.keys())))
-                        refs = list()
-                        for item in data:
-                            refs.append(self.__get_ref(item))
                         dset = parent[name]
-                        dset[()] = refs
+                        for start, block in self.__iter_blocks(data, self.__write_block_size):
+                            dset[start:start + len(block)] = self.__get_refs(block, dset.dtype)
                         self.set_attributes(dset, attributes)
             return
         # write a "regular" dataset
@@ -1299,10 +2037,15 @@ class HDF5IO(HDMFIO):
                 dset = self.__scalar_fill__(parent, name, data, options)
             # Iterative write of a data chunk iterator
             elif isinstance(data, AbstractDataChunkIterator):
+                io_settings = options['io_settings']
+                if self.__swmr and 'shape' not in io_settings and data.maxshape is not None:
+                    # start with an empty unlimited axis so that SWMR readers see only the data that was written
+                    io_settings['shape'] = tuple(0 if m is None else n
+                                                 for n, m in zip(data.recommended_data_shape(), data.maxshape))
                 dset = self.__setup_chunked_dset__(parent, name, data, options)
                 self.__dci_queue.append(dataset=dset, data=data)
-            # Write a regular in memory array (e.g., numpy array, list etc.)
-            elif hasattr(data, '__len__'):
+            # Write a regular in memory array (e.g., numpy array, list etc.) or an iterator of rows, e.g., a generator
+            elif hasattr(data, '__len__') or isinstance(data, Iterator):
                 dset = self.__list_fill__(parent, name, data, options)
             # Write a regular scalar dataset
             else:
@@ -1435,9 +2178,13 @@ class HDF5IO(HDMFIO):
         # define the io settings and data type if necessary
         io_settings = {}
         dtype = None
+        block_size = cls.__BLOCK_SIZE
         if options is not None:
             dtype = options.get('dtype')
             io_settings = options.get('io_settings')
+            block_size = options.get('block_size', block_size)
+        if not hasattr(data, '__len__') and isinstance(data, Iterator):
+            return cls.__iter_fill__(parent, name, data, dtype, io_settings, block_size)
         if not isinstance(dtype, type):
             try:
                 dtype = cls.__resolve_dtype__(dtype, data)
@@ -1467,11 +2214,50 @@ class HDF5IO(HDMFIO):
             new_shape[0] = len(data)
             dset.resize(new_shape)
         try:
-            dset[:] = data
+            if dset.dtype.names is not None and dset.ndim == 1:
+                cls.__write_compound(dset, data, block_size)
+            elif isinstance(data, (list, tuple)) and dset.ndim > 0 and len(data) > block_size:
+                # convert blocks of rows instead of the whole list at once to bound the memory used
+                for start, block in cls.__iter_blocks(data, block_size):
+                    dset[start:start + len(block)] = block
+            else:
+                dset[:] = data
         except Exception as e:
             raise e
         return dset
 
+    @classmethod
+    def __iter_fill__(cls, parent, name, data, dtype, io_settings, block_size):
+        """Write the rows of an iterator of unknown length, e.g., a generator, in blocks of rows to a dataset that is
+        resized after each block. The dtype and the shape of the rows are determined from the first block."""
+        blocks = cls.__iter_blocks(data, block_size)
+        first = next(blocks, (0, list()))
+        if not isinstance(dtype, type):
+            try:
+                dtype = cls.__resolve_dtype__(dtype, first[1])
+            except Exception as exc:
+                msg = 'cannot add %s to %s - could not determine type' % (name, parent.name)
+                raise Exception(msg) from exc
+        row_shape = tuple()
+        if len(first[1]) > 0 and getattr(dtype, 'names', None) is None:
+            row_shape = tuple(get_data_shape(first[1])[1:])
+        io_settings = dict(io_settings)
+        io_settings.setdefault('maxshape', (None, ) + row_shape)
+        try:
+            dset = parent.create_dataset(name, shape=(0, ) + row_shape, dtype=dtype, **io_settings)
+        except Exception as exc:
+            msg = "Could not create dataset %s in %s with shape %s, dtype %s, and iosettings %s. %s" % \
+                  (name, parent.name, str((0, ) + row_shape), str(dtype), str(io_settings), str(exc))
+            raise Exception(msg) from exc
+        for start, block in chain((first, ), blocks):
+            if len(block) == 0:
+                continue
+            dset.resize(start + len(block), axis=0)
+            if dset.dtype.names is not None:
+                block = cls.__to_structured_array(block, dset.dtype)
+            dset[start:start + len(block)] = block
+        return dset
+
     @docval({'name': 'container', 'type': (Builder, Container, ReferenceBuilder), 'doc': 'the object to reference',
              'default': None},
             {'name': 'region', 'type': (slice, list, tuple), 'doc': 'the region reference indexing object',
@@ -1479,31 +2265,88 @@ class HDF5IO(HDMFIO):
             returns='the reference', rtype=Reference)
     def __get_ref(self, **kwargs):
         container, region = getargs('container', 'region', kwargs)
+        return self.__resolve_ref(container, region)
+
+    def __resolve_ref(self, container, region=None):
+        """Get the reference to the given object without validating the arguments. See __get_ref.
+
+        While references are being added, the HDF5 object and reference of each referenced builder are cached.
+        """
         if container is None:
             return None
         if isinstance(container, Builder):
-            self.logger.debug("Getting reference for %s '%s'" % (container.__class__.__name__, container.name))
             if isinstance(container, LinkBuilder):
                 builder = container.target_builder
             else:
                 builder = container
         elif isinstance(container, ReferenceBuilder):
-            self.logger.debug("Getting reference for %s '%s'" % (container.__class__.__name__, container.builder.name))
             builder = container.builder
         else:
-            self.logger.debug("Getting reference for %s '%s'" % (container.__class__.__name__, container.name))
             builder = self.manager.build(container)
-        path = self.__get_path(builder)
-        self.logger.debug("Getting reference at path '%s'" % path)
         if isinstance(container, RegionBuilder):
             region = container.region
+        cached = self.__ref_cache.get(id(builder)) if self.__ref_cache is not None else None
+        if cached is None:
+            path = self.__get_path(builder)
+            self.logger.debug("Getting reference for %s '%s' at path '%s'"
+                              % (container.__class__.__name__, builder.name, path))
+            obj = self.__file[path]
+            # keep a reference to the builder so that its id is not reused while it is cached
+            cached = (builder, obj, obj.ref)
+            if self.__ref_cache is not None:
+                self.__ref_cache[id(builder)] = cached
+        obj, ref = cached[1:]
         if region is not None:
-            dset = self.__file[path]
-            if not isinstance(dset, Dataset):
+            if not isinstance(obj, Dataset):
                 raise ValueError('cannot create region reference without Dataset')
-            return self.__file[path].regionref[region]
-        else:
-            return self.__file[path].ref
+            return obj.regionref[region]
+        return ref
+
+    def __get_refs(self, items, dtype):
+        """Get the references to the given objects, e.g., Builders or RegionBuilders, as an array of the given dtype"""
+        refs = np.empty(len(items), dtype=dtype)
+        for i, item in enumerate(items):
+            refs[i] = self.__resolve_ref(item)
+        return refs
+
+    __BLOCK_SIZE = 100000  # the default number of rows that are converted and written at once
+
+    @classmethod
+    def __iter_blocks(cls, data, block_size):
+        """Iterate over the elements of data in blocks of block_size elements. Yield the index of the first element
+        and the list of elements of each block."""
+        it = iter(data)
+        start = 0
+        while True:
+            block = list(islice(it, block_size))
+            if len(block) == 0:
+                return
+            yield start, block
+            start += len(block)
+
+    @classmethod
+    def __to_structured_array(cls, rows, dtype, convert=None):
+        """Convert a list of rows to a structured array with the given dtype column by column. convert maps the index
+        of a column to a function that converts the list of values of the column, e.g., to resolve references."""
+        values = np.empty(len(rows), dtype=dtype)
+        for i, field in enumerate(dtype.names):
+            column = [row[i] for row in rows]
+            values[field] = convert[i](column) if convert is not None and i in convert else column
+        return values
+
+    @classmethod
+    def __write_compound(cls, dset, data, block_size, convert=None):
+        """Write the rows of a compound dataset in blocks, so that only one block of rows is converted at a time.
+
+        Arrays and datasets are written in slices. Other data, e.g., lists of tuples, are iterated over, and each block
+        of rows is converted to a structured array. See __to_structured_array for convert.
+        """
+        if convert is None and isinstance(data, (np.ndarray, Dataset)):
+            for start in range(0, len(data), block_size):
+                dset[start:start + block_size] = data[start:start + block_size]
+            return
+        for start, block in cls.__iter_blocks(data, block_size):
+            dset[start:start + len(block)] = cls.__to_structured_array(block, dset.dtype, convert)
 
     def __is_ref(self, dtype):
         if isinstance(dtype, DtypeSpec):
@@ -1538,7 +2381,7 @@ class HDF5IO(HDMFIO):
             if isinstance(elem, (list, tuple)):
                 ret.append(self.__rec_get_ref(elem))
             elif isinstance(elem, (Builder, Container)):
-                ret.append(self.__get_ref(elem))
+                ret.append(self.__resolve_ref(elem))
             else:
                 ret.append(elem)
         return ret
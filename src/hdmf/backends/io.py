@@ -50,14 +50,19 @@ class HDMFIO(metaclass=ABCMeta):
         '''The source of the container being read/written i.e. file path'''
         return self.__source
 
-    @docval(returns='the Container object that was read in', rtype=Container)
+    @docval({'name': 'lazy', 'type': bool,
+             'doc': ('whether to construct the child containers of the root container only when their attributes are '
+                     'first accessed'),
+             'default': False},
+            returns='the Container object that was read in', rtype=Container)
     def read(self, **kwargs):
         """Read a container from the IO source."""
+        lazy = getargs('lazy', kwargs)
         f_builder = self.read_builder()
         if all(len(v) == 0 for v in f_builder.values()):
             # TODO also check that the keys are appropriate. print a better error message
             raise UnsupportedOperation('Cannot build data. There are no values.')
-        container = self.__manager.construct(f_builder)
+        container = self.__manager.construct(f_builder, lazy=lazy)
         container.read_io = self
         if self.herd_path is not None:
             from hdmf.common import HERD
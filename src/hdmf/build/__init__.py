@@ -1,4 +1,5 @@
-from .builders import Builder, DatasetBuilder, GroupBuilder, LinkBuilder, ReferenceBuilder, RegionBuilder
+from .builders import (Builder, DatasetBuilder, GroupBuilder, LazyGroupBuilder, LinkBuilder, ReferenceBuilder,
+                       RegionBuilder)
 from .classgenerator import CustomClassGenerator, MCIClassGenerator
 from .errors import (BuildError, OrphanContainerBuildError, ReferenceTargetNotBuiltError, ContainerConfigurationError,
                      ConstructError)
@@ -8,7 +8,7 @@ from datetime import datetime, date
 import numpy as np
 from h5py import RegionReference
 
-from ..utils import docval, getargs, get_docval
+from ..utils import docval, getargs, get_docval, popargs
 
 
 class Builder(dict, metaclass=ABCMeta):
@@ -312,6 +312,98 @@ class GroupBuilder(BaseBuilder):
                                 self.links.values())
 
 
+class LazyGroupBuilder(GroupBuilder):
+    """A GroupBuilder whose attributes, subgroups, datasets, and links are loaded when they are first accessed.
+
+    The loader is called once with this builder as the only argument and should add the attributes, subgroups,
+    datasets, and links of the group using set_attribute, set_group, set_dataset, and set_link.
+    """
+
+    @docval({'name': 'name', 'type': str, 'doc': 'The name of the group.'},
+            {'name': 'loader', 'type': None,
+             'doc': 'A callable that adds the contents of the group to this builder when they are first accessed.'},
+            {'name': 'parent', 'type': GroupBuilder, 'doc': 'The parent builder of this builder.', 'default': None},
+            {'name': 'source', 'type': str,
+             'doc': 'The source of the data represented in this builder.', 'default': None})
+    def __init__(self, **kwargs):
+        loader = popargs('loader', kwargs)
+        self.__loader = None
+        super().__init__(**kwargs)
+        self.__loader = loader
+
+    @property
+    def loaded(self):
+        """Whether the contents of this group have been loaded."""
+        return self.__loader is None
+
+    def load(self):
+        """Load the contents of this group if they have not been loaded yet."""
+        loader = self.__loader
+        if loader is not None:
+            self.__loader = None
+            loader(self)
+
+    @property
+    def source(self):
+        """The source of this Builder"""
+        return super().source
+
+    @source.setter
+    def source(self, s):
+        if self.loaded:
+            GroupBuilder.source.fset(self, s)
+        else:
+            # the subgroups, datasets, and links get the source from this builder when they are loaded
+            Builder.source.fset(self, s)
+
+    @property
+    def obj_type(self):
+        self.load()
+        return self.__obj_type
+
+    @obj_type.setter
+    def obj_type(self, val):
+        self.__obj_type = val
+
+    @property
+    def attributes(self):
+        """The attributes stored in this Builder object."""
+        self.load()
+        return super().attributes
+
+    @property
+    def groups(self):
+        """The subgroups contained in this group."""
+        self.load()
+        return super().groups
+
+    @property
+    def datasets(self):
+        """The datasets contained in this group."""
+        self.load()
+        return super().datasets
+
+    @property
+    def links(self):
+        """The links contained in this group."""
+        self.load()
+        return super().links
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        if not isinstance(other, dict):
+            return NotImplemented
+        self.load()
+        if isinstance(other, LazyGroupBuilder):
+            other.load()
+        return super().__eq__(other)
+
+    def __repr__(self):
+        self.load()
+        return super().__repr__()
+
+
 class DatasetBuilder(BaseBuilder):
     OBJECT_REF_TYPE = 'object'
     REGION_REF_TYPE = 'region'
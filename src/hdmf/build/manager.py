@@ -7,7 +7,7 @@ from .classgenerator import ClassGenerator, CustomClassGenerator, MCIClassGenera
 from ..container import AbstractContainer, Container, Data
 from ..spec import DatasetSpec, GroupSpec, NamespaceCatalog
 from ..spec.spec import BaseStorageSpec
-from ..utils import docval, getargs, ExtenderMeta, get_docval
+from ..utils import docval, getargs, ExtenderMeta, get_docval, trusted_calls
 
 
 class Proxy:
@@ -89,6 +89,8 @@ class BuildManager:
         self.__builders = dict()
         self.__containers = dict()
         self.__active_builders = set()
+        self.__built_builders = set()  # the builders built or rebuilt since the start of the last root build
+        self.__roots = dict()  # the cached containers that had no parent container when they were cached
         self.__type_map = type_map
         self.__ref_queue = deque()  # a queue of the ReferenceBuilders that need to be added
 
@@ -152,6 +154,7 @@ class BuildManager:
         result = self.get_builder(container)
         if root:
             self.__active_builders.clear()  # reset active builders at start of build process
+            self.__built_builders.clear()
         if result is None:
             self.logger.debug("Building new %s '%s' (container_source: %s, source: %s, extended spec: %s, export: %s)"
                               % (container.__class__.__name__, container.name, repr(container.container_source),
@@ -168,17 +171,21 @@ class BuildManager:
                                          % (container.name, container.__class__.__module__,
                                             container.__class__.__name__))
             # NOTE: if exporting, then existing cached builder will be ignored and overridden with new build result
-            result = self.__type_map.build(container, self, source=source, spec_ext=spec_ext, export=export)
+            with trusted_calls():
+                result = self.__type_map.build(container, self, source=source, spec_ext=spec_ext, export=export)
             self.prebuilt(container, result)
             self.__active_prebuilt(result)
+            self.__built_builders.add(self.__bldrhash__(result))
             self.logger.debug("Done building %s '%s'" % (container.__class__.__name__, container.name))
         elif not self.__is_active_builder(result) and container.modified:
             # if builder was built on file read and is then modified (append mode), it needs to be rebuilt
             self.logger.debug("Rebuilding modified %s '%s' (source: %s, extended spec: %s)"
                               % (container.__class__.__name__, container.name,
                                  repr(source), spec_ext is not None))
-            result = self.__type_map.build(container, self, builder=result, source=source, spec_ext=spec_ext,
-                                           export=export)
+            with trusted_calls():
+                result = self.__type_map.build(container, self, builder=result, source=source, spec_ext=spec_ext,
+                                               export=export)
+            self.__built_builders.add(self.__bldrhash__(result))
             self.logger.debug("Done rebuilding %s '%s'" % (container.__class__.__name__, container.name))
         else:
             self.logger.debug("Using prebuilt %s '%s' for %s '%s'"
@@ -199,6 +206,20 @@ class BuildManager:
         self.__builders[container_id] = builder
         builder_id = self.__bldrhash__(builder)
         self.__containers[builder_id] = container
+        if not isinstance(container.parent, AbstractContainer):
+            self.__roots[container_id] = container
+
+    @docval({'name': 'builder', 'type': (DatasetBuilder, GroupBuilder), 'doc': 'the Builder to check'},
+            returns='whether the Builder was built or rebuilt since the start of the last build with root=True',
+            rtype=bool)
+    def was_built(self, **kwargs):
+        """Return whether the given Builder was built or rebuilt since the start of the last build with root=True.
+
+        Builders of containers that were not modified since they were read are reused without being rebuilt, so
+        when writing to the file they were read from, the subtrees of these builders do not need to be written.
+        """
+        builder = getargs('builder', kwargs)
+        return self.__bldrhash__(builder) in self.__built_builders
 
     def __active_prebuilt(self, builder):
         """Save the Builder for future use during the active/current build process."""
@@ -239,22 +260,60 @@ class BuildManager:
         # dependency
         self.__ref_queue.append(func)
 
+    def __init_lazy_containers(self):
+        """Initialize the cached containers that were constructed with lazy=True and are not initialized yet.
+
+        This needs to be done before removing containers from the cache, so that the children of these containers are
+        constructed from the cached containers instead of being constructed again with a new parent.
+        """
+        lazy = [c for c in self.__containers.values() if type(c) is not c.__class__]
+        while lazy:
+            for container in lazy:
+                container.fields  # accessing any attribute other than name, parent, etc. initializes the container
+            lazy = [c for c in self.__containers.values() if type(c) is not c.__class__]
+
+    def __get_modified_containers(self):
+        """Get the modified cached containers.
+
+        Only the modified children recorded by the containers are followed from the roots of the cached containers,
+        so this does not iterate over the unmodified containers.
+        """
+        roots = dict()
+        for container in self.__roots.values():
+            while isinstance(container.parent, AbstractContainer):
+                container = container.parent
+            roots[self.__conthash__(container)] = container
+        self.__roots = roots
+        ret = list()
+        stack = list(roots.values())
+        while len(stack) > 0:
+            container = stack.pop()
+            if container.modified and self.__conthash__(container) in self.__builders:
+                ret.append(container)
+            stack.extend(container._get_modified_children())
+        return ret
+
     def purge_outdated(self):
-        containers_copy = self.__containers.copy()
-        for container in containers_copy.values():
-            if container.modified:
-                container_id = self.__conthash__(container)
-                builder = self.__builders.get(container_id)
-                builder_id = self.__bldrhash__(builder)
-                self.logger.debug("Purging %s '%s' for %s '%s' from prebuilt cache"
-                                  % (builder.__class__.__name__, builder.name,
-                                     container.__class__.__name__, container.name))
-                self.__builders.pop(container_id)
-                self.__containers.pop(builder_id)
+        modified = self.__get_modified_containers()
+        for container in modified:
+            # initialize the containers that were constructed with lazy=True, so that their children are constructed
+            # from the cached containers before the containers are removed from the cache
+            container.fields
+        for container in modified:
+            container_id = self.__conthash__(container)
+            builder = self.__builders.get(container_id)
+            builder_id = self.__bldrhash__(builder)
+            self.logger.debug("Purging %s '%s' for %s '%s' from prebuilt cache"
+                              % (builder.__class__.__name__, builder.name,
+                                 container.__class__.__name__, container.name))
+            self.__builders.pop(container_id)
+            self.__containers.pop(builder_id)
 
     def clear_cache(self):
+        self.__init_lazy_containers()
         self.__builders.clear()
         self.__containers.clear()
+        self.__roots.clear()
 
     @docval({"name": "container", "type": AbstractContainer, "doc": "the container to get the builder for"})
     def get_builder(self, **kwargs):
@@ -265,15 +324,32 @@ class BuildManager:
         return result
 
     @docval({'name': 'builder', 'type': (DatasetBuilder, GroupBuilder),
-             'doc': 'the builder to construct the AbstractContainer from'})
+             'doc': 'the builder to construct the AbstractContainer from'},
+            {'name': 'lazy', 'type': bool,
+             'doc': ('whether to defer the construction of the AbstractContainer until its attributes are first '
+                     'accessed. The child AbstractContainers are then also constructed lazily'),
+             'default': False})
     def construct(self, **kwargs):
         """ Construct the AbstractContainer represented by the given builder """
-        builder = getargs('builder', kwargs)
+        builder, lazy = getargs('builder', 'lazy', kwargs)
         if isinstance(builder, LinkBuilder):
             builder = builder.target
         builder_id = self.__bldrhash__(builder)
         result = self.__containers.get(builder_id)
-        if result is None:
+        if result is None and lazy:
+            # give the container its actual parent instead of a Proxy. Parents with a custom ObjectMapper.construct
+            # are constructed eagerly and may construct this container
+            parent = None
+            parent_builder = self.__get_parent_dt_builder(builder)
+            if parent_builder is not None:
+                parent = self.__containers.get(self.__bldrhash__(parent_builder))
+                if parent is None:
+                    parent = self.construct(parent_builder, lazy=True)
+                    result = self.__containers.get(builder_id)
+            if result is None:
+                result = self.__type_map.construct(builder, self, parent, lazy=True)
+                self.prebuilt(result, builder)
+        elif result is None:
             parent_builder = self.__get_parent_dt_builder(builder)
             if parent_builder is not None:
                 parent = self._get_proxy_builder(parent_builder)
@@ -394,6 +470,8 @@ class TypeMap:
     ''' A class to maintain the map between ObjectMappers and AbstractContainer classes
     '''
 
+    __LOOKUP_CACHES = ('get_map', 'get_dt_container_cls', 'get_subspec')
+
     @docval({'name': 'namespaces', 'type': NamespaceCatalog, 'doc': 'the NamespaceCatalog to use', 'default': None},
             {'name': 'mapper_cls', 'type': type, 'doc': 'the ObjectMapper class to use', 'default': None})
     def __init__(self, **kwargs):
@@ -409,9 +487,16 @@ class TypeMap:
         self.__container_types = OrderedDict()
         self.__data_types = dict()
         self.__default_mapper_cls = mapper_cls
+        # memoized results of get_map, get_dt_container_cls, and get_subspec. These are cleared whenever a container
+        # type, ObjectMapper class, class generator, or namespace is registered.
+        self.__lookup_caches = {name: dict() for name in self.__LOOKUP_CACHES}
+        self.__lookup_hits = dict.fromkeys(self.__LOOKUP_CACHES, 0)
+        self.__lookup_misses = dict.fromkeys(self.__LOOKUP_CACHES, 0)
         self.__class_generator = ClassGenerator()
         self.register_generator(CustomClassGenerator)
         self.register_generator(MCIClassGenerator)
+        # whether the container type and ObjectMapper class tables are shared with copies of this TypeMap
+        self.__tables_shared = False
 
     @property
     def namespace_catalog(self):
@@ -419,13 +504,47 @@ class TypeMap:
 
     @property
     def container_types(self):
+        # the caller may modify the returned dict, so it must not be shared with other TypeMaps
+        self.__unshare_tables()
         return self.__container_types
 
     def __copy__(self):
+        # the copy shares the container type and ObjectMapper class tables with this TypeMap. Whichever of the two
+        # registers a container type or ObjectMapper class first copies the tables before changing them
         ret = TypeMap(copy(self.__ns_catalog), self.__default_mapper_cls)
-        ret.merge(self)
+        ret.__container_types = self.__container_types
+        ret.__data_types = self.__data_types
+        ret.__mapper_cls = self.__mapper_cls
+        ret.__tables_shared = self.__tables_shared = True
+        for custom_generators in reversed(self.__class_generator.custom_generators):
+            # iterate in reverse order because generators are stored internally as a stack
+            ret.register_generator(custom_generators)
         return ret
 
+    def get_lookup_cache_info(self):
+        """Get the number of hits and misses and the current size of the caches of get_map, get_dt_container_cls,
+        and get_subspec
+
+        :returns: a dict mapping the name of each method to a dict with keys 'hits', 'misses', and 'size'
+        """
+        return {name: {'hits': self.__lookup_hits[name],
+                       'misses': self.__lookup_misses[name],
+                       'size': len(self.__lookup_caches[name])}
+                for name in self.__LOOKUP_CACHES}
+
+    def clear_lookup_caches(self):
+        """Clear the caches of get_map, get_dt_container_cls, and get_subspec"""
+        for cache in self.__lookup_caches.values():
+            cache.clear()
+
+    def __unshare_tables(self):
+        """Copy the container type and ObjectMapper class tables if they are shared with another TypeMap"""
+        if self.__tables_shared:
+            self.__container_types = OrderedDict((ns, dict(types)) for ns, types in self.__container_types.items())
+            self.__data_types = dict(self.__data_types)
+            self.__mapper_cls = dict(self.__mapper_cls)
+            self.__tables_shared = False
+
     def __deepcopy__(self, memo):
         # XXX: From @nicain: All of a sudden legacy tests started
         #      needing this argument in deepcopy. Doesn't hurt anything, though.
@@ -460,6 +579,7 @@ class TypeMap:
     def register_generator(self, **kwargs):
         """Add a custom class generator."""
         generator = getargs('generator', kwargs)
+        self.clear_lookup_caches()
         self.__class_generator.register_generator(generator)
 
     @docval(*get_docval(NamespaceCatalog.load_namespaces),
@@ -470,6 +590,7 @@ class TypeMap:
         it will process the return value to keep track of what types were included in the loaded namespaces. Calling
         load_namespaces here has the advantage of being able to keep track of type dependencies across namespaces.
         '''
+        self.clear_lookup_caches()
         deps = self.__ns_catalog.load_namespaces(**kwargs)
         for new_ns, ns_deps in deps.items():
             for src_ns, types in ns_deps.items():
@@ -506,6 +627,16 @@ class TypeMap:
         all namespaces.
         """
         namespace, data_type, autogen = getargs('namespace', 'data_type', 'autogen', kwargs)
+        return self.__get_dt_container_cls(data_type, namespace, autogen)
+
+    def __get_dt_container_cls(self, data_type, namespace, autogen):
+        cache = self.__lookup_caches['get_dt_container_cls']
+        cls = cache.get((data_type, namespace))
+        if cls is not None:
+            self.__lookup_hits['get_dt_container_cls'] += 1
+            return cls
+        self.__lookup_misses['get_dt_container_cls'] += 1
+        key = (data_type, namespace)
 
         # namespace is unknown, so look it up
         if namespace is None:
@@ -526,6 +657,8 @@ class TypeMap:
             attr_names = self.__default_mapper_cls.get_attr_names(spec)
             cls = self.__class_generator.generate_class(data_type, spec, parent_cls, attr_names, self)
             self.register_container_type(namespace, data_type, cls)
+        if cls is not None:
+            cache[key] = cls
         return cls
 
     def __check_dependent_types(self, spec, namespace):
@@ -624,18 +757,30 @@ class TypeMap:
         ret = builder.attributes.get('namespace')
         return ret
 
+    def __get_builder_dt_ns(self, builder):
+        """Get the data_type and namespace of a builder. See get_builder_dt and get_builder_ns"""
+        if isinstance(builder, LinkBuilder):
+            builder = builder.builder
+        attributes = builder.attributes
+        if isinstance(builder, GroupBuilder):
+            data_type = attributes.get(self.__ns_catalog.group_spec_cls.type_key())
+        else:
+            data_type = attributes.get(self.__ns_catalog.dataset_spec_cls.type_key())
+        if isinstance(data_type, bytes):
+            data_type = data_type.decode('UTF-8')
+        return data_type, attributes.get('namespace')
+
     @docval({'name': 'builder', 'type': Builder,
              'doc': 'the Builder object to get the corresponding AbstractContainer class for'})
     def get_cls(self, **kwargs):
         ''' Get the class object for the given Builder '''
         builder = getargs('builder', kwargs)
-        data_type = self.get_builder_dt(builder)
+        data_type, namespace = self.__get_builder_dt_ns(builder)
         if data_type is None:
             raise ValueError("No data_type found for builder %s" % builder.path)
-        namespace = self.get_builder_ns(builder)
         if namespace is None:
             raise ValueError("No namespace found for builder %s" % builder.path)
-        return self.get_dt_container_cls(data_type, namespace)
+        return self.__get_dt_container_cls(data_type, namespace, True)
 
     @docval({'name': 'spec', 'type': (DatasetSpec, GroupSpec), 'doc': 'the parent spec to search'},
             {'name': 'builder', 'type': (DatasetBuilder, GroupBuilder, LinkBuilder),
@@ -648,18 +793,24 @@ class TypeMap:
             # TODO consider checking against spec.get_link
         else:
             builder_type = type(builder)
-        if issubclass(builder_type, DatasetBuilder):
+        is_dataset = issubclass(builder_type, DatasetBuilder)
+        dt, ns = self.__get_builder_dt_ns(builder)
+        # specs are not hashable, so the cache is keyed by id. The spec is stored with the result so that the id
+        # cannot be reused by another spec while the entry is in the cache
+        cache = self.__lookup_caches['get_subspec']
+        key = (id(spec), is_dataset, builder.name, dt, ns)
+        cached = cache.get(key)
+        if cached is not None and cached[0] is spec:
+            self.__lookup_hits['get_subspec'] += 1
+            return cached[1]
+        self.__lookup_misses['get_subspec'] += 1
+        if is_dataset:
             subspec = spec.get_dataset(builder.name)
         else:
             subspec = spec.get_group(builder.name)
         if subspec is None:
             # builder was generated from something with a data_type and a wildcard name
-            if isinstance(builder, LinkBuilder):
-                dt = self.get_builder_dt(builder.builder)
-            else:
-                dt = self.get_builder_dt(builder)
             if dt is not None:
-                ns = self.get_builder_ns(builder)
                 hierarchy = self.__ns_catalog.get_hierarchy(ns, dt)
                 for t in hierarchy:
                     subspec = spec.get_data_type(t)
@@ -668,6 +819,7 @@ class TypeMap:
                     subspec = spec.get_target_type(t)
                     if subspec is not None:
                         break
+        cache[key] = (spec, subspec)
         return subspec
 
     def get_container_ns_dt(self, obj):
@@ -697,6 +849,18 @@ class TypeMap:
     def get_map(self, **kwargs):
         """ Return the ObjectMapper object that should be used for the given container """
         obj = getargs('obj', kwargs)
+        # containers are looked up by class and builders by namespace and data_type
+        cache = self.__lookup_caches['get_map']
+        if isinstance(obj, AbstractContainer):
+            key = obj.__class__
+        else:
+            data_type, namespace = self.__get_builder_dt_ns(obj)
+            key = (namespace, data_type)
+        mapper = cache.get(key)
+        if mapper is not None:
+            self.__lookup_hits['get_map'] += 1
+            return mapper
+        self.__lookup_misses['get_map'] += 1
         # get the container class, and namespace/data_type
         if isinstance(obj, AbstractContainer):
             container_cls = obj.__class__
@@ -704,8 +868,6 @@ class TypeMap:
             if namespace is None:
                 raise ValueError("class %s is not mapped to a data_type" % container_cls)
         else:
-            data_type = self.get_builder_dt(obj)
-            namespace = self.get_builder_ns(obj)
             container_cls = self.get_cls(obj)
         # now build the ObjectMapper class
         mapper = self.__mappers.get(container_cls)
@@ -719,6 +881,7 @@ class TypeMap:
             spec = self.__ns_catalog.get_spec(namespace, data_type)
             mapper = mapper_cls(spec)
             self.__mappers[container_cls] = mapper
+        cache[key] = mapper
         return mapper
 
     @docval({"name": "namespace", "type": str, "doc": "the namespace containing the data_type to map the class to"},
@@ -728,6 +891,8 @@ class TypeMap:
         ''' Map a container class to a data_type '''
         namespace, data_type, container_cls = getargs('namespace', 'data_type', 'container_cls', kwargs)
         spec = self.__ns_catalog.get_spec(namespace, data_type)  # make sure the spec exists
+        self.__unshare_tables()
+        self.clear_lookup_caches()
         self.__container_types.setdefault(namespace, dict())
         self.__container_types[namespace][data_type] = container_cls
         self.__data_types.setdefault(container_cls, (namespace, data_type))
@@ -743,6 +908,8 @@ class TypeMap:
         container_cls, mapper_cls = getargs('container_cls', 'mapper_cls', kwargs)
         if self.get_container_cls_dt(container_cls) == (None, None):
             raise ValueError('cannot register map for type %s - no data_type found' % container_cls)
+        self.__unshare_tables()
+        self.clear_lookup_caches()
         self.__mapper_cls[container_cls] = mapper_cls
 
     @docval({"name": "container", "type": AbstractContainer, "doc": "the container to convert to a Builder"},
@@ -781,16 +948,22 @@ class TypeMap:
             {'name': 'build_manager', 'type': BuildManager,
              'doc': 'the BuildManager for constructing', 'default': None},
             {'name': 'parent', 'type': (Proxy, Container),
-             'doc': 'the parent Container/Proxy for the Container being built', 'default': None})
+             'doc': 'the parent Container/Proxy for the Container being built', 'default': None},
+            {'name': 'lazy', 'type': bool,
+             'doc': 'whether to defer the construction of the Container until its attributes are first accessed',
+             'default': False})
     def construct(self, **kwargs):
         """ Construct the AbstractContainer represented by the given builder """
-        builder, build_manager, parent = getargs('builder', 'build_manager', 'parent', kwargs)
+        builder, build_manager, parent, lazy = getargs('builder', 'build_manager', 'parent', 'lazy', kwargs)
         if build_manager is None:
             build_manager = BuildManager(self)
         obj_mapper = self.get_map(builder)
         if obj_mapper is None:
             dt = builder.attributes[self.namespace_catalog.group_spec_cls.type_key()]
             raise ValueError('No ObjectMapper found for builder of type %s' % dt)
+        elif lazy and any(arg['name'] == 'lazy' for arg in get_docval(obj_mapper.construct)):
+            # ObjectMappers that override construct without the lazy argument construct the container eagerly
+            return obj_mapper.construct(builder, build_manager, parent, lazy=True)
         else:
             return obj_mapper.construct(builder, build_manager, parent)
 
@@ -3,6 +3,7 @@ import re
 import warnings
 from collections import OrderedDict
 from copy import copy
+from functools import partial
 
 import numpy as np
 
@@ -17,7 +18,7 @@ from ..data_utils import DataIO, AbstractDataChunkIterator
 from ..query import ReferenceResolver
 from ..spec import Spec, AttributeSpec, DatasetSpec, GroupSpec, LinkSpec, RefSpec
 from ..spec.spec import BaseStorageSpec
-from ..utils import docval, getargs, ExtenderMeta, get_docval
+from ..utils import docval, getargs, ExtenderMeta, get_docval, trusted_calls
 
 _const_arg = '__constructor_arg'
 
@@ -713,9 +714,10 @@ class ObjectMapper(metaclass=ExtenderMeta):
                               % (container.__class__.__name__, container.name, repr(source)))
             if builder is None:
                 builder = GroupBuilder(name, parent=parent, source=source)
-            self.__add_datasets(builder, self.__spec.datasets, container, manager, source, export)
-            self.__add_groups(builder, self.__spec.groups, container, manager, source, export)
-            self.__add_links(builder, self.__spec.links, container, manager, source, export)
+            with trusted_calls():
+                self.__add_datasets(builder, self.__spec.datasets, container, manager, source, export)
+                self.__add_groups(builder, self.__spec.groups, container, manager, source, export)
+                self.__add_links(builder, self.__spec.links, container, manager, source, export)
         else:
             if builder is None:
                 if not isinstance(container, Data):
@@ -1111,7 +1113,7 @@ class ObjectMapper(metaclass=ExtenderMeta):
                    % value.__class__.__name__)
             raise ValueError(msg)
 
-    def __get_subspec_values(self, builder, spec, manager):
+    def __get_subspec_values(self, builder, spec, manager, lazy=False):
         ret = dict()
         # First get attributes
         attributes = builder.attributes
@@ -1120,11 +1122,11 @@ class ObjectMapper(metaclass=ExtenderMeta):
             if attr_val is None:
                 continue
             if isinstance(attr_val, (GroupBuilder, DatasetBuilder)):
-                ret[attr_spec] = manager.construct(attr_val)
+                ret[attr_spec] = manager.construct(attr_val, lazy=lazy)
             elif isinstance(attr_val, RegionBuilder):  # pragma: no cover
                 raise ValueError("RegionReferences as attributes is not yet supported")
             elif isinstance(attr_val, ReferenceBuilder):
-                ret[attr_spec] = manager.construct(attr_val.builder)
+                ret[attr_spec] = manager.construct(attr_val.builder, lazy=lazy)
             else:
                 ret[attr_spec] = attr_val
         if isinstance(spec, GroupSpec):
@@ -1148,14 +1150,14 @@ class ObjectMapper(metaclass=ExtenderMeta):
             # now assign links to their respective specification
             for subspec in spec.links:
                 if subspec.name is not None and subspec.name in links:
-                    ret[subspec] = manager.construct(links[subspec.name].builder)
+                    ret[subspec] = manager.construct(links[subspec.name].builder, lazy=lazy)
                 else:
                     sub_builder = link_dt.get(subspec.target_type)
                     if sub_builder is not None:
-                        ret[subspec] = self.__flatten(sub_builder, subspec, manager)
+                        ret[subspec] = self.__flatten(sub_builder, subspec, manager, lazy)
             # now process groups and datasets
-            self.__get_sub_builders(groups, spec.groups, manager, ret)
-            self.__get_sub_builders(datasets, spec.datasets, manager, ret)
+            self.__get_sub_builders(groups, spec.groups, manager, ret, lazy)
+            self.__get_sub_builders(datasets, spec.datasets, manager, ret, lazy)
         elif isinstance(spec, DatasetSpec):
             if not isinstance(builder, DatasetBuilder):  # pragma: no cover
                 raise ValueError("__get_subspec_values - must pass DatasetBuilder with DatasetSpec")
@@ -1175,7 +1177,7 @@ class ObjectMapper(metaclass=ExtenderMeta):
             return data.invert()
         return data
 
-    def __get_sub_builders(self, sub_builders, subspecs, manager, ret):
+    def __get_sub_builders(self, sub_builders, subspecs, manager, ret, lazy=False):
         # index builders by data_type
         builder_dt = dict()
         for g in sub_builders.values():
@@ -1197,7 +1199,7 @@ class ObjectMapper(metaclass=ExtenderMeta):
             if subspec.name is None:
                 sub_builder = builder_dt.get(dt)
                 if sub_builder is not None:
-                    sub_builder = self.__flatten(sub_builder, subspec, manager)
+                    sub_builder = self.__flatten(sub_builder, subspec, manager, lazy)
                     ret[subspec] = sub_builder
             else:
                 sub_builder = sub_builders.get(subspec.name)
@@ -1205,12 +1207,12 @@ class ObjectMapper(metaclass=ExtenderMeta):
                     continue
                 if dt is None:
                     # recurse
-                    ret.update(self.__get_subspec_values(sub_builder, subspec, manager))
+                    ret.update(self.__get_subspec_values(sub_builder, subspec, manager, lazy))
                 else:
-                    ret[subspec] = manager.construct(sub_builder)
+                    ret[subspec] = manager.construct(sub_builder, lazy=lazy)
 
-    def __flatten(self, sub_builder, subspec, manager):
-        tmp = [manager.construct(b) for b in sub_builder]
+    def __flatten(self, sub_builder, subspec, manager, lazy=False):
+        tmp = [manager.construct(b, lazy=lazy) for b in sub_builder]
         if len(tmp) == 1 and not subspec.is_many():
             tmp = tmp[0]
         return tmp
@@ -1219,13 +1221,36 @@ class ObjectMapper(metaclass=ExtenderMeta):
              'doc': 'the builder to construct the AbstractContainer from'},
             {'name': 'manager', 'type': BuildManager, 'doc': 'the BuildManager for this build'},
             {'name': 'parent', 'type': (Proxy, AbstractContainer),
-             'doc': 'the parent AbstractContainer/Proxy for the AbstractContainer being built', 'default': None})
+             'doc': 'the parent AbstractContainer/Proxy for the AbstractContainer being built', 'default': None},
+            {'name': 'lazy', 'type': bool,
+             'doc': ('whether to defer the construction of the AbstractContainer until its attributes are first '
+                     'accessed. The child AbstractContainers are then also constructed lazily'),
+             'default': False})
     def construct(self, **kwargs):
         ''' Construct an AbstractContainer from the given Builder '''
-        builder, manager, parent = getargs('builder', 'manager', 'parent', kwargs)
+        builder, manager, parent, lazy = getargs('builder', 'manager', 'parent', 'lazy', kwargs)
         cls = manager.get_cls(builder)
+        object_id = builder.attributes.get(self.__spec.id_key())
+        if lazy:
+            # setting the parent of the new container marks the parent and its ancestors as modified
+            modified = self.__get_modified(parent)
+            obj = cls._new_deferred(builder.name, partial(self.__init_deferred, builder, manager),
+                                    container_source=builder.source, parent=parent, object_id=object_id,
+                                    in_construct_mode=True)
+            self.__set_modified(modified)
+            return obj
+        kwargs = self.__get_constructor_kwargs(cls, builder, manager)
+        try:
+            obj = self.__new_container__(cls, builder.source, parent, object_id, **kwargs)
+        except Exception as ex:
+            msg = 'Could not construct %s object due to: %s' % (cls.__name__, ex)
+            raise ConstructError(builder, msg) from ex
+        return obj
+
+    def __get_constructor_kwargs(self, cls, builder, manager, lazy=False):
+        """Get the keyword arguments for constructing an instance of cls from the given Builder"""
         # gather all subspecs
-        subspecs = self.__get_subspec_values(builder, self.spec, manager)
+        subspecs = self.__get_subspec_values(builder, self.spec, manager, lazy)
         # get the constructor argument that each specification corresponds to
         const_args = dict()
         # For Data container classes, we need to populate the data constructor argument since
@@ -1254,13 +1279,39 @@ class ObjectMapper(metaclass=ExtenderMeta):
             else:
                 continue
             kwargs[argname] = val
+        return kwargs
+
+    def __init_deferred(self, builder, manager, obj):
+        """Initialize a container created by construct with lazy=True. The children of the container are constructed
+        lazily."""
+        cls = obj.__class__
+        # constructing the children and initializing the container marks the container and its ancestors as modified
+        modified = self.__get_modified(obj.parent)
         try:
-            obj = self.__new_container__(cls, builder.source, parent, builder.attributes.get(self.__spec.id_key()),
-                                         **kwargs)
+            obj.__init__(**self.__get_constructor_kwargs(cls, builder, manager, lazy=True))
         except Exception as ex:
+            self.__set_modified(modified)
             msg = 'Could not construct %s object due to: %s' % (cls.__name__, ex)
             raise ConstructError(builder, msg) from ex
-        return obj
+        obj._in_construct_mode = False
+        obj.set_modified(False)
+        self.__set_modified(modified)
+
+    @staticmethod
+    def __get_modified(container):
+        """Get the modified status of the given container and its ancestors"""
+        ret = list()
+        while isinstance(container, AbstractContainer):
+            ret.append((container, container.modified))
+            container = container.parent
+        return ret
+
+    @staticmethod
+    def __set_modified(modified):
+        """Reset the containers returned by __get_modified that were not modified to not modified"""
+        for container, value in modified:
+            if not value:
+                container.set_modified(False)
 
     def __new_container__(self, cls, container_source, parent, object_id, **kwargs):
         """A wrapper function for ensuring a container gets everything set appropriately"""
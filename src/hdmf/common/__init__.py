@@ -2,23 +2,63 @@
 for reading and writing data in according to the HDMF-common specification
 '''
 import os.path
+import threading
 from copy import deepcopy
 
 CORE_NAMESPACE = 'hdmf-common'
 EXP_NAMESPACE = 'hdmf-experimental'
 
 
-from ..spec import NamespaceCatalog  # noqa: E402
+from ..spec import NamespaceCatalog, GroupSpec  # noqa: E402
 from ..utils import docval, getargs, get_docval  # noqa: E402
 from ..backends.io import HDMFIO  # noqa: E402
 from ..backends.hdf5 import HDF5IO  # noqa: E402
 from ..validate import ValidatorMap  # noqa: E402
 from ..build import BuildManager, TypeMap  # noqa: E402
 from ..container import _set_exp  # noqa: E402
+from .. import Data, Container  # noqa: E402
 
 
-# a global type map
+# a global type map. The hdmf-common namespace is not loaded into the type map until it is first needed, e.g., by
+# get_type_map, get_manager, or get_class. Until then, registrations of classes and object mappers for the
+# hdmf-common namespaces are queued and replayed on the type map when it is loaded.
 global __TYPE_MAP
+__TYPE_MAP = None
+__deferred_registrations = list()
+__type_map_lock = threading.RLock()
+
+
+def __get_type_map():
+    """Return the global type map, loading the hdmf-common namespace into it on first use"""
+    global __TYPE_MAP
+    if __TYPE_MAP is not None:
+        return __TYPE_MAP
+    with __type_map_lock:
+        if __TYPE_MAP is None:
+            type_map = TypeMap(NamespaceCatalog())
+            type_map.load_namespaces(__resources['namespace_path'])
+            while __deferred_registrations:
+                __deferred_registrations.pop(0)(type_map)
+
+            # register custom class generators
+            from .io.table import DynamicTableGenerator
+            type_map.register_generator(DynamicTableGenerator)
+
+            type_map.register_container_type(CORE_NAMESPACE, 'Container', Container)
+            type_map.register_container_type(CORE_NAMESPACE, 'Data', Data)
+            __TYPE_MAP = type_map
+    return __TYPE_MAP
+
+
+def __register(namespace, func):
+    """Call func with the global type map. If the type map has not been loaded yet and the namespace is one of
+    the hdmf-common namespaces, queue the call until the type map is loaded and return False"""
+    with __type_map_lock:
+        if __TYPE_MAP is None and namespace in (CORE_NAMESPACE, EXP_NAMESPACE):
+            __deferred_registrations.append(func)
+            return False
+    func(__get_type_map())
+    return True
 
 
 # a function to register a container classes with the global map
@@ -33,15 +73,16 @@ def register_class(**kwargs):
     as the class for data_type in namespace.
     """
     data_type, namespace, container_cls = getargs('data_type', 'namespace', 'container_cls', kwargs)
-    if namespace == EXP_NAMESPACE:
-        def _dec(cls):
+
+    def _dec(cls):
+        if namespace == EXP_NAMESPACE:
             _set_exp(cls)
-            __TYPE_MAP.register_container_type(namespace, data_type, cls)
-            return cls
-    else:
-        def _dec(cls):
-            __TYPE_MAP.register_container_type(namespace, data_type, cls)
-            return cls
+        if not __register(namespace, lambda type_map: type_map.register_container_type(namespace, data_type, cls)):
+            # set the attributes that the type map sets on registered classes so that the class can be used
+            # before the type map is loaded
+            setattr(cls, GroupSpec.type_key(), data_type)
+            setattr(cls, 'namespace', namespace)
+        return cls
 
     if container_cls is None:
         return _dec
@@ -62,7 +103,9 @@ def register_map(**kwargs):
     container_cls, mapper_cls = getargs('container_cls', 'mapper_cls', kwargs)
 
     def _dec(cls):
-        __TYPE_MAP.register_map(container_cls, cls)
+        # only classes registered with register_class have their own namespace attribute
+        __register(vars(container_cls).get('namespace'),
+                   lambda type_map: type_map.register_map(container_cls, cls))
         return cls
     if mapper_cls is None:
         return _dec
@@ -100,11 +143,11 @@ def load_namespaces(**kwargs):
     Load namespaces from file
     '''
     namespace_path = getargs('namespace_path', kwargs)
-    return __TYPE_MAP.load_namespaces(namespace_path)
+    return __get_type_map().load_namespaces(namespace_path)
 
 
 def available_namespaces():
-    return __TYPE_MAP.namespace_catalog.namespaces
+    return __get_type_map().namespace_catalog.namespaces
 
 
 # a function to get the container class for a give type
@@ -116,7 +159,7 @@ def get_class(**kwargs):
     """Get the class object of the Container subclass corresponding to a given neurdata_type.
     """
     data_type, namespace = getargs('data_type', 'namespace', kwargs)
-    return __TYPE_MAP.get_dt_container_cls(data_type, namespace)
+    return __get_type_map().get_dt_container_cls(data_type, namespace)
 
 
 @docval({'name': 'extensions', 'type': (str, TypeMap, list),
@@ -132,12 +175,12 @@ def get_type_map(**kwargs):
     extensions = getargs('extensions', kwargs)
     type_map = None
     if extensions is None:
-        type_map = deepcopy(__TYPE_MAP)
+        type_map = deepcopy(__get_type_map())
     else:
         if isinstance(extensions, TypeMap):
             type_map = extensions
         else:
-            type_map = deepcopy(__TYPE_MAP)
+            type_map = deepcopy(__get_type_map())
         if isinstance(extensions, list):
             for ext in extensions:
                 if isinstance(ext, str):
@@ -195,41 +238,23 @@ def get_hdf5io(**kwargs):
     return HDF5IO(**kwargs)
 
 
-# load the hdmf-common namespace
+# check that the hdmf-common namespace is available. The namespace is loaded on first use of the global type map.
 __resources = __get_resources()
-if os.path.exists(__resources['namespace_path']):
-    __TYPE_MAP = TypeMap(NamespaceCatalog())
-
-    load_namespaces(__resources['namespace_path'])
-
-    # import these so the TypeMap gets populated
-    from . import io as __io  # noqa: E402
-
-    from . import table  # noqa: E402
-    from . import alignedtable  # noqa: E402
-    from . import sparse  # noqa: E402
-    from . import resources  # noqa: E402
-    from . import multi  # noqa: E402
-
-    # register custom class generators
-    from .io.table import DynamicTableGenerator
-    __TYPE_MAP.register_generator(DynamicTableGenerator)
-
-    from .. import Data, Container
-    __TYPE_MAP.register_container_type(CORE_NAMESPACE, 'Container', Container)
-    __TYPE_MAP.register_container_type(CORE_NAMESPACE, 'Data', Data)
-
-else:
+if not os.path.exists(__resources['namespace_path']):
     raise RuntimeError("Unable to load a TypeMap - no namespace file found")
 
-
-DynamicTable = get_class('DynamicTable', CORE_NAMESPACE)
-VectorData = get_class('VectorData', CORE_NAMESPACE)
-VectorIndex = get_class('VectorIndex', CORE_NAMESPACE)
-ElementIdentifiers = get_class('ElementIdentifiers', CORE_NAMESPACE)
-DynamicTableRegion = get_class('DynamicTableRegion', CORE_NAMESPACE)
-EnumData = get_class('EnumData', EXP_NAMESPACE)
-CSRMatrix = get_class('CSRMatrix', CORE_NAMESPACE)
-HERD = get_class('HERD', EXP_NAMESPACE)
-SimpleMultiContainer = get_class('SimpleMultiContainer', CORE_NAMESPACE)
-AlignedDynamicTable = get_class('AlignedDynamicTable', CORE_NAMESPACE)
+# import these so the TypeMap gets populated
+from . import io as __io  # noqa: E402
+
+from . import table  # noqa: E402
+from . import alignedtable  # noqa: E402
+from . import sparse  # noqa: E402
+from . import resources  # noqa: E402
+from . import multi  # noqa: E402
+
+from .table import (DynamicTable, VectorData, VectorIndex, ElementIdentifiers, DynamicTableRegion,  # noqa: E402
+                    EnumData)
+from .sparse import CSRMatrix  # noqa: E402
+from .resources import HERD  # noqa: E402
+from .multi import SimpleMultiContainer  # noqa: E402
+from .alignedtable import AlignedDynamicTable  # noqa: E402
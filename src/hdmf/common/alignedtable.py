@@ -4,7 +4,6 @@ Collection of Container classes for interacting with  aligned and hierarchical d
 from collections import OrderedDict
 
 import numpy as np
-import pandas as pd
 
 from . import register_class
 from .table import DynamicTable
@@ -240,6 +239,8 @@ class AlignedDynamicTable(DynamicTable):
              'doc': "Ignore id columns of sub-category tables", 'default': False})
     def to_dataframe(self, **kwargs):
         """Convert the collection of tables to a single pandas DataFrame"""
+        import pandas as pd
+
         dfs = [super().to_dataframe().reset_index(), ]
         if getargs('ignore_category_ids', kwargs):
             dfs += [category.to_dataframe() for category in self.category_tables.values()]
@@ -305,6 +306,8 @@ class AlignedDynamicTable(DynamicTable):
             * **single value** : when retrieving a single cell. The data type and shape will depend on the
               data type and shape of the cell/column.
         """
+        import pandas as pd
+
         if isinstance(item, (int, list, np.ndarray, slice)):
             # get a single full row from all tables
             dfs = ([super().get(item, **kwargs).reset_index(), ] +
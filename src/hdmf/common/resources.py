@@ -1,4 +1,3 @@
-import pandas as pd
 import numpy as np
 from . import register_class, EXP_NAMESPACE
 from . import get_type_map
@@ -212,6 +211,8 @@ class HERD(Container):
             all differences into a single error so that the assertion will indicate
             all found differences.
         """
+        import pandas as pd
+
         errors = []
         try:
             pd.testing.assert_frame_equal(left.keys.to_dataframe(),
@@ -715,6 +716,8 @@ class HERD(Container):
         """
         Get all entities/resources associated with an object.
         """
+        import pandas as pd
+
         file = kwargs['file']
         container = kwargs['container']
         attribute = kwargs['attribute']
@@ -752,7 +755,7 @@ class HERD(Container):
 
     @docval({'name': 'use_categories', 'type': bool, 'default': False,
              'doc': 'Use a multi-index on the columns to indicate which category each column belongs to.'},
-            rtype=pd.DataFrame, returns='A DataFrame with all data merged into a flat, denormalized table.')
+            rtype='pandas.DataFrame', returns='A DataFrame with all data merged into a flat, denormalized table.')
     def to_dataframe(self, **kwargs):
         """
         Convert the data from the keys, resources, entities, objects, and object_keys tables
@@ -763,6 +766,8 @@ class HERD(Container):
         Returns: :py:class:`~pandas.DataFrame` with all data merged into a single, flat, denormalized table.
 
         """
+        import pandas as pd
+
         use_categories = popargs('use_categories', kwargs)
         # Step 1: Combine the entities, keys, and entity_keys table
         ent_key_df = self.entity_keys.to_dataframe()
@@ -850,6 +855,8 @@ class HERD(Container):
         """
         Method to read in zipped tsv files to populate HERD.
         """
+        import pandas as pd
+
         zip_file = kwargs['path']
         directory = os.path.dirname(zip_file)
 
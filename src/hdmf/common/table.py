@@ -9,13 +9,12 @@ from typing import NamedTuple, Union
 from warnings import warn
 
 import numpy as np
-import pandas as pd
 import itertools
 
 from . import register_class, EXP_NAMESPACE
 from ..container import Container, Data
 from ..data_utils import DataIO, AbstractDataChunkIterator
-from ..utils import docval, getargs, ExtenderMeta, popargs, pystr, AllowPositional
+from ..utils import docval, getargs, ExtenderMeta, popargs, pystr, AllowPositional, trusted_calls
 from ..term_set import TermSetWrapper
 
 
@@ -687,14 +686,16 @@ class DynamicTable(Container):
                 raise ValueError("id %i already in the table" % row_id)
         self.id.append(row_id)
 
-        for colname, colnum in self.__colids.items():
-            if colname not in data:
-                raise ValueError("column '%s' missing" % colname)
-            c = self.__df_cols[colnum]
-            if isinstance(c, VectorIndex):
-                c.add_vector(data[colname])
-            else:
-                c.add_row(data[colname])
+        # the row data was validated above, so the columns do not need to check it again
+        with trusted_calls():
+            for colname, colnum in self.__colids.items():
+                if colname not in data:
+                    raise ValueError("column '%s' missing" % colname)
+                c = self.__df_cols[colnum]
+                if isinstance(c, VectorIndex):
+                    c.add_vector(data[colname])
+                else:
+                    c.add_row(data[colname])
 
     def __eq__(self, other):
         """Compare if the two DynamicTables contain the same data.
@@ -1061,6 +1062,8 @@ class DynamicTable(Container):
         :param coldata: dict mapping column names to values (list/arrays or dataframes)
         :type coldata: dict
         """
+        import pandas as pd
+
         id_index_orig = coldata.pop('id')
         id_index = [id_index_orig]
         df_input = OrderedDict()
@@ -1084,6 +1087,8 @@ class DynamicTable(Container):
         :param coldata: dict mapping column names to values (list/arrays or dataframes)
         :type coldata: dict
         """
+        import pandas as pd
+
         id_index = coldata.pop('id')
         df_input = OrderedDict()
         for k in coldata:  # for each column
@@ -1194,7 +1199,7 @@ class DynamicTable(Container):
 
     @classmethod
     @docval(
-        {'name': 'df', 'type': pd.DataFrame, 'doc': 'source DataFrame'},
+        {'name': 'df', 'type': 'pandas.DataFrame', 'doc': 'source DataFrame'},
         {'name': 'name', 'type': str, 'doc': 'the name of this table'},
         {
             'name': 'index_column',
@@ -7,7 +7,6 @@ from warnings import warn
 
 import h5py
 import numpy as np
-import pandas as pd
 
 from .data_utils import DataIO, append_data, extend_data
 from .utils import docval, get_docval, getargs, ExtenderMeta, get_data_shape, popargs, LabelledDict
@@ -28,6 +27,57 @@ def _exp_warn_msg(cls):
     return msg
 
 
+# attributes of a container with deferred initialization that can be accessed without initializing it. These are
+# set when the container is created (see AbstractContainer.__new__ and AbstractContainer._new_deferred).
+_DEFERRED_INIT_ATTRS = frozenset({'name', 'parent', 'object_id', 'container_source', 'modified',
+                                  'set_modified', '_in_construct_mode', '_AbstractContainer__name',
+                                  '_AbstractContainer__parent', '_AbstractContainer__children',
+                                  '_AbstractContainer__object_id', '_AbstractContainer__container_source',
+                                  '_AbstractContainer__modified', '_AbstractContainer__modified_children',
+                                  '_AbstractContainer__set_ancestors_modified',
+                                  '_AbstractContainer__add_to_parent_modified', '_get_modified_children'})
+
+__deferred_init_classes = dict()
+
+
+def _get_deferred_init_class(cls):
+    """Get the subclass of the given AbstractContainer class used for instances with deferred initialization.
+
+    On first access of an attribute that is not in _DEFERRED_INIT_ATTRS, the class of the instance is set back to
+    the given class and the instance is initialized. If the initialization fails, the instance is restored to its
+    state before the initialization, so that the next access tries to initialize it again and raises the same error.
+    """
+    ret = __deferred_init_classes.get(cls)
+    if ret is None:
+        def __getattribute__(self, name):
+            if name == '__class__':
+                return cls
+            if name not in _DEFERRED_INIT_ATTRS:
+                deferred_cls = type(self)
+                state = object.__getattribute__(self, '__dict__')
+                saved_state = dict(state)
+                init = saved_state.pop('_deferred_init')
+                del self._deferred_init
+                self.__class__ = cls
+                try:
+                    init(self)
+                except BaseException:
+                    state.clear()
+                    state.update(saved_state)
+                    self._deferred_init = init
+                    self.__class__ = deferred_cls
+                    raise
+            return cls.__getattribute__(self, name)
+
+        classdict = {'__getattribute__': __getattribute__, '__slots__': (), '__module__': cls.__module__,
+                     '__qualname__': cls.__qualname__}
+        # create the class without calling the metaclass __init__ to avoid running the ExtenderMeta hooks again
+        meta = type(cls)
+        ret = meta.__new__(meta, cls.__name__, (cls, ), classdict)
+        __deferred_init_classes[cls] = ret
+    return ret
+
+
 class HERDManager:
     """
     This class manages whether to set/attach an instance of HERD to the subclass.
@@ -214,6 +264,7 @@ class AbstractContainer(metaclass=ExtenderMeta):
         inst.__parent = None
         inst.__children = list()
         inst.__modified = True
+        inst.__modified_children = dict()  # the children that were marked as modified, keyed by id
         inst.__object_id = kwargs.pop('object_id', str(uuid4()))
         # this variable is being passed in from ObjectMapper.__new_container__ and is
         # reset to False in that method after the object has been initialized by __init__
@@ -221,6 +272,23 @@ class AbstractContainer(metaclass=ExtenderMeta):
         inst.parent = kwargs.pop('parent', None)
         return inst
 
+    @classmethod
+    def _new_deferred(cls, name, init, **kwargs):
+        """Create an instance of this class whose initialization is deferred.
+
+        The instance is initialized by calling *init* with the instance as the only argument when an attribute other
+        than its name, parent, object ID, container source, or modified status is first accessed. Until
+        then, ``isinstance`` checks against the class of the instance succeed without initializing it.
+
+        :param name: the name of the instance
+        :param init: a callable that initializes the instance, e.g., by calling ``__init__``
+        :param kwargs: the keyword arguments to pass to ``__new__``
+        """
+        inst = cls.__new__(_get_deferred_init_class(cls), **kwargs)
+        inst.__name = name
+        inst._deferred_init = init
+        return inst
+
     @docval({'name': 'name', 'type': str, 'doc': 'the name of this container'})
     def __init__(self, **kwargs):
         name = getargs('name', kwargs)
@@ -381,8 +449,36 @@ class AbstractContainer(metaclass=ExtenderMeta):
     def set_modified(self, **kwargs):
         modified = getargs('modified', kwargs)
         self.__modified = modified
-        if modified and isinstance(self.parent, Container):
-            self.parent.set_modified()
+        if modified:
+            self.__set_ancestors_modified()
+
+    def __set_ancestors_modified(self):
+        """Add this container to the modified children of its parent and mark its ancestors as modified.
+
+        The ancestors of a modified container are already modified, so this stops at the first ancestor that is
+        already modified.
+        """
+        child, parent = self, self.parent
+        while isinstance(parent, Container):
+            parent.__modified_children[id(child)] = child
+            if parent.__modified:
+                break
+            parent.__modified = True
+            child, parent = parent, parent.parent
+
+    def _get_modified_children(self):
+        """Get the children of this Container that are modified or that have modified descendants.
+
+        Children that were marked as modified are recorded when they are marked, so this does not iterate over all
+        children. Children that are no longer modified and have no modified descendants are forgotten.
+        """
+        ret = list()
+        for key, child in list(self.__modified_children.items()):
+            if child.__modified or child._get_modified_children():
+                ret.append(child)
+            else:
+                del self.__modified_children[key]
+        return ret
 
     @property
     def children(self):
@@ -445,18 +541,25 @@ class AbstractContainer(metaclass=ExtenderMeta):
                 if self.parent.matches(parent_container):
                     self.__parent = parent_container
                     parent_container.__children.append(self)
-                    parent_container.set_modified()
+                    self.__add_to_parent_modified()
                 else:
                     self.__parent.add_candidate(parent_container)
         else:
             self.__parent = parent_container
             if isinstance(parent_container, Container):
                 parent_container.__children.append(self)
-                parent_container.set_modified()
-            for child in self.children:
+                self.__add_to_parent_modified()
+            for child in self.__children:
                 # used by hdmf.common.table.DynamicTableRegion to check for orphaned tables
                 child._validate_on_set_parent()
 
+    def __add_to_parent_modified(self):
+        """Mark the parent of this container as modified after this container was added to it"""
+        if self.__modified:
+            self.__set_ancestors_modified()
+        else:
+            self.parent.set_modified()
+
     def _remove_child(self, child):
         """Remove a child Container. Intended for use in subclasses that allow dynamic addition of child Containers."""
         if not isinstance(child, AbstractContainer):
@@ -466,6 +569,7 @@ class AbstractContainer(metaclass=ExtenderMeta):
                                                                      self.__class__.__name__, self.name))
         child.__parent = None
         self.__children.remove(child)
+        self.__modified_children.pop(id(child), None)
         child.set_modified()
         self.set_modified()
 
@@ -1393,12 +1497,14 @@ class Table(Data):
         '''Produce a pandas DataFrame containing this table's data.
         '''
 
+        import pandas as pd
+
         data = {colname: self[colname] for ii, colname in enumerate(self.columns)}
         return pd.DataFrame(data)
 
     @classmethod
     @docval(
-        {'name': 'df', 'type': pd.DataFrame, 'doc': 'input data'},
+        {'name': 'df', 'type': 'pandas.DataFrame', 'doc': 'input data'},
         {'name': 'name', 'type': str, 'doc': 'the name of this container', 'default': None},
         {
             'name': 'extra_ok',
@@ -1,5 +1,5 @@
 from .catalog import SpecCatalog
-from .namespace import NamespaceCatalog, SpecNamespace, SpecReader
+from .namespace import NamespaceCatalog, SpecNamespace, SpecReader, set_spec_cache_dir, get_spec_cache_dir
 from .spec import (AttributeSpec, DatasetSpec, DtypeHelper, DtypeSpec, GroupSpec, LinkSpec,
                    NAME_WILDCARD, RefSpec, Spec)
 from .write import NamespaceBuilder, SpecWriter, export_spec
@@ -1,16 +1,65 @@
+import hashlib
+import json
 import os.path
 import ruamel.yaml as yaml
 import string
+import tempfile
 from abc import ABCMeta, abstractmethod
 from collections import OrderedDict
 from copy import copy
-from datetime import datetime
+from datetime import date, datetime
 from warnings import warn
 
 from .catalog import SpecCatalog
 from .spec import DatasetSpec, GroupSpec
 from ..utils import docval, getargs, popargs, get_docval
 
+SPEC_CACHE_DIR_ENV_VAR = 'HDMF_SPEC_CACHE_DIR'
+
+# the directory in which YAMLSpecReader caches parsed specification files. Caching is disabled if this is None.
+_spec_cache_dir = os.environ.get(SPEC_CACHE_DIR_ENV_VAR) or None
+
+# included in the key of each cache file. Change this to invalidate existing caches if the cache format changes.
+_SPEC_CACHE_VERSION = b'hdmf-spec-cache-1\n'
+
+
+@docval({'name': 'cache_dir', 'type': str, 'doc': 'the directory to cache parsed specification files in',
+         'default': None},
+        is_method=False)
+def set_spec_cache_dir(**kwargs):
+    """Set the directory in which parsed namespace and specification files are cached.
+
+    YAML namespace and specification files are cached as JSON files named by the hash of the contents of the YAML
+    file, so a cached file is only used if the YAML file has not changed. Set *cache_dir* to None to disable caching.
+    The default directory is read from the environment variable ``HDMF_SPEC_CACHE_DIR``.
+    """
+    global _spec_cache_dir
+    _spec_cache_dir = getargs('cache_dir', kwargs)
+
+
+def get_spec_cache_dir():
+    """Get the directory in which parsed namespace and specification files are cached, or None if caching is
+    disabled"""
+    return _spec_cache_dir
+
+
+def _encode_cache_value(obj):
+    if isinstance(obj, datetime):
+        return {'__datetime__': obj.isoformat()}
+    if isinstance(obj, date):
+        return {'__date__': obj.isoformat()}
+    raise TypeError("Object of type %s cannot be cached" % type(obj).__name__)
+
+
+def _decode_cache_value(obj):
+    if len(obj) == 1:
+        if '__datetime__' in obj:
+            return datetime.fromisoformat(obj['__datetime__'])
+        if '__date__' in obj:
+            return date.fromisoformat(obj['__date__'])
+    return obj
+
+
 _namespace_args = [
     {'name': 'doc', 'type': str, 'doc': 'a description about what this namespace represents'},
     {'name': 'name', 'type': str, 'doc': 'the name of this namespace'},
@@ -193,27 +242,31 @@ class SpecReader(metaclass=ABCMeta):
 
 class YAMLSpecReader(SpecReader):
 
-    @docval({'name': 'indir', 'type': str, 'doc': 'the path spec files are relative to', 'default': '.'})
+    @docval({'name': 'indir', 'type': str, 'doc': 'the path spec files are relative to', 'default': '.'},
+            {'name': 'cache_dir', 'type': str,
+             'doc': ('the directory to cache parsed spec files in. If None, the directory set with '
+                     'set_spec_cache_dir is used'),
+             'default': None})
     def __init__(self, **kwargs):
         super().__init__(source=kwargs['indir'])
+        self.__cache_dir = kwargs['cache_dir'] or get_spec_cache_dir()
+
+    @property
+    def cache_dir(self):
+        """The directory parsed spec files are cached in, or None if caching is disabled"""
+        return self.__cache_dir
 
     def read_namespace(self, namespace_path):
-        namespaces = None
-        with open(namespace_path, 'r') as stream:
-            yaml_obj = yaml.YAML(typ='safe', pure=True)
-            d = yaml_obj.load(stream)
-            namespaces = d.get('namespaces')
-            if namespaces is None:
-                raise ValueError("no 'namespaces' found in %s" % namespace_path)
+        d = self.__load(namespace_path)
+        namespaces = d.get('namespaces')
+        if namespaces is None:
+            raise ValueError("no 'namespaces' found in %s" % namespace_path)
         return namespaces
 
     def read_spec(self, spec_path):
-        specs = None
-        with open(self.__get_spec_path(spec_path), 'r') as stream:
-            yaml_obj = yaml.YAML(typ='safe', pure=True)
-            specs = yaml_obj.load(stream)
-            if not ('datasets' in specs or 'groups' in specs):
-                raise ValueError("no 'groups' or 'datasets' found in %s" % spec_path)
+        specs = self.__load(self.__get_spec_path(spec_path))
+        if not ('datasets' in specs or 'groups' in specs):
+            raise ValueError("no 'groups' or 'datasets' found in %s" % spec_path)
         return specs
 
     def __get_spec_path(self, spec_path):
@@ -221,6 +274,47 @@ class YAMLSpecReader(SpecReader):
             return spec_path
         return os.path.join(self.source, spec_path)
 
+    def __load(self, path):
+        """Parse the given YAML file, using the parsed copy in the cache directory if the file has not changed"""
+        yaml_obj = yaml.YAML(typ='safe', pure=True)
+        if self.__cache_dir is None:
+            with open(path, 'r') as stream:
+                return yaml_obj.load(stream)
+        with open(path, 'rb') as stream:
+            content = stream.read()
+        key = hashlib.sha256(_SPEC_CACHE_VERSION + content).hexdigest()
+        cache_path = os.path.join(self.__cache_dir, key + '.json')
+        try:
+            with open(cache_path, 'r') as stream:
+                return json.load(stream, object_hook=_decode_cache_value)
+        except (OSError, ValueError):
+            pass  # the file is not cached yet or the cached file is not readable
+        ret = yaml_obj.load(content)
+        self.__write_cache(cache_path, ret)
+        return ret
+
+    def __write_cache(self, cache_path, obj):
+        """Write the parsed YAML object to the cache. Objects that do not survive a round trip through JSON unchanged
+        are not cached."""
+        try:
+            text = json.dumps(obj, default=_encode_cache_value)
+        except (TypeError, ValueError):
+            return
+        if json.loads(text, object_hook=_decode_cache_value) != obj:
+            return
+        tmp_path = None
+        try:
+            os.makedirs(self.__cache_dir, exist_ok=True)
+            # write to a temporary file first so that concurrent readers never see a partially written file
+            fd, tmp_path = tempfile.mkstemp(dir=self.__cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as stream:
+                stream.write(text)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            warn("Could not write spec cache file '%s': %s" % (cache_path, e))
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
 
 class NamespaceCatalog:
 
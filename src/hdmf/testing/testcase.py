@@ -56,8 +56,9 @@ class TestCase(unittest.TestCase):
         """
         self.assertTrue(isinstance(container1, AbstractContainer), message)
         self.assertTrue(isinstance(container2, AbstractContainer), message)
-        type1 = type(container1)
-        type2 = type(container2)
+        # use __class__ instead of type() for containers constructed with lazy=True that are not initialized yet
+        type1 = container1.__class__
+        type2 = container2.__class__
         self.assertEqual(type1, type2, message)
         if not ignore_name:
             self.assertEqual(container1.name, container2.name, message)
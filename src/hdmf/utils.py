@@ -1,8 +1,12 @@
 import collections
 import copy as _copy
+import os
+import sys
+import threading
 import types
 import warnings
 from abc import ABCMeta
+from contextlib import contextmanager
 from enum import Enum
 
 import h5py
@@ -26,6 +30,48 @@ except ImportError:
 # code to signify how to handle positional arguments in docval
 AllowPositional = Enum('AllowPositional', 'ALLOWED WARNING ERROR')
 
+# set the environment variable HDMF_TRUSTED_CALLS=1 to allow internal code paths wrapped in trusted_calls()
+# to skip docval type and shape checks
+TRUSTED_CALLS_ENV_VAR = 'HDMF_TRUSTED_CALLS'
+__trusted_calls_default = os.getenv(TRUSTED_CALLS_ENV_VAR, 'false').lower() in ('1', 'true', 'yes', 'on')
+
+
+class __TrustedCallState(threading.local):
+    # whether docval should only bind arguments (without checking them) in the current thread
+    active = False
+
+
+__trusted_call_state = __TrustedCallState()
+
+
+@contextmanager
+def trusted_calls(enabled=None):
+    """Context manager for internal code paths that only pass valid arguments to docval-decorated functions.
+
+    Within the context, docval binds arguments to parameter names, fills in defaults, and checks for missing and
+    unrecognized arguments, but does not enforce argument types and shapes. The setting is local to the current thread,
+    so calls made from other threads are validated as usual. Contexts can be nested, and the previous setting is
+    restored on exit.
+
+    :param enabled: Whether to skip type and shape checks within the context. If None (default), checks are skipped
+                    if they are already skipped in an enclosing context, or if the environment variable
+                    HDMF_TRUSTED_CALLS is set to a true value, e.g., "1" or "true".
+    """
+    previous = __trusted_call_state.active
+    if enabled is None:
+        enabled = previous or __trusted_calls_default
+    __trusted_call_state.active = enabled
+    try:
+        yield
+    finally:
+        __trusted_call_state.active = previous
+
+
+def in_trusted_call():
+    """Return True if docval type and shape checks are currently being skipped in this thread"""
+    return __trusted_call_state.active
+
+
 __supported_bool_types = (bool, np.bool_)
 __supported_uint_types = (np.uint8, np.uint16, np.uint32, np.uint64)
 __supported_int_types = (int, np.int8, np.int16, np.int32, np.int64)
@@ -41,6 +87,14 @@ __allowed_enum_types = (__supported_bool_types + __supported_uint_types + __supp
                         + __supported_float_types + (str,))
 
 
+# cache of type check results keyed by (class of value, argtype). the check only depends on the class of the value,
+# so docval calls with the same signature and argument types do not repeat isinstance checks, macro lookups, and MRO
+# walks. the cache is cleared when it is full and when a new type is registered with docval_macro. NOTE: a class that
+# is registered as a virtual subclass of an abc.ABC after a value of that class has been checked is not detected.
+__type_okay_cache = dict()
+__TYPE_OKAY_CACHE_SIZE = 2**14
+
+
 def docval_macro(macro):
     """Class decorator to add the class to a list of types associated with the key macro in the __macros dict
     """
@@ -49,6 +103,7 @@ def docval_macro(macro):
         if macro not in __macros:
             __macros[macro] = list()
         __macros[macro].append(cls)
+        __type_okay_cache.clear()
         return cls
 
     return _dec
@@ -85,9 +140,33 @@ def __type_okay(value, argtype, allow_none=False):
     """
     if value is None:
         return allow_none
+    cls = value.__class__
+    try:
+        return __type_okay_cache[(cls, argtype)]
+    except KeyError:
+        ret = __check_type(value, argtype)
+        __cache_type_okay(value, argtype, ret)
+        return ret
+    except TypeError:  # argtype is not hashable, e.g., a list
+        return __check_type(value, argtype)
+
+
+def __cache_type_okay(value, argtype, ret):
+    """Add the result of a type check for the given value and argtype to the type check cache"""
+    cls = value.__class__
+    if type(value) is not cls:
+        # objects that override __class__ may not be checked consistently by class alone, so do not cache them
+        return
+    if len(__type_okay_cache) >= __TYPE_OKAY_CACHE_SIZE:
+        __type_okay_cache.clear()
+    __type_okay_cache[(cls, argtype)] = ret
+
+
+def __check_type(value, argtype):
+    """Check a non-None value against a type without using the type check cache. See :py:func:`__type_okay`"""
     if isinstance(argtype, str):
         if argtype in __macros:
-            return __type_okay(value, __macros[argtype], allow_none=allow_none)
+            return __check_type(value, __macros[argtype])
         elif argtype == 'uint':
             return __is_uint(value)
         elif argtype == 'int':
@@ -96,6 +175,8 @@ def __type_okay(value, argtype, allow_none=False):
             return __is_float(value)
         elif argtype == 'bool':
             return __is_bool(value)
+        elif '.' in argtype:
+            return __is_instance_of_path(value, argtype)
         return argtype in [cls.__name__ for cls in value.__class__.__mro__]
     elif isinstance(argtype, type):
         if argtype is int:
@@ -106,11 +187,22 @@ def __type_okay(value, argtype, allow_none=False):
             return __is_bool(value)
         return isinstance(value, argtype)
     elif isinstance(argtype, tuple) or isinstance(argtype, list):
-        return any(__type_okay(value, i) for i in argtype)
+        return any(__check_type(value, i) for i in argtype)
     else:  # argtype is None
         return True
 
 
+def __is_instance_of_path(value, path):
+    """Check whether a value is an instance of the class at the given path, e.g., "pandas.DataFrame".
+
+    The module of the class is not imported. A value can only be an instance of the class if the module has already
+    been imported, so the class is looked up in the loaded modules.
+    """
+    module_name, _, cls_name = path.rpartition('.')
+    cls = getattr(sys.modules.get(module_name), cls_name, None)
+    return isinstance(cls, type) and isinstance(value, cls)
+
+
 def __shape_okay_multi(value, argshape):
     if type(argshape[0]) in (tuple, list):  # if multiple shapes are present
         return any(__shape_okay(value, a) for a in argshape)
@@ -119,7 +211,10 @@ def __shape_okay_multi(value, argshape):
 
 
 def __shape_okay(value, argshape):
-    valshape = get_data_shape(value)
+    return __shape_match(get_data_shape(value), argshape)
+
+
+def __shape_match(valshape, argshape):
     if not len(valshape) == len(argshape):
         return False
     for a, b in zip(valshape, argshape):
@@ -146,7 +241,7 @@ def __is_bool(value):
 
 def __format_type(argtype):
     if isinstance(argtype, str):
-        return argtype
+        return argtype.rpartition('.')[2]
     elif isinstance(argtype, type):
         return argtype.__name__
     elif isinstance(argtype, tuple) or isinstance(argtype, list):
@@ -386,6 +481,173 @@ def __parse_args(validator, args, kwargs, enforce_type=True, enforce_shape=True,
             'syntax_errors': syntax_errors}
 
 
+# default values of these types are immutable, so they do not need to be deepcopied on every call
+__immutable_default_types = (type(None), bool, int, float, complex, str, bytes)
+
+
+def __compile_type_check(argtype):
+    """Compile a resolved docval argument type into a single-argument predicate.
+
+    The predicate is equivalent to ``__type_okay(value, argtype)`` for values that are not None, but resolves
+    macros, the special numeric type names, and builtin numeric types into a single :py:func:`isinstance` tuple
+    once instead of on every call. Results are stored in the type check cache, so repeated checks of values of the
+    same class are a single dict lookup.
+    """
+    if argtype is None:
+        return None
+    if isinstance(argtype, list):
+        argtype = tuple(argtype)
+    types = argtype if isinstance(argtype, tuple) else (argtype, )
+    classes = list()
+    names = list()
+    special = {int: __supported_int_types, float: __supported_float_types, bool: __supported_bool_types,
+               'int': __supported_int_types, 'float': __supported_float_types, 'bool': __supported_bool_types,
+               'uint': __supported_uint_types}
+    for t in types:
+        if isinstance(t, str) and t in __macros:
+            classes.extend(__macros[t])
+        elif isinstance(t, (str, type)) and t in special:
+            classes.extend(special[t])
+        elif isinstance(t, type):
+            classes.append(t)
+        elif isinstance(t, str):
+            names.append(t)
+        else:
+            # nested lists/tuples or anything unexpected is left to __type_okay
+            return lambda value: __type_okay(value, argtype)
+    classes = tuple(classes)
+    names = tuple(names)
+
+    def uncached_check(value):
+        # names may refer to macros registered after decoration, so defer to __check_type for those
+        return isinstance(value, classes) or any(__check_type(value, name) for name in names)
+
+    def check(value):
+        try:
+            return __type_okay_cache[(value.__class__, argtype)]
+        except KeyError:
+            ret = uncached_check(value)
+            __cache_type_okay(value, argtype, ret)
+            return ret
+
+    return check
+
+
+def __compile_parser(validator, enforce_type=True, enforce_shape=True, allow_extra=False,  # noqa: C901
+                     allow_positional=AllowPositional.ALLOWED):
+    """
+    Compile a docval specification into a fast argument parser for the common case where all arguments are valid.
+
+    The returned function takes the positional arguments and keyword arguments supplied by the caller and returns the
+    dict of parsed arguments, exactly as ``__parse_args(...)['args']`` would. If any check fails, or if the call needs
+    special handling (e.g., a :py:class:`~hdmf.term_set.TermSetWrapper` value or a shape that must be unpacked from an
+    attribute), the function returns None and the caller should fall back to :py:func:`__parse_args` to collect
+    detailed error messages.
+
+    :return: the parser function, or None if the specification cannot be compiled (e.g., duplicate argument names)
+    """
+    names = [arg['name'] for arg in validator]
+    if len(set(names)) != len(names):
+        return None  # let __parse_args report the duplicated names on every call
+    name_set = frozenset(names)
+    n_args = len(validator)
+    positional_ok = allow_positional not in (AllowPositional.WARNING, AllowPositional.ERROR)
+
+    specs = list()
+    for arg in validator:
+        check = __compile_type_check(arg['type']) if enforce_type else None
+        shape = arg.get('shape') if enforce_shape else None
+        enum = arg.get('enum')
+        has_default = 'default' in arg
+        default = arg.get('default')
+        if has_default:
+            # None is checked against the type only, unless the type is not enforced
+            none_ok = default is None or arg.get('allow_none', False) or not enforce_type
+        else:
+            # None is checked against the type and the enum
+            none_ok = not enforce_type and enum is None
+        copy_default = not isinstance(default, __immutable_default_types)
+        default_ok = False
+        if has_default:
+            try:
+                default_ok = __fast_check_value(default, check, none_ok, shape, enum)
+            except Exception:
+                default_ok = False
+        specs.append((arg['name'], has_default, default, copy_default, default_ok, check, none_ok, shape, enum))
+    specs = tuple(specs)
+
+    termset_wrapper_cls = list()
+
+    def parse(args, kwargs):
+        if args and not positional_ok:
+            return None
+        nargs = len(args)
+        if nargs > n_args or (not allow_extra and nargs + len(kwargs) > n_args):
+            return None
+        if not termset_wrapper_cls:
+            from .term_set import TermSetWrapper  # circular import fix
+            termset_wrapper_cls.append(TermSetWrapper)
+        wrapper_cls = termset_wrapper_cls[0]
+        ret = dict()
+        argsi = 0
+        n_kwargs_used = 0
+        try:
+            for name, has_default, default, copy_default, default_ok, check, none_ok, shape, enum in specs:
+                if name in kwargs:
+                    if not has_default and argsi < nargs:
+                        return None  # multiple values for argument
+                    argval = kwargs[name]
+                    n_kwargs_used += 1
+                    if not has_default:
+                        argsi += 1
+                elif argsi < nargs:
+                    argval = args[argsi]
+                    argsi += 1
+                elif has_default:
+                    if not default_ok:
+                        return None
+                    ret[name] = _copy.deepcopy(default) if copy_default else default
+                    continue
+                else:
+                    return None  # missing argument
+                if isinstance(argval, wrapper_cls):
+                    return None
+                if not __fast_check_value(argval, check, none_ok, shape, enum):
+                    return None
+                ret[name] = argval
+        except Exception:
+            return None
+        if n_kwargs_used < len(kwargs):
+            if not allow_extra:
+                return None  # unrecognized arguments
+            for key, val in kwargs.items():
+                if key not in name_set:
+                    ret[key] = val
+        return ret
+
+    return parse
+
+
+def __fast_check_value(argval, check, none_ok, shape, enum):
+    """Return True if the value passes the precompiled type, shape, and enum checks of a docval argument"""
+    if argval is None:
+        return none_ok
+    if check is not None and not check(argval):
+        return False
+    if shape is not None:
+        valshape = get_data_shape(argval)
+        if valshape is None:
+            return False  # the shape may need to be unpacked from an attribute of the value
+        if type(shape[0]) in (tuple, list):
+            if not any(__shape_match(valshape, s) for s in shape):
+                return False
+        elif not __shape_match(valshape, shape):
+            return False
+    if enum is not None and argval not in enum:
+        return False
+    return True
+
+
 docval_idx_name = '__dv_idx__'
 docval_attr_name = '__docval__'
 __docval_args_loc = 'args'
@@ -541,7 +803,9 @@ def docval(*validator, **options):  # noqa: C901
     must contain the following keys: ``'name'``, ``'type'``, and ``'doc'``. This will define a
     positional argument. To define a keyword argument, specify a default value
     using the key ``'default'``. To validate the dimensions of an input array
-    add the optional ``'shape'`` parameter. To allow a None value for an argument,
+    add the optional ``'shape'`` parameter. A type can be given as a class, a tuple of classes, the name of a class,
+    a docval macro, or the full path of a class in a module that is imported lazily, e.g., ``'pandas.DataFrame'``, which
+    only matches instances of that class and does not import the module. To allow a None value for an argument,
     either the default value must be None or a different default value must be provided
     and ``'allow_none': True`` must be passed.
 
@@ -627,17 +891,38 @@ def docval(*validator, **options):  # noqa: C901
         loc_val = pos + kw
         _docval[__docval_args_loc] = loc_val
 
+        # argument parsers are compiled on first use (rather than at import time) for normal calls and for calls
+        # within trusted_calls(), which only bind arguments
+        parsers = dict()
+
         def _check_args(args, kwargs):
             """Parse and check arguments to decorated function. Raise warnings and errors as appropriate."""
             # this function was separated from func_call() in order to make stepping through lines of code using pdb
             # easier
 
+            trusted = __trusted_call_state.active
+            try:
+                parse = parsers[trusted]
+            except KeyError:
+                parse = parsers[trusted] = __compile_parser(
+                    loc_val,
+                    enforce_type=enforce_type and not trusted,
+                    enforce_shape=enforce_shape and not trusted,
+                    allow_extra=allow_extra,
+                    allow_positional=allow_positional
+                )
+            if parse is not None:
+                # fast path for the common case where all arguments are valid
+                pargs = parse(args[1:] if is_method else args, kwargs)
+                if pargs is not None:
+                    return pargs
+
             parsed = __parse_args(
                 loc_val,
                 args[1:] if is_method else args,
                 kwargs,
-                enforce_type=enforce_type,
-                enforce_shape=enforce_shape,
+                enforce_type=enforce_type and not trusted,
+                enforce_shape=enforce_shape and not trusted,
                 allow_extra=allow_extra,
                 allow_positional=allow_positional
             )
@@ -670,7 +955,13 @@ def docval(*validator, **options):  # noqa: C901
         _rtype = rtype
         if isinstance(rtype, type):
             _rtype = rtype.__name__
-        docstring = __googledoc(func, _docval[__docval_args_loc], returns=returns, rtype=_rtype)
+        docstring = None
+        # docstrings are built here rather than on first access of __doc__, because a lazy __doc__ would require
+        # replacing the decorated function with a non-function callable, which Sphinx and inspect do not document or
+        # treat as a routine, and which adds overhead to every call. docstrings are stripped when running python
+        # with -OO, so do not build them then
+        if sys.flags.optimize < 2:
+            docstring = __googledoc(func, _docval[__docval_args_loc], returns=returns, rtype=_rtype)
         docval_idx = {a['name']: a for a in _docval[__docval_args_loc]}  # cache a name-indexed dictionary of args
         setattr(func_call, '__doc__', docstring)
         setattr(func_call, '__name__', func.__name__)
@@ -706,6 +997,8 @@ def __builddoc(func, validator, docstring_fmt, arg_fmt, ret_fmt=None, returns=No
                 return ":py:class:`~{name}`".format(name=name)
             else:
                 return ":py:class:`~{module}.{name}`".format(name=name, module=module)
+        if isinstance(argtype, str) and '.' in argtype:
+            return ":py:class:`~{path}`".format(path=argtype)
         return argtype
 
     def __sphinx_arg(arg):
@@ -1,4 +1,4 @@
-from hdmf.build import GroupBuilder, DatasetBuilder, LinkBuilder, ReferenceBuilder, RegionBuilder
+from hdmf.build import GroupBuilder, DatasetBuilder, LazyGroupBuilder, LinkBuilder, ReferenceBuilder, RegionBuilder
 from hdmf.testing import TestCase
 
 
@@ -284,6 +284,49 @@ class TestGroupBuilderIsEmpty(TestCase):
         self.assertFalse(gb3.is_empty())
 
 
+class TestLazyGroupBuilder(TestCase):
+
+    def setUp(self):
+        self.calls = 0
+
+    def load(self, builder):
+        self.calls += 1
+        builder.set_attribute('attr1', 'value1')
+        builder.set_group(GroupBuilder('subgroup1'))
+        builder.set_dataset(DatasetBuilder('dataset1', [1, 2, 3]))
+
+    def test_not_loaded_on_construction(self):
+        gb = LazyGroupBuilder('gb', loader=self.load, source='a source')
+        self.assertFalse(gb.loaded)
+        self.assertEqual(self.calls, 0)
+        self.assertEqual(gb.name, 'gb')
+        self.assertEqual(gb.source, 'a source')
+
+    def test_load_on_access(self):
+        gb = LazyGroupBuilder('gb', loader=self.load)
+        self.assertEqual(gb.attributes, {'attr1': 'value1'})
+        self.assertTrue(gb.loaded)
+        self.assertIs(gb['subgroup1'].parent, gb)
+        self.assertEqual(gb['dataset1'].data, [1, 2, 3])
+        self.assertEqual(gb.obj_type['dataset1'], 'datasets')
+        self.assertEqual(self.calls, 1)
+
+    def test_set_parent_does_not_load(self):
+        parent = GroupBuilder('parent', source='a source')
+        gb = LazyGroupBuilder('gb', loader=self.load)
+        parent.set_group(gb)
+        self.assertIs(gb.parent, parent)
+        self.assertFalse(gb.loaded)
+        self.assertEqual(gb['subgroup1'].source, 'a source')
+
+    def test_eq(self):
+        gb = GroupBuilder('gb')
+        self.load(gb)
+        self.assertEqual(LazyGroupBuilder('gb', loader=self.load), gb)
+        self.assertEqual(gb, LazyGroupBuilder('gb', loader=self.load))
+        self.assertEqual(self.calls, 3)
+
+
 class TestDatasetBuilder(TestCase):
 
     def test_constructor(self):
@@ -1,6 +1,10 @@
 from abc import ABCMeta, abstractmethod
+from copy import copy, deepcopy
+import re
 
-from hdmf.build import GroupBuilder, DatasetBuilder, ObjectMapper, BuildManager, TypeMap, ContainerConfigurationError
+from hdmf import Container
+from hdmf.build import (GroupBuilder, DatasetBuilder, ObjectMapper, BuildManager, TypeMap, ContainerConfigurationError,
+                        ConstructError)
 from hdmf.spec import GroupSpec, AttributeSpec, DatasetSpec, SpecCatalog, SpecNamespace, NamespaceCatalog
 from hdmf.spec.spec import ZERO_OR_MANY
 from hdmf.testing import TestCase
@@ -90,6 +94,27 @@ class TestBuildManager(TestBase):
         self.assertDictEqual(builder1, expected)
         self.assertIs(builder1, builder2)
 
+    def test_purge_outdated(self):
+        foo1 = Foo('foo1', list(range(10)), 'value1', 10)
+        foo2 = Foo('foo2', list(range(10)), 'value2', 10)
+        builder1 = self.manager.build(foo1)
+        builder2 = self.manager.build(foo2)
+        foo1.set_modified(False)
+        foo2.set_modified(False)
+        foo2.set_modified()
+        self.manager.purge_outdated()
+        self.assertIs(self.manager.get_builder(foo1), builder1)
+        self.assertIsNone(self.manager.get_builder(foo2))
+        self.assertIsNot(self.manager.build(foo2), builder2)
+
+    def test_was_built(self):
+        foo = Foo('my_foo', list(range(10)), 'value1', 10)
+        builder = self.manager.build(foo, root=True)
+        self.assertTrue(self.manager.was_built(builder))
+        foo.set_modified(False)
+        self.assertIs(self.manager.build(foo, root=True), builder)
+        self.assertFalse(self.manager.was_built(builder))
+
     def test_construct(self):
         builder = GroupBuilder(
             'my_foo',
@@ -189,6 +214,35 @@ class NestedBaseMixin(metaclass=ABCMeta):
         container = self.manager.construct(self.bucket_builder)
         self.assertEqual(container, self.foo_bucket)
 
+    def test_construct_lazy(self):
+        container = self.manager.construct(self.bucket_builder, lazy=True)
+        self.assertIsInstance(container, FooBucket)
+        self.assertIsNot(type(container), FooBucket)
+        self.assertEqual(container.name, 'test_foo_bucket')
+        foos = container.foos
+        self.assertIs(type(container), FooBucket)
+        for foo in foos.values():
+            self.assertIsNot(type(foo), Foo)
+            self.assertIs(foo.parent, container)
+            self.assertFalse(foo.modified)
+        self.assertEqual(container, self.foo_bucket)
+        self.assertIs(self.manager.construct(self.bucket_builder), container)
+
+    def test_construct_lazy_child_fails(self):
+        """Test that every access of a lazily constructed child whose construction fails raises the same error"""
+        self.foo_builders['my_foo1'].attributes['attr1'] = 1  # attr1 must be a str
+        container = self.manager.construct(self.bucket_builder, lazy=True)
+        foo = container.foos['my_foo1']
+        msg = ("Could not construct Foo object due to: Foo.__init__: incorrect type for 'attr1' (got 'int', "
+               "expected 'str')")
+        for _ in range(2):
+            with self.assertRaisesRegex(ConstructError, re.escape(msg)):
+                foo.attr1
+            self.assertIsNot(type(foo), Foo)
+            self.assertIsInstance(foo, Foo)
+            self.assertEqual(foo.name, 'my_foo1')
+        self.assertEqual(container.foos['my_foo2'].attr1, 'value2')
+
 
 class TestNestedContainersNoSubgroups(NestedBaseMixin, TestBase):
     '''
@@ -333,6 +387,89 @@ class TestTypeMap(TestBase):
         self.assertEqual(dt, 'Foo')
         self.assertEqual(ns, 'CORE')
 
+    def test_lookup_cache_info(self):
+        self.type_map.clear_lookup_caches()
+        info = self.type_map.get_lookup_cache_info()
+        self.assertEqual(set(info), {'get_map', 'get_dt_container_cls', 'get_subspec'})
+        self.assertEqual(info['get_map']['size'], 0)
+
+        foo = Foo('my_foo', list(), 'value1', 10)
+        bldr = GroupBuilder('my_foo', attributes={'namespace': CORE_NAMESPACE, 'data_type': 'Foo'})
+        mapper = self.type_map.get_map(foo)
+        self.assertIs(self.type_map.get_map(foo), mapper)
+        self.assertIs(self.type_map.get_map(bldr), mapper)
+        self.assertIs(self.type_map.get_map(bldr), mapper)
+        self.assertIs(self.type_map.get_cls(bldr), Foo)
+
+        info = self.type_map.get_lookup_cache_info()
+        self.assertEqual(info['get_map'], {'hits': 2, 'misses': 2, 'size': 2})
+        self.assertEqual(info['get_dt_container_cls']['size'], 1)
+
+    def test_lookup_cache_cleared_on_register(self):
+        foo = Foo('my_foo', list(), 'value1', 10)
+        self.assertIsInstance(self.type_map.get_map(foo), FooMapper)
+
+        class OtherFooMapper(FooMapper):
+            pass
+
+        self.type_map.register_map(Foo, OtherFooMapper)
+        self.assertEqual(self.type_map.get_lookup_cache_info()['get_map']['size'], 0)
+
+    def test_get_subspec_cached(self):
+        bldr = DatasetBuilder('my_data', data=[1, 2, 3])
+        subspec = self.type_map.get_subspec(self.foo_spec, bldr)
+        self.assertIs(subspec, self.foo_spec.get_dataset('my_data'))
+        self.assertIs(self.type_map.get_subspec(self.foo_spec, bldr), subspec)
+        info = self.type_map.get_lookup_cache_info()['get_subspec']
+        self.assertEqual((info['hits'], info['misses']), (1, 1))
+
+
+class TestTypeMapCopy(TestBase):
+
+    def setUp(self):
+        super().setUp()
+        self.spec_catalog.register_spec(GroupSpec('A test group specification', data_type_def='Bar'), 'test.yaml')
+
+        class Bar(Container):
+            pass
+
+        class BarMapper(ObjectMapper):
+            pass
+
+        self.bar_cls = Bar
+        self.bar_mapper_cls = BarMapper
+
+    def test_copy_shares_registrations(self):
+        for type_map_copy in (copy(self.type_map), deepcopy(self.type_map)):
+            with self.subTest(type_map_copy=type_map_copy):
+                self.assertIs(type_map_copy.get_dt_container_cls('Foo', CORE_NAMESPACE), Foo)
+                self.assertEqual(type_map_copy.get_container_cls_dt(Foo), (CORE_NAMESPACE, 'Foo'))
+                self.assertIsInstance(type_map_copy.get_map(Foo('my_foo', list(), 'value1', 10)), FooMapper)
+
+    def test_register_in_copy(self):
+        """Test that registering types and maps in a copy does not change the original TypeMap"""
+        type_map_copy = copy(self.type_map)
+        type_map_copy.register_container_type(CORE_NAMESPACE, 'Bar', self.bar_cls)
+        type_map_copy.register_map(Foo, self.bar_mapper_cls)
+        self.assertIs(type_map_copy.get_dt_container_cls('Bar', CORE_NAMESPACE, autogen=False), self.bar_cls)
+        self.assertIsNone(self.type_map.get_dt_container_cls('Bar', CORE_NAMESPACE, autogen=False))
+        self.assertEqual(self.type_map.get_container_cls_dt(self.bar_cls), (None, None))
+        self.assertIsInstance(type_map_copy.get_map(Foo('my_foo', list(), 'value1', 10)), self.bar_mapper_cls)
+        self.assertIsInstance(self.type_map.get_map(Foo('my_foo', list(), 'value1', 10)), FooMapper)
+
+    def test_register_in_original(self):
+        """Test that registering types and maps in the original TypeMap does not change an existing copy"""
+        type_map_copy = copy(self.type_map)
+        self.type_map.register_container_type(CORE_NAMESPACE, 'Bar', self.bar_cls)
+        self.type_map.register_map(Foo, self.bar_mapper_cls)
+        self.assertIsNone(type_map_copy.get_dt_container_cls('Bar', CORE_NAMESPACE, autogen=False))
+        self.assertIsInstance(type_map_copy.get_map(Foo('my_foo', list(), 'value1', 10)), FooMapper)
+
+    def test_container_types_not_shared(self):
+        type_map_copy = copy(self.type_map)
+        type_map_copy.container_types[CORE_NAMESPACE]['Bar'] = self.bar_cls
+        self.assertNotIn('Bar', self.type_map.container_types[CORE_NAMESPACE])
+
 
 class TestRetrieveContainerClass(TestBase):
 
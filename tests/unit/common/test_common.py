@@ -1,5 +1,8 @@
+import subprocess
+import sys
+
 from hdmf import Data, Container
-from hdmf.common import get_type_map
+from hdmf.common import get_type_map, get_class, DynamicTable, EnumData, CORE_NAMESPACE, EXP_NAMESPACE
 from hdmf.testing import TestCase
 
 
@@ -11,3 +14,29 @@ class TestCommonTypeMap(TestCase):
         self.assertIs(cls, Container)
         cls = tm.get_dt_container_cls('Data', 'hdmf-common')
         self.assertIs(cls, Data)
+
+    def test_registered_classes(self):
+        self.assertIs(get_class('DynamicTable', CORE_NAMESPACE), DynamicTable)
+        self.assertIs(get_class('EnumData', EXP_NAMESPACE), EnumData)
+        self.assertEqual(DynamicTable.data_type, 'DynamicTable')
+        self.assertEqual(DynamicTable.namespace, CORE_NAMESPACE)
+        self.assertEqual(EnumData.namespace, EXP_NAMESPACE)
+
+
+class TestLazyImport(TestCase):
+
+    def run_python(self, code):
+        proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        return proc.stdout.split()
+
+    def test_import_does_not_load_optional_dependencies(self):
+        """Test that importing hdmf.common does not import pandas or scipy"""
+        out = self.run_python("import sys, hdmf.common; print('pandas' in sys.modules, 'scipy' in sys.modules)")
+        self.assertEqual(out, ['False', 'False'])
+
+    def test_import_does_not_load_namespace(self):
+        """Test that the hdmf-common namespace is loaded on first use of the type map"""
+        out = self.run_python("import hdmf.common; print(vars(hdmf.common)['__TYPE_MAP'] is None); "
+                              "hdmf.common.get_manager(); print(vars(hdmf.common)['__TYPE_MAP'] is None)")
+        self.assertEqual(out, ['True', 'False'])
@@ -1,11 +1,14 @@
 import json
 import os
 import ruamel.yaml as yaml
-from tempfile import gettempdir
+from datetime import datetime
+from tempfile import gettempdir, TemporaryDirectory
 import warnings
 
 from hdmf.common import get_type_map
-from hdmf.spec import AttributeSpec, DatasetSpec, GroupSpec, SpecNamespace, NamespaceCatalog, NamespaceBuilder
+from hdmf.spec import (AttributeSpec, DatasetSpec, GroupSpec, SpecNamespace, NamespaceCatalog, NamespaceBuilder,
+                       set_spec_cache_dir, get_spec_cache_dir)
+from hdmf.spec.namespace import YAMLSpecReader
 from hdmf.testing import TestCase, remove_test_file
 
 from tests.unit.helpers.utils import CustomGroupSpec, CustomDatasetSpec, CustomSpecNamespace
@@ -285,6 +288,78 @@ class TestCatchDupNS(TestCase):
             self.assertTrue(str(w) != msg)
 
 
+class TestSpecCache(TestCase):
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmpdir.name, 'cache')
+        self.ns_path = os.path.join(self.tmpdir.name, 'namespace.yaml')
+        ns_builder = NamespaceBuilder('Extension doc', 'test_ext', version='0.1.0', date=datetime(2023, 1, 2, 3, 4, 5))
+        ns_builder.add_spec('extension.yaml', GroupSpec('doc', data_type_def='MyType',
+                                                        attributes=[AttributeSpec('attr', 'an attr', 'int')]))
+        ns_builder.export('namespace.yaml', outdir=self.tmpdir.name)
+        # write the date as a YAML timestamp, which is read as a datetime
+        with open(self.ns_path, 'r') as f:
+            ns_text = f.read()
+        with open(self.ns_path, 'w') as f:
+            f.write(ns_text.replace("'2023-01-02T03:04:05'", '2023-01-02 03:04:05'))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def load(self, cache_dir):
+        ns_catalog = NamespaceCatalog()
+        reader = YAMLSpecReader(indir=self.tmpdir.name, cache_dir=cache_dir)
+        ns_catalog.load_namespaces(self.ns_path, reader=reader)
+        return ns_catalog.get_namespace('test_ext')
+
+    def test_cache_roundtrip(self):
+        """Test that namespaces loaded from the cache are equal to namespaces parsed from YAML"""
+        expected = self.load(None)
+        self.assertFalse(os.path.exists(self.cache_dir))
+        first = self.load(self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)  # the namespace file and the spec file
+        second = self.load(self.cache_dir)
+        for ns in (first, second):
+            self.assertDictEqual(dict(ns), dict(expected))
+            self.assertIsInstance(ns.date, datetime)
+            self.assertEqual(ns.get_spec('MyType'), expected.get_spec('MyType'))
+
+    def test_cache_changed_file(self):
+        """Test that a cached file is not used after the source file changes"""
+        self.load(self.cache_dir)
+        spec_path = os.path.join(self.tmpdir.name, 'extension.yaml')
+        with open(spec_path, 'r') as f:
+            spec_text = f.read()
+        with open(spec_path, 'w') as f:
+            f.write(spec_text.replace('an attr', 'a changed attr'))
+        ns = self.load(self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 3)
+        self.assertEqual(ns.get_spec('MyType').get_attribute('attr').doc, 'a changed attr')
+
+    def test_cache_corrupt_file(self):
+        """Test that a corrupt cache file is ignored and replaced"""
+        self.load(self.cache_dir)
+        for name in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, name), 'w') as f:
+                f.write('{not json')
+        ns = self.load(self.cache_dir)
+        self.assertEqual(ns.get_spec('MyType').get_attribute('attr').doc, 'an attr')
+        ns = self.load(self.cache_dir)
+        self.assertEqual(ns.get_spec('MyType').get_attribute('attr').doc, 'an attr')
+
+    def test_set_spec_cache_dir(self):
+        """Test that the global cache directory is used by load_namespaces"""
+        self.addCleanup(set_spec_cache_dir, get_spec_cache_dir())
+        set_spec_cache_dir(self.cache_dir)
+        self.assertEqual(get_spec_cache_dir(), self.cache_dir)
+        self.assertEqual(YAMLSpecReader().cache_dir, self.cache_dir)
+        NamespaceCatalog().load_namespaces(self.ns_path)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+        set_spec_cache_dir(None)
+        self.assertIsNone(YAMLSpecReader().cache_dir)
+
+
 class TestCustomSpecClasses(TestCase):
 
     def setUp(self):  # noqa: C901
@@ -187,6 +187,39 @@ class TestContainer(TestCase):
         child_obj.set_modified()
         self.assertTrue(child_obj.parent.modified)
 
+    def test_set_modified_stops_at_modified_ancestor(self):
+        """Test that set modified does not walk past an ancestor that is already modified"""
+        grandparent_obj = Container('obj1')
+        parent_obj = Container('obj2')
+        parent_obj.parent = grandparent_obj
+        child_obj = Container('obj3')
+        child_obj.parent = parent_obj
+        for obj in (grandparent_obj, parent_obj, child_obj):
+            obj.set_modified(False)
+        parent_obj.set_modified()
+        grandparent_obj.set_modified(False)  # the modified status of the ancestors is no longer consistent
+        child_obj.set_modified()
+        self.assertTrue(parent_obj.modified)
+        self.assertFalse(grandparent_obj.modified)
+
+    def test_get_modified_children(self):
+        """Test that the modified children of a container are recorded when they are modified"""
+        parent_obj = Container('obj1')
+        child_objs = [Container('obj%d' % i) for i in range(2, 5)]
+        for child_obj in child_objs:
+            child_obj.parent = parent_obj
+            child_obj.set_modified(False)
+        parent_obj.set_modified(False)
+        self.assertListEqual(parent_obj._get_modified_children(), [])
+        child_objs[1].set_modified()
+        self.assertListEqual(parent_obj._get_modified_children(), [child_objs[1]])
+        grandchild_obj = Container('obj5')
+        grandchild_obj.parent = child_objs[2]
+        self.assertListEqual(parent_obj._get_modified_children(), [child_objs[1], child_objs[2]])
+        child_objs[1].set_modified(False)
+        parent_obj._remove_child(child_objs[2])
+        self.assertListEqual(parent_obj._get_modified_children(), [])
+
     def test_all_children(self):
         col1 = VectorData(
             name='Species_1',
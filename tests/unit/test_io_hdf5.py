@@ -5,7 +5,7 @@ from numbers import Number
 import numpy as np
 from h5py import File, Dataset, Reference
 from hdmf.backends.hdf5 import HDF5IO
-from hdmf.build import GroupBuilder, DatasetBuilder, LinkBuilder
+from hdmf.build import GroupBuilder, DatasetBuilder, LinkBuilder, ReferenceBuilder
 from hdmf.testing import TestCase
 from hdmf.utils import get_data_shape
 from tests.unit.helpers.utils import Foo, get_foo_buildmanager
@@ -206,6 +206,74 @@ class TestHDF5Writer(GroupBuilderTestCase):
         self.assertIsInstance(f.attrs['ref_attribute'], Reference)
         self.assertEqual(f['test_bucket/foo_holder/foo1'], f[f.attrs['ref_attribute']])
 
+    def test_write_dataset_references(self):
+        """Test writing a dataset of references that are resolved in multiple blocks."""
+        data_builder = self.foo_builder['my_data']
+        self.builder.set_dataset(DatasetBuilder('refs', [self.foo_builder, data_builder] * 4, dtype='object'))
+        with HDF5IO(self.path, manager=self.manager, mode='a', write_block_size=3) as writer:
+            writer.write_builder(self.builder)
+        with File(self.path, 'r') as f:
+            self.assertEqual([f[ref].name for ref in f['refs'][:]],
+                             ['/test_bucket/foo_holder/foo1', '/test_bucket/foo_holder/foo1/my_data'] * 4)
+
+    def test_write_compound_dataset_references(self):
+        """Test writing a compound dataset with a reference column that is resolved in multiple blocks."""
+        dtype = [{'name': 'idx', 'dtype': 'int'},
+                 {'name': 'ref', 'dtype': 'object'},
+                 {'name': 'label', 'dtype': 'text'}]
+        data = [(i, ReferenceBuilder(self.foo_builder), 'row %d' % i) for i in range(7)]
+        self.builder.set_dataset(DatasetBuilder('cpd_refs', data, dtype=dtype))
+        with HDF5IO(self.path, manager=self.manager, mode='a', write_block_size=3) as writer:
+            writer.write_builder(self.builder)
+        with File(self.path, 'r') as f:
+            dset = f['cpd_refs']
+            self.assertEqual(dset['idx'].tolist(), list(range(7)))
+            self.assertEqual([f[ref].name for ref in dset['ref']], ['/test_bucket/foo_holder/foo1'] * 7)
+            self.assertEqual([x.decode() for x in dset['label']], ['row %d' % i for i in range(7)])
+
+    def test_write_compound_dataset(self):
+        """Test writing compound datasets from a list of tuples and from a structured array in multiple blocks."""
+        dtype = [{'name': 'idx', 'dtype': 'int'}, {'name': 'label', 'dtype': 'text'}]
+        data = [(i, 'row %d' % i) for i in range(7)]
+        array = np.array(data, dtype=[('idx', int), ('label', 'S10')])
+        self.builder.set_dataset(DatasetBuilder('cpd_list', data, dtype=dtype))
+        self.builder.set_dataset(DatasetBuilder('cpd_array', array, dtype=dtype))
+        with HDF5IO(self.path, manager=self.manager, mode='a', write_block_size=3) as writer:
+            writer.write_builder(self.builder)
+        with File(self.path, 'r') as f:
+            for name in ('cpd_list', 'cpd_array'):
+                self.assertEqual(f[name]['idx'].tolist(), list(range(7)))
+                self.assertEqual([x.decode() for x in f[name]['label']], ['row %d' % i for i in range(7)])
+
+    def test_write_list_in_blocks(self):
+        data = [[i, i + 1, i + 2] for i in range(10)]
+        self.builder.set_dataset(DatasetBuilder('list_data', data))
+        with HDF5IO(self.path, manager=self.manager, mode='a', write_block_size=3) as writer:
+            writer.write_builder(self.builder)
+        with File(self.path, 'r') as f:
+            self.assertEqual(f['list_data'][:].tolist(), data)
+
+    def test_write_generator(self):
+        self.builder.set_dataset(DatasetBuilder('rows', ([i, 2 * i] for i in range(10))))
+        self.builder.set_dataset(DatasetBuilder('scalars', (float(i) for i in range(7))))
+        self.builder.set_dataset(DatasetBuilder('text', ('row %d' % i for i in range(5)), dtype='text'))
+        self.builder.set_dataset(DatasetBuilder('cpd', ((i, 'row %d' % i) for i in range(5)),
+                                                dtype=[{'name': 'idx', 'dtype': 'int'},
+                                                       {'name': 'label', 'dtype': 'text'}]))
+        self.builder.set_dataset(DatasetBuilder('empty', (i for i in range(0)), dtype='int'))
+        with HDF5IO(self.path, manager=self.manager, mode='a', write_block_size=3) as writer:
+            writer.write_builder(self.builder)
+        with File(self.path, 'r') as f:
+            self.assertEqual(f['rows'][:].tolist(), [[i, 2 * i] for i in range(10)])
+            self.assertEqual(f['scalars'][:].tolist(), [float(i) for i in range(7)])
+            self.assertEqual([x.decode() for x in f['text'][:]], ['row %d' % i for i in range(5)])
+            self.assertEqual(f['cpd']['idx'].tolist(), list(range(5)))
+            self.assertEqual(f['empty'].shape, (0, ))
+
+    def test_bad_write_block_size(self):
+        with self.assertRaisesWith(ValueError, "write_block_size must be a positive integer, got 0"):
+            HDF5IO(self.path, manager=self.manager, mode='w', write_block_size=0)
+
     def test_write_context_manager(self):
         with HDF5IO(self.path, manager=self.manager, mode='a') as writer:
             writer.write_builder(self.builder)
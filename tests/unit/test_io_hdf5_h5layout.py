@@ -0,0 +1,148 @@
+import os
+
+import numpy as np
+from h5py import File
+
+from hdmf.backends.hdf5 import HDF5IO, H5DataIO, H5LayoutPlanner
+from hdmf.build import GroupBuilder, DatasetBuilder
+from hdmf.data_utils import DataChunkIterator
+from hdmf.spec import DtypeSpec, NamespaceCatalog, SpecCatalog
+from hdmf.testing import TestCase
+from tests.unit.helpers.utils import (get_temp_filepath, CustomGroupSpec, CustomDatasetSpec,
+                                      CustomSpecNamespace)
+
+
+class TestH5LayoutPlanner(TestCase):
+
+    def setUp(self):
+        self.data = np.zeros((10000, 100))  # 8 MB
+        self.root = GroupBuilder('root', groups={
+            'group': GroupBuilder('group', attributes={'data_type': 'Group'}, datasets={
+                'data': DatasetBuilder('data', self.data),
+                'small': DatasetBuilder('small', np.zeros(10)),
+                'text': DatasetBuilder('text', ['a'] * 100000, dtype='text'),
+                'wrapped': DatasetBuilder('wrapped', H5DataIO(self.data, chunks=(10, 100))),
+                'dci': DatasetBuilder('dci', DataChunkIterator(self.data)),
+                'list': DatasetBuilder('list', [[1.0] * 10] * 10000),
+            })
+        })
+
+    def test_bad_access_pattern(self):
+        with self.assertRaisesWith(ValueError, "access pattern must be one of ('row', 'column', 'timeseries'), "
+                                               "got 'random'"):
+            H5LayoutPlanner(access_patterns={'Group': 'random'})
+
+    def test_row_chunk_shape(self):
+        planner = H5LayoutPlanner(chunk_bytes=8000)
+        self.assertTupleEqual(planner.get_chunk_shape((10000, 100), 8, 'row'), (10, 100))
+        # a single row does not fit into a chunk
+        self.assertTupleEqual(planner.get_chunk_shape((10000, 4000), 8, 'row'), (1, 1000))
+        self.assertTupleEqual(planner.get_chunk_shape((5, ), 8, 'row'), (5, ))
+
+    def test_column_chunk_shape(self):
+        planner = H5LayoutPlanner(chunk_bytes=8000)
+        self.assertTupleEqual(planner.get_chunk_shape((10000, 100), 8, 'column'), (1000, 1))
+        self.assertTupleEqual(planner.get_chunk_shape((500, 100, 3), 8, 'column'), (500, 1, 1))
+
+    def test_timeseries_chunk_shape(self):
+        planner = H5LayoutPlanner(chunk_bytes=64 * 1000 * 2)
+        self.assertTupleEqual(planner.get_chunk_shape((100000, 384), 2, 'timeseries'), (1000, 64))
+        self.assertTupleEqual(planner.get_chunk_shape((384, 100000), 2, 'timeseries', dims=('channels', 'time')),
+                              (64, 1000))
+
+    def test_plan(self):
+        planner = H5LayoutPlanner(chunk_bytes=80000)
+        layouts = planner.plan(self.root)
+        self.assertEqual(set(layouts), {'/group/data', '/group/list'})
+        layout = layouts['/group/data']
+        self.assertTupleEqual(layout['chunks'], (100, 100))
+        self.assertEqual(layout['num_chunks'], 100)
+        self.assertEqual(layout['chunk_bytes'], 80000)
+        self.assertDictEqual(layout['filters'], {'compression': 'gzip', 'compression_opts': 4, 'shuffle': True})
+        self.assertTupleEqual(layouts['/group/list']['chunks'], (1000, 10))
+        # plan does not change the builders
+        self.assertIs(self.root['group/data'].data, self.data)
+
+    def test_access_patterns(self):
+        planner = H5LayoutPlanner(chunk_bytes=80000, access_patterns={'Group': 'column', '/group/list': 'row'})
+        layouts = planner.plan(self.root)
+        self.assertEqual(layouts['/group/data']['access_pattern'], 'column')
+        self.assertTupleEqual(layouts['/group/data']['chunks'], (10000, 1))
+        self.assertEqual(layouts['/group/list']['access_pattern'], 'row')
+
+    def test_custom_type_key(self):
+        """Test that access patterns and spec dims are found with the type key of the namespace catalog"""
+        spec = CustomGroupSpec('a series', my_data_type_def='Series',
+                               datasets=[CustomDatasetSpec('the data', name='data', dtype='float64',
+                                                           dims=('channels', 'time'), shape=(None, None))])
+        spec_catalog = SpecCatalog()
+        spec_catalog.register_spec(spec, 'test.yaml')
+        namespace_catalog = NamespaceCatalog(CustomGroupSpec, CustomDatasetSpec, CustomSpecNamespace)
+        namespace_catalog.add_namespace('test', CustomSpecNamespace('a namespace', 'test', [{'source': 'test.yaml'}],
+                                                                    version='0.1.0', catalog=spec_catalog))
+        root = GroupBuilder('root', groups={
+            'series': GroupBuilder('series', attributes={'my_data_type': 'Series', 'namespace': 'test'},
+                                   datasets={'data': DatasetBuilder('data', np.zeros((384, 1000)))})
+        })
+        planner = H5LayoutPlanner(chunk_bytes=64 * 100 * 8, access_patterns={'Series': 'timeseries'})
+        layout = planner.plan(root, namespace_catalog)['/series/data']
+        self.assertEqual(layout['access_pattern'], 'timeseries')
+        self.assertTupleEqual(layout['dims'], ('channels', 'time'))
+        self.assertTupleEqual(layout['chunks'], (64, 100))
+
+    def test_no_compression(self):
+        planner = H5LayoutPlanner(compression=None)
+        self.assertDictEqual(planner.plan(self.root)['/group/data']['filters'], {})
+
+    def test_compound(self):
+        dtype = [DtypeSpec('a', 'int32 column', 'int32'), DtypeSpec('b', 'float64 column', 'float64')]
+        root = GroupBuilder('root', datasets={'table': DatasetBuilder('table', [(1, 2.0)] * 20000, dtype=dtype)})
+        self.assertDictEqual(H5LayoutPlanner(min_bytes=0).plan(root), {})
+
+    def test_get_io_settings(self):
+        layout = H5LayoutPlanner(chunk_bytes=80000).plan(self.root)['/group/data']
+        self.assertDictEqual(H5LayoutPlanner.get_io_settings(layout),
+                             {'chunks': (100, 100), 'compression': 'gzip', 'compression_opts': 4, 'shuffle': True})
+
+    def test_format_report(self):
+        report = H5LayoutPlanner(chunk_bytes=80000).format_report(H5LayoutPlanner(chunk_bytes=80000).plan(self.root))
+        lines = report.splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith('/group/data '))
+        self.assertIn('(100, 100)', lines[1])
+
+
+class TestHDF5IOLayoutPlanner(TestCase):
+
+    def setUp(self):
+        self.path = get_temp_filepath()
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_write(self):
+        data = np.arange(200000, dtype=np.int32).reshape(20000, 10)
+        root = GroupBuilder('root', datasets={'data': DatasetBuilder('data', data)})
+        planner = H5LayoutPlanner(chunk_bytes=4000)
+        with HDF5IO(self.path, mode='w', layout_planner=planner) as io:
+            io.write_builder(root)
+            self.assertIs(io.layout_planner, planner)
+            self.assertEqual(set(io.planned_layouts), {'/data'})
+        with File(self.path, 'r') as f:
+            np.testing.assert_array_equal(f['data'][:], data)
+            self.assertTupleEqual(f['data'].chunks, (100, 10))
+            self.assertEqual(f['data'].compression, 'gzip')
+            self.assertTrue(f['data'].shuffle)
+        # the builder is not changed
+        self.assertIs(root['data'].data, data)
+
+    def test_write_compound(self):
+        dtype = [DtypeSpec('a', 'int32 column', 'int32'), DtypeSpec('b', 'float64 column', 'float64')]
+        root = GroupBuilder('root', datasets={'table': DatasetBuilder('table', [(1, 2.0)] * 20000, dtype=dtype)})
+        with HDF5IO(self.path, mode='w', layout_planner=H5LayoutPlanner(min_bytes=0)) as io:
+            io.write_builder(root)
+            self.assertDictEqual(io.planned_layouts, {})
+        with File(self.path, 'r') as f:
+            self.assertTupleEqual(f['table'].shape, (20000, ))
+            self.assertTupleEqual(tuple(f['table'][0]), (1, 2.0))
@@ -1,33 +1,41 @@
 """Test module to validate that HDF5IO is working"""
+import json
 import os
+import pickle
 import unittest
+from unittest.mock import patch
 import warnings
 from io import BytesIO
 from pathlib import Path
 import shutil
 import tempfile
+import threading
 from glob import glob
 import zipfile
 
 import h5py
 import numpy as np
-from h5py import SoftLink, HardLink, ExternalLink, File
+from h5py import SoftLink, HardLink, ExternalLink, File, Dataset
 from h5py import filters as h5py_filters
 from hdmf.backends.hdf5 import H5DataIO
 from hdmf.backends.hdf5.h5tools import HDF5IO, SPEC_LOC_ATTR, H5PY_3
+from hdmf.backends.hdf5.h5_index import INDEX_VERSION, get_index_key
+from hdmf.backends.hdf5.h5_utils import HDF5IODataChunkIteratorQueue, H5DirectChunkWriter, H5MemmapDataset
 from hdmf.backends.io import HDMFIO
 from hdmf.backends.warnings import BrokenLinkWarning
 from hdmf.backends.errors import UnsupportedOperation
-from hdmf.build import GroupBuilder, DatasetBuilder, BuildManager, TypeMap, OrphanContainerBuildError, LinkBuilder
+from hdmf.build import (GroupBuilder, DatasetBuilder, BuildManager, TypeMap, OrphanContainerBuildError, LinkBuilder,
+                        LazyGroupBuilder, ReferenceBuilder)
 from hdmf.container import Container
 from hdmf import Data
 from hdmf.data_utils import DataChunkIterator, GenericDataChunkIterator, InvalidDataIOError
 from hdmf.spec.catalog import SpecCatalog
 from hdmf.spec.namespace import NamespaceCatalog, SpecNamespace
-from hdmf.spec.spec import GroupSpec
+from hdmf.spec.spec import BaseStorageSpec, GroupSpec
 from hdmf.testing import TestCase, remove_test_file
 from hdmf.common.resources import HERD
 from hdmf.term_set import TermSet, TermSetWrapper
+from hdmf.utils import StrDataset
 
 
 from tests.unit.helpers.utils import (Foo, FooBucket, FooFile, get_foo_buildmanager,
@@ -1180,6 +1188,45 @@ class TestMultiWrite(TestCase):
             read_foofile = io.read()
             self.assertContainerEqual(read_foofile, self.foofile)
 
+    def test_append_skips_unchanged(self):
+        """Test that appending to a file does not traverse the groups of the containers that were not modified."""
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='w') as io:
+            io.write(self.foofile)
+
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='a') as io:
+            read_foofile = io.read()
+            read_foofile.add_bucket(FooBucket('bucket2', [Foo('foo3', [10, 20], "I am foo3", 2, 0.1)]))
+            with self.assertLogs(io.logger, level='DEBUG') as logs:
+                io.write(read_foofile)
+        self.assertIn("DEBUG:%s:    GroupBuilder 'bucket1' is unchanged" % io.logger.name, logs.output)
+        self.assertFalse(any("'foo_holder'" in line for line in logs.output if 'bucket1' in line))
+
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r') as io:
+            read_foofile = io.read()
+            self.assertContainerEqual(read_foofile.buckets['bucket1'], self.foofile.buckets['bucket1'],
+                                      ignore_hdmf_attrs=True)
+            self.assertEqual(read_foofile.buckets['bucket2'].foos['foo3'].my_data[:].tolist(), [10, 20])
+
+    def test_append_skips_unchanged_custom_type_key(self):
+        """Test that appending skips unchanged groups when the spec classes use a type key other than data_type."""
+        with patch.object(BaseStorageSpec, 'type_key', classmethod(lambda cls: 'my_data_type')):
+            with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='w') as io:
+                io.write(self.foofile)
+            with File(self.path, 'r') as f:
+                self.assertEqual(f['buckets/bucket1'].attrs['my_data_type'], 'FooBucket')
+                self.assertNotIn('data_type', f['buckets/bucket1'].attrs)
+
+            with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='a') as io:
+                read_foofile = io.read()
+                read_foofile.add_bucket(FooBucket('bucket2', [Foo('foo3', [10, 20], "I am foo3", 2, 0.1)]))
+                with self.assertLogs(io.logger, level='DEBUG') as logs:
+                    io.write(read_foofile)
+            self.assertIn("DEBUG:%s:    GroupBuilder 'bucket1' is unchanged" % io.logger.name, logs.output)
+
+            with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r') as io:
+                read_foofile = io.read()
+                self.assertEqual(read_foofile.buckets['bucket2'].foos['foo3'].my_data[:].tolist(), [10, 20])
+
     def test_write_add_write(self):
         """Test writing a container, adding to the in-memory container, then overwriting the same file."""
         manager = get_foo_buildmanager()
@@ -1940,6 +1987,813 @@ class TestReadLink(TestCase):
                 self.assertDictEqual(bldr.links, {})
 
 
+class TestLazyRead(TestCase):
+
+    def setUp(self):
+        self.path = get_temp_filepath()
+        foo1 = Foo('foo1', [1, 2, 3, 4, 5], "I am foo1", 17, 3.14)
+        foo2 = Foo('foo2', [6, 7, 8], "I am foo2", 34, 6.28)
+        foobucket = FooBucket('bucket1', [foo1, foo2])
+        self.foofile = FooFile(buckets=[foobucket], foo_link=foo1, foo_ref_attr=foo2)
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='w') as write_io:
+            write_io.write(self.foofile)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_read_builder_not_loaded(self):
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r', lazy=True) as read_io:
+            self.assertTrue(read_io.lazy)
+            root = read_io.read_builder()
+            self.assertIsInstance(root, LazyGroupBuilder)
+            self.assertFalse(root.loaded)
+            bucket = root.groups['buckets'].groups['bucket1']
+            self.assertTrue(root.loaded)
+            self.assertFalse(bucket.loaded)
+            self.assertIs(read_io.read_builder(), root)
+
+    def test_read_builder_equal(self):
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r') as read_io:
+            eager_root = read_io.read_builder()
+            with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r', lazy=True) as lazy_io:
+                lazy_root = lazy_io.read_builder()
+                self.assertEqual(lazy_root.attributes.keys(), eager_root.attributes.keys())
+                self.assertEqual(lazy_root.links.keys(), eager_root.links.keys())
+                foo1 = lazy_root['buckets/bucket1/foo_holder/foo1']
+                self.assertEqual(foo1.attributes, eager_root['buckets/bucket1/foo_holder/foo1'].attributes)
+                self.assertEqual(foo1.location, '/buckets/bucket1/foo_holder')
+
+    def test_read(self):
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r', lazy=True) as read_io:
+            read_foofile = read_io.read()
+            self.assertContainerEqual(read_foofile, self.foofile, ignore_hdmf_attrs=True)
+            bucket = read_foofile.buckets['bucket1']
+            self.assertIs(read_foofile.foo_link, bucket.foos['foo1'])
+            self.assertIs(read_foofile.foo_ref_attr, bucket.foos['foo2'])
+            self.assertIs(bucket.foos['foo1'].parent, bucket)
+
+    def test_get_builder(self):
+        """Test that get_builder loads the groups on the path to an object that has not been read yet."""
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r', lazy=True) as read_io:
+            root = read_io.read_builder()
+            builder = read_io.get_builder(read_io._file['buckets/bucket1/foo_holder/foo1'])
+            self.assertIs(builder, root['buckets/bucket1/foo_holder/foo1'])
+            self.assertIs(builder.parent, root['buckets/bucket1/foo_holder'])
+
+
+class TestLazyConstruct(TestCase):
+
+    def setUp(self):
+        self.path = get_temp_filepath()
+        foo1 = Foo('foo1', [1, 2, 3, 4, 5], "I am foo1", 17, 3.14)
+        foo2 = Foo('foo2', [6, 7, 8], "I am foo2", 34, 6.28)
+        foobucket = FooBucket('bucket1', [foo1, foo2])
+        self.foofile = FooFile(buckets=[foobucket], foo_link=foo1, foo_ref_attr=foo2)
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='w') as write_io:
+            write_io.write(self.foofile)
+        self.paths = [self.path]
+
+    def tearDown(self):
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_read(self):
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r') as read_io:
+            read_foofile = read_io.read(lazy=True)
+            self.assertContainerEqual(read_foofile, self.foofile, ignore_hdmf_attrs=True)
+
+    def test_children_not_initialized(self):
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r') as read_io:
+            read_foofile = read_io.read(lazy=True)
+            bucket = read_foofile.buckets['bucket1']
+            self.assertIsNot(type(bucket), FooBucket)
+            self.assertIsInstance(bucket, FooBucket)
+            self.assertIs(bucket.__class__, FooBucket)
+            self.assertEqual(bucket.name, 'bucket1')
+            self.assertIs(bucket.parent, read_foofile)
+            self.assertIsNot(type(bucket), FooBucket)
+            foo1 = bucket.foos['foo1']
+            self.assertIs(type(bucket), FooBucket)
+            self.assertIsNot(type(foo1), Foo)
+            self.assertEqual(foo1.my_data[:].tolist(), [1, 2, 3, 4, 5])
+            self.assertIs(type(foo1), Foo)
+
+    def test_links_and_references(self):
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r') as read_io:
+            read_foofile = read_io.read(lazy=True)
+            foo1 = read_foofile.foo_link
+            foo2 = read_foofile.foo_ref_attr
+            bucket = read_foofile.buckets['bucket1']
+            self.assertIs(foo1.parent, bucket)
+            self.assertIs(bucket.foos['foo1'], foo1)
+            self.assertIs(bucket.foos['foo2'], foo2)
+
+    def test_not_modified(self):
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r') as read_io:
+            read_foofile = read_io.read(lazy=True)
+            foo1 = read_foofile.buckets['bucket1'].foos['foo1']
+            self.assertEqual(foo1.attr1, 'I am foo1')
+            self.assertFalse(foo1.modified)
+            self.assertFalse(read_foofile.buckets['bucket1'].modified)
+            self.assertFalse(read_foofile.modified)
+
+    def test_export(self):
+        """Test that exporting a lazily constructed container writes all of its children."""
+        export_path = get_temp_filepath()
+        self.paths.append(export_path)
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r') as read_io:
+            read_foofile = read_io.read(lazy=True)
+            with HDF5IO(export_path, mode='w') as export_io:
+                export_io.export(src_io=read_io, container=read_foofile)
+
+        with HDF5IO(export_path, manager=get_foo_buildmanager(), mode='r') as read_io:
+            self.assertContainerEqual(read_io.read(), self.foofile, ignore_hdmf_attrs=True)
+
+
+class TestDataChunkIteratorQueuePrefetch(TestCase):
+
+    class MockDatasetId:
+
+        def extend(self, shape):
+            pass
+
+    class MockDataset:
+        """A stand-in for an h5py.Dataset that records the number of chunks that were read when each chunk is written"""
+
+        def __init__(self, dcis, name='/test_dataset'):
+            self.name = name
+            self.id = TestDataChunkIteratorQueuePrefetch.MockDatasetId()
+            self.dcis = dcis
+            self.read_ahead = list()
+            self.written = 0
+
+        def __setitem__(self, selection, data):
+            self.written += 1
+            read = sum(dci.chunk_index for dci in self.dcis)
+            self.read_ahead.append(read - self.written)
+
+    def setUp(self):
+        self.path = get_temp_filepath()
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_bad_args(self):
+        with self.assertRaisesWith(ValueError, "prefetch must be a non-negative integer, got -1"):
+            HDF5IODataChunkIteratorQueue(prefetch=-1)
+        with self.assertRaisesWith(ValueError, "prefetch_bytes must be a positive integer, got 0"):
+            HDF5IODataChunkIteratorQueue(prefetch=1, prefetch_bytes=0)
+        with self.assertRaisesWith(ValueError, "read_workers must be a positive integer, got 0"):
+            HDF5IODataChunkIteratorQueue(prefetch=1, read_workers=0)
+
+    def test_exhaust_queue(self):
+        data1 = np.arange(100).reshape(50, 2)
+        data2 = np.arange(30)
+        with h5py.File(self.path, 'w') as f:
+            dset1 = f.create_dataset('dset1', shape=(0, 2), maxshape=(None, 2), dtype=int)
+            dset2 = f.create_dataset('dset2', shape=(0, ), maxshape=(None, ), dtype=int)
+            queue = HDF5IODataChunkIteratorQueue(prefetch=3)
+            queue.append(dset1, DataChunkIterator(data=data1, buffer_size=4))
+            queue.append(dset2, DataChunkIterator(data=data2, buffer_size=7))
+            queue.exhaust_queue()
+            self.assertEqual(len(queue), 0)
+            np.testing.assert_array_equal(dset1[:], data1)
+            np.testing.assert_array_equal(dset2[:], data2)
+
+    def test_read_ahead_bounded_by_prefetch(self):
+        dci = DataChunkIterator(data=np.arange(100), buffer_size=1)
+        dset = self.MockDataset([dci])
+        queue = HDF5IODataChunkIteratorQueue(prefetch=2)
+        queue.append(dset, dci)
+        queue.exhaust_queue()
+        self.assertEqual(dset.written, 100)
+        # the chunk being written, the prefetched chunks, and a chunk waiting to be added to the prefetched chunks
+        self.assertLessEqual(max(dset.read_ahead), 2 + 2)
+
+    def test_read_ahead_bounded_by_prefetch_bytes(self):
+        dci = DataChunkIterator(data=np.arange(100, dtype=np.int64), buffer_size=1)
+        dset = self.MockDataset([dci])
+        queue = HDF5IODataChunkIteratorQueue(prefetch=50, prefetch_bytes=8)
+        queue.append(dset, dci)
+        queue.exhaust_queue()
+        self.assertEqual(dset.written, 100)
+        self.assertLessEqual(max(dset.read_ahead), 1 + 2)
+
+    def test_read_error(self):
+        class BadDataChunkIterator(DataChunkIterator):
+            def __next__(self):
+                if self.chunk_index == 3:
+                    raise ValueError("bad chunk")
+                return super().__next__()
+
+        dci = BadDataChunkIterator(data=np.arange(10), buffer_size=1)
+        dset = self.MockDataset([dci])
+        queue = HDF5IODataChunkIteratorQueue(prefetch=2)
+        queue.append(dset, dci)
+        with self.assertRaisesWith(ValueError, "bad chunk"):
+            queue.exhaust_queue()
+        self.assertEqual(dset.written, 3)
+
+    def test_write_error(self):
+        class BadDataset(self.MockDataset):
+            def __setitem__(self, selection, data):
+                super().__setitem__(selection, data)
+                if self.written == 3:
+                    raise ValueError("bad write")
+
+        dci = DataChunkIterator(data=np.arange(100), buffer_size=1)
+        dset = BadDataset([dci])
+        queue = HDF5IODataChunkIteratorQueue(prefetch=2)
+        queue.append(dset, dci)
+        with self.assertRaisesWith(ValueError, "bad write"):
+            queue.exhaust_queue()
+        # reading stops soon after the write fails
+        self.assertLessEqual(dci.chunk_index, 3 + 2 + 1)
+
+    def test_read_workers(self):
+        """Test that different DataChunkIterators are read at the same time."""
+        barrier = threading.Barrier(3, timeout=10)
+
+        class BarrierDataChunkIterator(DataChunkIterator):
+            def __next__(self):
+                if self.chunk_index == 0:
+                    barrier.wait()  # raises BrokenBarrierError unless all three iterators are read concurrently
+                return super().__next__()
+
+        data = [np.arange(i * 100, (i + 1) * 100) for i in range(3)]
+        with h5py.File(self.path, 'w') as f:
+            queue = HDF5IODataChunkIteratorQueue(prefetch=4, read_workers=3)
+            for i in range(3):
+                dset = f.create_dataset('dset%d' % i, shape=(0, ), maxshape=(None, ), dtype=int)
+                queue.append(dset, BarrierDataChunkIterator(data=data[i], buffer_size=7))
+            queue.exhaust_queue()
+            for i in range(3):
+                np.testing.assert_array_equal(f['dset%d' % i][:], data[i])
+            self.assertEqual(set(queue.stats), {'/dset0', '/dset1', '/dset2'})
+            self.assertEqual(queue.stats['/dset0']['chunks'], 15)
+            self.assertEqual(queue.stats['/dset0']['bytes'], data[0].nbytes)
+
+    def test_stats(self):
+        data = np.arange(100)
+        with HDF5IO(self.path, mode='w') as io:
+            io.write_dataset(io._file, DatasetBuilder('test_dataset', DataChunkIterator(data=data, buffer_size=10)))
+            stats = io.dci_stats['/test_dataset']
+        self.assertEqual(stats['chunks'], 10)
+        self.assertEqual(stats['bytes'], data.nbytes)
+        self.assertGreater(stats['read_time'], 0)
+        self.assertGreater(stats['write_time'], 0)
+
+    def test_write_with_prefetch(self):
+        data = np.arange(100).reshape(50, 2)
+        with HDF5IO(self.path, mode='w', dci_prefetch=4) as io:
+            io.write_dataset(io._file, DatasetBuilder('test_dataset', DataChunkIterator(data=data, buffer_size=3)))
+            np.testing.assert_array_equal(io._file['test_dataset'][:], data)
+
+
+class TestH5DirectChunkWriter(TestCase):
+
+    def setUp(self):
+        self.path = get_temp_filepath()
+        self.f = h5py.File(self.path, 'w')
+
+    def tearDown(self):
+        self.f.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def write(self, dset, dci):
+        """Write the DataChunks with the H5DirectChunkWriter, or with regular writes if it does not support them"""
+        written = list()
+        with H5DirectChunkWriter(max_workers=2) as writer:
+            for chunk in dci:
+                written.append(writer.write(dset, chunk))
+                if not written[-1]:
+                    HDF5IODataChunkIteratorQueue._write_data_chunk(dset, chunk)
+        return written
+
+    def test_get_filters(self):
+        self.assertEqual(len(H5DirectChunkWriter.get_filters(
+            self.f.create_dataset('gzip', shape=(10, ), chunks=(2, ), compression='gzip'))), 1)
+        self.assertEqual(len(H5DirectChunkWriter.get_filters(
+            self.f.create_dataset('shuffle', shape=(10, ), chunks=(2, ), compression='gzip', shuffle=True))), 2)
+        self.assertIsNone(H5DirectChunkWriter.get_filters(
+            self.f.create_dataset('none', shape=(10, ), chunks=(2, ))))
+        self.assertIsNone(H5DirectChunkWriter.get_filters(
+            self.f.create_dataset('lzf', shape=(10, ), chunks=(2, ), compression='lzf')))
+        self.assertIsNone(H5DirectChunkWriter.get_filters(
+            self.f.create_dataset('fletcher32', shape=(10, ), chunks=(2, ), compression='gzip', fletcher32=True)))
+        self.assertIsNone(H5DirectChunkWriter.get_filters(
+            self.f.create_dataset('str', shape=(10, ), chunks=(2, ), compression='gzip', dtype=h5py.string_dtype())))
+
+    def test_write_aligned(self):
+        data = np.arange(1000, dtype='>i4').reshape(100, 10)
+        dset = self.f.create_dataset('test_dataset', shape=(0, 10), maxshape=(None, 10), chunks=(5, 5), dtype='>i4',
+                                     compression='gzip', compression_opts=9, shuffle=True)
+        self.assertTrue(all(self.write(dset, DataChunkIterator(data=data, buffer_size=10))))
+        np.testing.assert_array_equal(dset[:], data)
+        self.assertEqual(dset.id.get_num_chunks(), 40)
+
+    def test_write_unaligned(self):
+        """Test that the parts of the DataChunks that do not cover whole chunks are written with regular writes."""
+        data = np.random.rand(47, 9)
+        dset = self.f.create_dataset('test_dataset', shape=(0, 9), maxshape=(None, 9), chunks=(4, 4), dtype='f8',
+                                     compression='gzip')
+        self.assertEqual(self.write(dset, DataChunkIterator(data=data, buffer_size=9)), [True] * 5 + [False])
+        np.testing.assert_array_equal(dset[:], data)
+
+    def test_write_unsupported(self):
+        data = np.arange(20)
+        dset = self.f.create_dataset('test_dataset', shape=(0, ), maxshape=(None, ), chunks=(5, ),
+                                     compression='lzf')
+        self.assertEqual(self.write(dset, DataChunkIterator(data=data, buffer_size=10)), [False, False])
+        np.testing.assert_array_equal(dset[:], data)
+
+    def test_write_with_hdf5io(self):
+        data = np.random.rand(100, 30)
+        dci = NumpyArrayGenericDataChunkIterator(data, chunk_shape=(10, 30), buffer_shape=(40, 30),
+                                                 display_progress=False)
+        self.f.close()
+        with HDF5IO(self.path, mode='w', dci_compression_workers=2, dci_prefetch=2) as io:
+            dataio = H5DataIO(dci, compression='gzip', shuffle=True)
+            io.write_dataset(io._file, DatasetBuilder('test_dataset', dataio, dtype='float64'))
+        with h5py.File(self.path, 'r') as f:
+            np.testing.assert_array_equal(f['test_dataset'][:], data)
+            self.assertEqual(f['test_dataset'].chunks, (10, 30))
+
+
+class TestHDF5IOSWMR(TestCase):
+
+    def setUp(self):
+        self.path = get_temp_filepath()
+        self.data = np.arange(20, dtype='f8').reshape(10, 2)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def get_builder(self):
+        dci = DataChunkIterator(data=self.data, buffer_size=2, maxshape=(None, 2))
+        return GroupBuilder('root', datasets={'data': DatasetBuilder('data', dci)},
+                            groups={'group': GroupBuilder('group', attributes={'attr': 1})})
+
+    def test_bad_args(self):
+        with self.assertRaisesWith(ValueError, "flush_interval must be a non-negative number or None, got -1"):
+            HDF5IODataChunkIteratorQueue(flush_interval=-1)
+
+    def test_write(self):
+        with HDF5IO(self.path, mode='w', swmr=True) as io:
+            self.assertTrue(io.swmr)
+            io.write_builder(self.get_builder())
+            self.assertTrue(io._file.swmr_mode)
+            with self.assertRaisesWith(UnsupportedOperation,
+                                       "Cannot write to file %s after SWMR mode was enabled." % self.path):
+                io.write_builder(GroupBuilder('root'))
+        with File(self.path, 'r') as f:
+            np.testing.assert_array_equal(f['data'][:], self.data)
+            self.assertTupleEqual(f['data'].maxshape, (None, 2))
+            self.assertEqual(f['group'].attrs['attr'], 1)
+
+    def test_write_flush(self):
+        """Test that the file is flushed after each DataChunk with a flush interval of 0"""
+        with patch.object(File, 'flush', autospec=True) as flush:
+            with HDF5IO(self.path, mode='w', swmr=True, dci_flush_interval=0) as io:
+                io.write_builder(self.get_builder())
+        # once before SWMR mode is enabled, once for each of the 5 DataChunks, and once when the queue is exhausted
+        self.assertEqual(flush.call_count, 7)
+
+    def test_write_container(self):
+        """Test that the spec is cached before SWMR mode is enabled"""
+        foofile = FooFile(buckets=[FooBucket('bucket1', [Foo('foo1', [1, 2, 3], "I am foo1", 17, 3.14)])])
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='w', swmr=True) as io:
+            io.write(foofile)
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r') as io:
+            read_foofile = io.read()
+            self.assertListEqual(read_foofile.buckets['bucket1'].foos['foo1'].my_data[:].tolist(), [1, 2, 3])
+        with File(self.path, 'r') as f:
+            self.assertIn(SPEC_LOC_ATTR, f.attrs)
+
+    def test_read_refresh(self):
+        with HDF5IO(self.path, mode='w', swmr=True) as io:
+            io.write_builder(self.get_builder())
+        with HDF5IO(self.path, mode='r', swmr=True) as io:
+            self.assertTrue(io._file.swmr_mode)
+            builder = io.read_builder()
+            io.refresh()
+            np.testing.assert_array_equal(builder['data'].data[:], self.data)
+
+    def test_refresh_not_swmr(self):
+        with HDF5IO(self.path, mode='w') as io:
+            io.write_builder(self.get_builder())
+            msg = "Cannot refresh file %s in mode 'w' with swmr=False. Please use mode 'r' with swmr=True." % self.path
+            with self.assertRaisesWith(UnsupportedOperation, msg):
+                io.refresh()
+
+    def test_export(self):
+        with HDF5IO(self.path, mode='w', swmr=True) as io:
+            with self.assertRaisesWith(UnsupportedOperation, "Cannot export to file %s in SWMR mode." % self.path):
+                io.export(src_io=io)
+
+
+class TestHDF5IOReadAttributes(TestCase):
+
+    def setUp(self):
+        self.path = get_temp_filepath()
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_read_attrs(self):
+        with File(self.path, 'w') as f:
+            group = f.create_group('group')
+            f.attrs['text'] = 'text'
+            f.attrs['bytes'] = np.bytes_(b'bytes')
+            f.attrs['text_array'] = np.array(['a', 'b'], dtype=h5py.string_dtype())
+            f.attrs['int'] = 1
+            f.attrs['float_array'] = [1.0, 2.0]
+            f.attrs['ref'] = group.ref
+            f.attrs['empty'] = h5py.Empty('f8')
+        with HDF5IO(self.path, mode='r') as io:
+            builder = io.read_builder()
+            attrs = builder.attributes
+            self.assertEqual(attrs['text'], 'text')
+            self.assertEqual(attrs['bytes'], 'bytes')
+            self.assertEqual(attrs['text_array'].tolist(), ['a', 'b'])
+            self.assertEqual(attrs['int'], 1)
+            self.assertEqual(attrs['float_array'].tolist(), [1.0, 2.0])
+            self.assertIs(attrs['ref'], builder['group'])
+            self.assertIsInstance(attrs['empty'], h5py.Empty)
+
+    def test_read_attrs_creation_order(self):
+        """Test that attributes are read in creation order if it is tracked, like with h5py"""
+        with File(self.path, 'w', track_order=True) as f:
+            f.attrs['b'] = 1
+            f.attrs['a'] = 2
+        with HDF5IO(self.path, mode='r') as io:
+            self.assertListEqual(list(io.read_builder().attributes), ['b', 'a'])
+
+
+class TestHDF5IOIndex(TestCase):
+
+    def setUp(self):
+        self.path = get_temp_filepath()
+        self.index_path = self.path + '.index'
+        self.ext_path = get_temp_filepath()
+        with File(self.ext_path, 'w') as f:
+            f.create_dataset('ext_data', data=[4, 5])
+        group = GroupBuilder('group', attributes={'attr': 1}, datasets={'data': DatasetBuilder('data', [1, 2, 3])})
+        ref = ReferenceBuilder(group)
+        root = GroupBuilder('root', attributes={'ref_attr': ref}, groups={'group': group},
+                            datasets={'text': DatasetBuilder('text', ['a', 'b'], dtype='text'),
+                                      'scalar': DatasetBuilder('scalar', 5),
+                                      'refs': DatasetBuilder('refs', [ref], dtype='object'),
+                                      'table': DatasetBuilder('table', [(1, ref)],
+                                                              dtype=[{'name': 'x', 'dtype': 'int'},
+                                                                     {'name': 'ref', 'dtype': 'object'}])},
+                            links={'link': LinkBuilder(group['data'], 'link')})
+        with HDF5IO(self.path, mode='w') as io:
+            io.write_builder(root)
+        with File(self.path, 'a') as f:
+            f['ext_link'] = ExternalLink(self.ext_path, '/ext_data')
+
+    def tearDown(self):
+        for path in (self.path, self.index_path, self.ext_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def read(self, **kwargs):
+        """Read the builder tree with the index and check the builders that are read"""
+        with HDF5IO(self.path, mode='r', index_path=self.index_path, **kwargs) as io:
+            builder = io.read_builder()
+            group = builder['group']
+            self.assertEqual(group.attributes['attr'], 1)
+            self.assertEqual(group.location, '/')
+            self.assertEqual(group['data'].location, '/group')
+            self.assertListEqual(group['data'].data[:].tolist(), [1, 2, 3])
+            self.assertIs(builder.attributes['ref_attr'], group)
+            self.assertListEqual(builder['text'].data[:].tolist(), ['a', 'b'])
+            self.assertEqual(builder['scalar'].data, 5)
+            self.assertIs(builder['refs'].data[0], group)
+            self.assertIs(builder['table'].data[0][1], group)
+            self.assertIs(builder.links['link'].builder, group['data'])
+            self.assertListEqual(builder.links['ext_link'].builder.data[:].tolist(), [4, 5])
+            self.assertIs(io.get_builder(io._file['group']), group)
+            self.assertTrue(io.get_written(group))
+        return builder
+
+    def test_bad_mode(self):
+        with self.assertRaisesWith(ValueError, "index_path can only be used in mode 'r', got mode 'a'"):
+            HDF5IO(self.path, mode='a', index_path=self.index_path)
+
+    def test_read_index(self):
+        self.read()
+        self.assertTrue(os.path.exists(self.index_path))
+        with self.assertLogs('hdmf.backends.hdf5.h5tools.HDF5IO', level='DEBUG') as logs:
+            self.read()
+        self.assertIn("Reading builder tree of file %s from index %s" % (self.path, self.index_path),
+                      logs.output[0])
+
+    def test_read_index_lazy(self):
+        self.read(lazy=True)
+        self.read(lazy=True)
+
+    def test_index_is_json(self):
+        self.read()
+        with open(self.index_path, 'r') as f:
+            index = json.load(f)
+        self.assertEqual(index['version'], INDEX_VERSION)
+
+    def test_pickled_index_not_loaded(self):
+        """Test that an index file that is not JSON, e.g., a pickle, is not loaded and is replaced"""
+        with open(self.index_path, 'wb') as f:
+            pickle.dump((1, get_index_key(self.path), ('g', 'root', {}, [])), f)
+        self.read()
+        with open(self.index_path, 'r') as f:
+            self.assertEqual(json.load(f)['version'], INDEX_VERSION)
+
+    def test_attribute_types(self):
+        """Test that the types of attribute values read from the index are the types read from the file"""
+        with File(self.path, 'a') as f:
+            f['group'].attrs['int32'] = np.int32(3)
+            f['group'].attrs['array'] = np.array([[1.5, 2.0]])
+            f['group'].attrs['strings'] = np.array(['a', 'b'], dtype=h5py.string_dtype())
+            f['group'].attrs['bool'] = np.bool_(True)
+        with HDF5IO(self.path, mode='r') as io:
+            expected = dict(io.read_builder()['group'].attributes)
+        self.read()
+        attributes = self.read()['group'].attributes
+        self.assertEqual(attributes.keys(), expected.keys())
+        for key, value in expected.items():
+            self.assertIs(type(attributes[key]), type(value))
+            if isinstance(value, np.ndarray):
+                self.assertEqual(attributes[key].dtype, value.dtype)
+                self.assertListEqual(attributes[key].tolist(), value.tolist())
+            else:
+                self.assertEqual(attributes[key], value)
+
+    def test_stale_index(self):
+        self.read()
+        with File(self.path, 'a') as f:
+            f['group'].attrs['attr'] = 2
+            f.create_dataset('new_data', data=[1])
+        os.utime(self.path, ns=(0, 0))  # make sure the modification time changes
+        with HDF5IO(self.path, mode='r', index_path=self.index_path) as io:
+            builder = io.read_builder()
+            self.assertEqual(builder['group'].attributes['attr'], 2)
+            self.assertIn('new_data', builder)
+        with HDF5IO(self.path, mode='r', index_path=self.index_path) as io:
+            self.assertIn('new_data', io.read_builder())
+
+    def test_read_container(self):
+        foofile = FooFile(buckets=[FooBucket('bucket1', [Foo('foo1', [1, 2, 3], "I am foo1", 17, 3.14)])])
+        foofile.foo_link = foofile.buckets['bucket1'].foos['foo1']
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='w') as io:
+            io.write(foofile)
+        for _ in range(2):
+            with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r', index_path=self.index_path) as io:
+                read_foofile = io.read()
+                self.assertContainerEqual(foofile, read_foofile, ignore_hdmf_attrs=True)
+                self.assertIs(read_foofile.foo_link, read_foofile.buckets['bucket1'].foos['foo1'])
+
+
+class TestHDF5IOMemmap(TestCase):
+
+    def setUp(self):
+        self.path = get_temp_filepath()
+        self.data = np.arange(20, dtype='>f4').reshape(10, 2)
+        with File(self.path, 'w', userblock_size=512) as f:
+            f.create_dataset('contiguous', data=self.data)
+            f.create_dataset('chunked', data=self.data, chunks=(5, 2))
+            f.create_dataset('compressed', data=self.data, compression='gzip')
+            f.create_dataset('empty', shape=(0, ), dtype='i4')
+            f.create_dataset('text', data=['a', 'b'], dtype=h5py.string_dtype())
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_bad_args(self):
+        msg = "memmap can only be used in mode 'r' without SWMR mode"
+        with self.assertRaisesWith(ValueError, msg):
+            HDF5IO(self.path, mode='a', memmap=True)
+        with self.assertRaisesWith(ValueError, msg):
+            HDF5IO(self.path, mode='r', memmap=True, swmr=True)
+
+    def test_read(self):
+        with HDF5IO(self.path, mode='r', memmap=True) as io:
+            self.assertTrue(io.memmap)
+            builder = io.read_builder()
+            data = builder['contiguous'].data
+            self.assertIsInstance(data, H5MemmapDataset)
+            self.assertIsInstance(data.dataset, Dataset)
+            self.assertIsInstance(data.memmap, np.memmap)
+            self.assertFalse(data.memmap.flags.writeable)
+            np.testing.assert_array_equal(data, self.data)
+            self.assertIsInstance(data[2:4], np.memmap)
+            np.testing.assert_array_equal(data[2:4], self.data[2:4])
+            self.assertEqual(builder['contiguous'].dtype, np.dtype('>f4'))
+            for name in ('chunked', 'compressed', 'empty'):
+                self.assertIsInstance(builder[name].data, Dataset)
+            self.assertIsInstance(builder['text'].data, StrDataset)
+
+    def test_read_not_enabled(self):
+        with HDF5IO(self.path, mode='r') as io:
+            self.assertIsInstance(io.read_builder()['contiguous'].data, Dataset)
+
+    def test_read_index(self):
+        index_path = self.path + '.index'
+        try:
+            for _ in range(2):
+                with HDF5IO(self.path, mode='r', memmap=True, index_path=index_path) as io:
+                    data = io.read_builder()['contiguous'].data
+                    self.assertIsInstance(data, H5MemmapDataset)
+                    np.testing.assert_array_equal(data, self.data)
+        finally:
+            os.remove(index_path)
+
+    def test_read_container(self):
+        foofile = FooFile(buckets=[FooBucket('bucket1', [Foo('foo1', [1, 2, 3], "I am foo1", 17, 3.14)])])
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='w') as io:
+            io.write(foofile)
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r', memmap=True) as io:
+            my_data = io.read().buckets['bucket1'].foos['foo1'].my_data
+            self.assertIsInstance(my_data, H5MemmapDataset)
+            self.assertListEqual(my_data[[0, 2]].tolist(), [1, 3])
+
+    def test_write_link(self):
+        """Test that writing a memory-mapped dataset to another file links to the dataset."""
+        foofile = FooFile(buckets=[FooBucket('bucket1', [Foo('foo1', [1, 2, 3], "I am foo1", 17, 3.14)])])
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='w') as io:
+            io.write(foofile)
+        link_path = get_temp_filepath()
+        try:
+            manager = get_foo_buildmanager()
+            with HDF5IO(self.path, manager=manager, mode='r', memmap=True) as read_io:
+                read_foo = read_io.read().buckets['bucket1'].foos['foo1']
+                self.assertIsInstance(read_foo.my_data, H5MemmapDataset)
+                foofile2 = FooFile(buckets=[FooBucket('bucket2', [Foo('foo2', read_foo.my_data, "I am foo2", 1, 1.)])])
+                with HDF5IO(link_path, manager=manager, mode='w') as write_io:
+                    write_io.write(foofile2)
+            with File(link_path, 'r') as f:
+                link = f.get('buckets/bucket2/foo_holder/foo2/my_data', getlink=True)
+                self.assertIsInstance(link, ExternalLink)
+                self.assertEqual(link.path, '/buckets/bucket1/foo_holder/foo1/my_data')
+                self.assertListEqual(f['buckets/bucket2/foo_holder/foo2/my_data'][:].tolist(), [1, 2, 3])
+        finally:
+            if os.path.exists(link_path):
+                os.remove(link_path)
+
+    def test_export_link(self):
+        """Test that exporting a file with a memory-mapped dataset of another file links to the dataset."""
+        foofile = FooFile(buckets=[FooBucket('bucket1', [Foo('foo1', [1, 2, 3], "I am foo1", 17, 3.14)])])
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='w') as io:
+            io.write(foofile)
+        src_path = get_temp_filepath()
+        export_path = get_temp_filepath()
+        try:
+            with HDF5IO(src_path, manager=get_foo_buildmanager(), mode='w') as io:
+                io.write(FooFile(buckets=[FooBucket('bucket2', [Foo('foo2', [4, 5], "I am foo2", 34, 6.28)])]))
+            manager = get_foo_buildmanager()
+            with HDF5IO(self.path, manager=manager, mode='r', memmap=True) as read_io:
+                read_foo = read_io.read().buckets['bucket1'].foos['foo1']
+                with HDF5IO(src_path, manager=manager, mode='r') as src_io:
+                    src_foofile = src_io.read()
+                    src_foofile.add_bucket(FooBucket('bucket3', [Foo('foo3', read_foo.my_data, "I am foo3", 1, 1.)]))
+                    with HDF5IO(export_path, mode='w') as export_io:
+                        export_io.export(src_io=src_io, container=src_foofile)
+            with File(export_path, 'r') as f:
+                link = f.get('buckets/bucket3/foo_holder/foo3/my_data', getlink=True)
+                self.assertIsInstance(link, ExternalLink)
+                self.assertEqual(link.path, '/buckets/bucket1/foo_holder/foo1/my_data')
+                self.assertListEqual(f['buckets/bucket3/foo_holder/foo3/my_data'][:].tolist(), [1, 2, 3])
+                self.assertListEqual(f['buckets/bucket2/foo_holder/foo2/my_data'][:].tolist(), [4, 5])
+        finally:
+            for path in (src_path, export_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+class TestHDF5IOReadReferences(TestCase):
+
+    def setUp(self):
+        self.path = get_temp_filepath()
+        targets = [GroupBuilder('target%d' % i) for i in range(3)]
+        refs = [ReferenceBuilder(targets[i % 3]) for i in range(10)]
+        root = GroupBuilder('root', groups={t.name: t for t in targets}, datasets={
+            'refs': DatasetBuilder('refs', refs, dtype='object'),
+            'table': DatasetBuilder('table', [(i, ref, 'a%d' % i) for i, ref in enumerate(refs)],
+                                    dtype=[{'name': 'x', 'dtype': 'int'}, {'name': 'ref', 'dtype': 'object'},
+                                           {'name': 's', 'dtype': 'text'}])})
+        with HDF5IO(self.path, mode='w') as io:
+            io.write_builder(root)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_read_refs(self):
+        with HDF5IO(self.path, mode='r') as io:
+            builder = io.read_builder()
+            with patch.object(HDF5IO, 'get_builder', autospec=True, side_effect=HDF5IO.get_builder) as get_builder:
+                refs = builder['refs'].data[2:8]
+                # each distinct referenced object is resolved once
+                self.assertEqual(get_builder.call_count, 3)
+                self.assertListEqual(refs, [builder['target%d' % (i % 3)] for i in range(2, 8)])
+                builder['refs'].data[:]
+                builder['table'].data[:]
+                # the resolved references are cached for the file
+                self.assertEqual(get_builder.call_count, 3)
+            self.assertIs(builder['refs'].data[4], builder['target1'])
+
+    def test_read_table(self):
+        with HDF5IO(self.path, mode='r') as io:
+            builder = io.read_builder()
+            rows = builder['table'].data[[1, 3]]
+            self.assertListEqual(rows['x'].tolist(), [1, 3])
+            self.assertIs(rows[0]['ref'], builder['target1'])
+            self.assertIs(rows[1]['ref'], builder['target0'])
+            self.assertListEqual(rows['s'].tolist(), ['a1', 'a3'])
+            row = builder['table'].data[2]
+            self.assertIs(row['ref'], builder['target2'])
+            self.assertEqual(row['s'], 'a2')
+            self.assertEqual(len(builder['table'].data[5:5]), 0)
+
+
+class TestHDF5IOSelectiveRead(TestCase):
+
+    def setUp(self):
+        self.path = get_temp_filepath()
+        foofile = FooFile(buckets=[FooBucket('bucket1', [Foo('foo1', [1, 2, 3], "I am foo1", 17, 3.14),
+                                                         Foo('foo2', [4, 5], "I am foo2", 34, 6.28)]),
+                                   FooBucket('bucket2', [Foo('foo3', [6], "I am foo3", 51, 9.42)])])
+        foofile.foo_link = foofile.buckets['bucket2'].foos['foo3']
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='w') as io:
+            io.write(foofile)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def read(self, **kwargs):
+        """Read the file with the given filters and return the names of the foos in each bucket"""
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r') as io:
+            foofile = io.read(**kwargs)
+            return {name: sorted(bucket.foos) for name, bucket in foofile.buckets.items()}
+
+    def test_include_path(self):
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r') as io:
+            foofile = io.read(include=['/buckets/bucket1'])
+            self.assertListEqual(list(foofile.buckets), ['bucket1'])
+            self.assertListEqual(sorted(foofile.buckets['bucket1'].foos), ['foo1', 'foo2'])
+            builder = io.read_builder()
+            self.assertNotIn('bucket2', builder['buckets'])
+            # the link to the pruned foo is read when it is first accessed
+            link_target = builder['links'].links['foo_link'].builder
+            self.assertIsInstance(link_target, LazyGroupBuilder)
+            self.assertListEqual(foofile.foo_link.my_data[:].tolist(), [6])
+            self.assertTrue(link_target.loaded)
+
+    def test_include_path_glob(self):
+        self.assertDictEqual(self.read(include=['/buckets/*/foo_holder/foo3']), {'bucket2': ['foo3']})
+
+    def test_include_data_type(self):
+        self.assertDictEqual(self.read(include=['FooBucket']), {'bucket1': ['foo1', 'foo2'], 'bucket2': ['foo3']})
+
+    def test_exclude(self):
+        self.assertDictEqual(self.read(exclude=['/buckets/bucket2']), {'bucket1': ['foo1', 'foo2']})
+        self.assertDictEqual(self.read(include=['FooBucket'], exclude=['/buckets/bucket1/foo_holder/foo2']),
+                             {'bucket1': ['foo1'], 'bucket2': ['foo3']})
+
+    def test_exclude_data_type(self):
+        self.assertDictEqual(self.read(exclude=['Foo']), {'bucket1': [], 'bucket2': []})
+
+    def test_path_filters_do_not_read_data_types(self):
+        """Test that the data types of the objects are not read when only path globs are given"""
+        with patch.object(HDF5IO, '_HDF5IO__get_data_type') as get_data_type:
+            self.assertDictEqual(self.read(include=['/buckets/bucket1'], exclude=['/buckets/bucket1/*/foo2']),
+                                 {'bucket1': ['foo1']})
+        get_data_type.assert_not_called()
+
+    def test_excluded_groups_not_visited(self):
+        """Test that the objects in excluded groups and in included groups are not visited before the read"""
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r') as io:
+            selection = getattr(io, '_HDF5IO__select_read_paths')(('/buckets/bucket1', ), ('/buckets/bucket2', ))
+        self.assertDictEqual(selection, {'/': 'kept', '/buckets': 'kept', '/buckets/bucket1': 'included',
+                                         '/buckets/bucket2': 'pruned'})
+
+    def test_read_again_different_filters(self):
+        with HDF5IO(self.path, manager=get_foo_buildmanager(), mode='r') as io:
+            foofile = io.read(include=['FooBucket'])
+            self.assertIs(io.read(include=['FooBucket']), foofile)
+            msg = ("Cannot read file %s with include=None and exclude=None after it was read with different filters. "
+                   "Please use a new HDF5IO object." % self.path)
+            with self.assertRaisesWith(UnsupportedOperation, msg):
+                io.read()
+
+
 class TestBuildWriteLinkToLink(TestCase):
 
     def setUp(self):
@@ -3304,6 +4158,82 @@ class TestExport(TestCase):
                 self.assertEqual(read_bucket2.baz_cpd_data.data[i][0], i)
                 self.assertIs(read_bucket2.baz_cpd_data.data[i][1], read_bucket2.bazs[baz_name])
 
+    def _copy_logs(self, export_io, src_io, **kwargs):
+        """Export src_io and return the paths of the groups that were copied without being rebuilt"""
+        with self.assertLogs(export_io.logger, level='DEBUG') as logs:
+            export_io.export(src_io=src_io, **kwargs)
+        prefix = 'DEBUG:%s:    Copying unmodified group ' % export_io.logger.name
+        return [line[len(prefix):].rsplit("'", 2)[1] for line in logs.output if line.startswith(prefix)]
+
+    def test_copy_unmodified_group_refs(self):
+        """Test that exporting an unmodified group copies it and remaps the references within it."""
+        target = GroupBuilder('target')
+        inner = GroupBuilder('inner')
+        cpd_type = [{'name': 'x', 'dtype': 'int'}, {'name': 'ref', 'dtype': 'object'}]
+        group1 = GroupBuilder('group1', groups={'inner': inner}, datasets={
+            'refs': DatasetBuilder('refs', [ReferenceBuilder(inner), ReferenceBuilder(target)], dtype='object'),
+            'cpd': DatasetBuilder('cpd', [(1, ReferenceBuilder(target)), (2, ReferenceBuilder(inner))],
+                                  dtype=cpd_type),
+        }, attributes={'ref_attr': ReferenceBuilder(target)})
+        root = GroupBuilder('root', groups={'group1': group1, 'group2': GroupBuilder('group2', groups={
+            'target': target})})
+        with HDF5IO(self.paths[0], mode='w') as write_io:
+            write_io.write_builder(root)
+        with File(self.paths[0], 'a') as f:
+            f['group1'].attrs.create('refs_attr', [f['group2/target'].ref, f['group1/inner'].ref],
+                                     dtype=h5py.ref_dtype)
+
+        with HDF5IO(self.paths[0], mode='r') as read_io:
+            with HDF5IO(self.paths[1], mode='w') as export_io:
+                self.assertListEqual(sorted(self._copy_logs(export_io, read_io)), ['/group1', '/group2'])
+
+        with File(self.paths[1], 'r') as f:
+            group1 = f['group1']
+            self.assertListEqual([f[ref].name for ref in group1['refs'][:]], ['/group1/inner', '/group2/target'])
+            self.assertListEqual([(x, f[ref].name) for x, ref in group1['cpd'][:]],
+                                 [(1, '/group2/target'), (2, '/group1/inner')])
+            self.assertEqual(f[group1.attrs['ref_attr']].name, '/group2/target')
+            self.assertListEqual([f[ref].name for ref in group1.attrs['refs_attr']],
+                                 ['/group2/target', '/group1/inner'])
+
+    def test_copy_unmodified_group_external_link(self):
+        """Test that exporting a group with an external link rebuilds the group instead of copying it."""
+        with File(self.paths[2], 'w') as f:
+            f.create_dataset('data', data=[1, 2, 3])
+        with File(self.paths[0], 'w') as f:
+            f.create_group('group1')['link'] = ExternalLink(self.paths[2], '/data')
+            f.create_group('group2').create_dataset('data', data=[1, 2, 3])
+
+        with HDF5IO(self.paths[0], mode='r') as read_io:
+            with HDF5IO(self.paths[1], mode='w') as export_io:
+                self.assertListEqual(self._copy_logs(export_io, read_io), ['/group2'])
+
+        with File(self.paths[1], 'r') as f:
+            self.assertIsInstance(f['group1'].get('link', getlink=True), ExternalLink)
+            np.testing.assert_array_equal(f['group1/link'][:], [1, 2, 3])
+            np.testing.assert_array_equal(f['group2/data'][:], [1, 2, 3])
+
+    def test_copy_unmodified_group_modified_sibling(self):
+        """Test that exporting a modified container rebuilds it and copies its unmodified siblings."""
+        foo1 = Foo('foo1', [1, 2, 3, 4, 5], "I am foo1", 17, 3.14)
+        foo2 = Foo('foo2', [6, 7, 8], "I am foo2", 34, 6.28)
+        foofile = FooFile(buckets=[FooBucket('bucket1', [foo1]), FooBucket('bucket2', [foo2])])
+
+        with HDF5IO(self.paths[0], manager=get_foo_buildmanager(), mode='w') as write_io:
+            write_io.write(foofile)
+
+        with HDF5IO(self.paths[0], manager=get_foo_buildmanager(), mode='r') as read_io:
+            read_foofile = read_io.read()
+            read_foofile.buckets['bucket2'].remove_foo('foo2')
+            with HDF5IO(self.paths[1], mode='w') as export_io:
+                copied = self._copy_logs(export_io, read_io, container=read_foofile)
+                self.assertListEqual(copied, ['/buckets/bucket1'])
+
+        with HDF5IO(self.paths[1], manager=get_foo_buildmanager(), mode='r') as read_io:
+            read_foofile2 = read_io.read()
+            self.assertContainerEqual(read_foofile2.buckets['bucket1'].foos['foo1'], foo1, ignore_hdmf_attrs=True)
+            self.assertDictEqual(read_foofile2.buckets['bucket2'].foos, {})
+
     def test_non_manager_container(self):
         """Test that exporting with a src_io without a manager raises an error."""
         foo1 = Foo('foo1', [1, 2, 3, 4, 5], "I am foo1", 17, 3.14)
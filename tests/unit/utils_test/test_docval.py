@@ -1,7 +1,11 @@
 import numpy as np
 from hdmf.testing import TestCase
+import sys
+import threading
+
+import hdmf.utils
 from hdmf.utils import (docval, fmt_docval_args, get_docval, getargs, popargs, AllowPositional, get_docval_macro,
-                        docval_macro, popargs_to_dict, call_docval_func)
+                        docval_macro, popargs_to_dict, call_docval_func, trusted_calls, in_trusted_call)
 
 
 class MyTestClass(object):
@@ -827,6 +831,142 @@ class TestDocValidator(TestCase):
             def method(self, **kwargs):
                 pass
 
+    def test_mutable_default_copied(self):
+        """Test that a mutable default value is copied on every call"""
+        @docval({'name': 'arg1', 'type': list, 'doc': 'an arg', 'default': list()})
+        def method(self, **kwargs):
+            return popargs('arg1', kwargs)
+
+        first = method(self)
+        first.append(1)
+        self.assertEqual(method(self), [])
+
+    def test_numpy_scalar_types(self):
+        """Test that numpy scalars pass the checks for builtin numeric types and the 'uint' type"""
+        @docval({'name': 'arg1', 'type': int, 'doc': 'an arg'},
+                {'name': 'arg2', 'type': float, 'doc': 'an arg'},
+                {'name': 'arg3', 'type': 'uint', 'doc': 'an arg'},
+                {'name': 'arg4', 'type': bool, 'doc': 'an arg'})
+        def method(self, **kwargs):
+            return kwargs
+
+        res = method(self, np.int32(1), np.float32(1.), np.uint8(1), np.bool_(True))
+        self.assertDictEqual(res, {'arg1': 1, 'arg2': 1., 'arg3': 1, 'arg4': True})
+
+        msg = "TestDocValidator.test_numpy_scalar_types.<locals>.method: incorrect type for 'arg3' (got 'int8', " \
+              "expected 'uint')"
+        with self.assertRaisesWith(TypeError, msg):
+            method(self, np.int32(1), np.float32(1.), np.int8(1), np.bool_(True))
+
+    def test_kwarg_ordering_allow_extra(self):
+        """Test that parsed arguments are ordered by the docval specification followed by extra arguments"""
+        res = self.test_obj.basic_add2_kw_allow_extra(extra='extra', arg2=100, arg1='a string')
+        self.assertListEqual(list(res), ['arg1', 'arg2', 'arg3', 'extra'])
+
+    def test_type_path(self):
+        """Test that a type given as the path of a class only matches instances of that class"""
+        import pandas as pd
+
+        @docval({'name': 'arg1', 'type': 'pandas.DataFrame', 'doc': 'an arg'}, is_method=False)
+        def method(**kwargs):
+            return popargs('arg1', kwargs)
+
+        class DataFrame:
+            pass
+
+        df = pd.DataFrame()
+        self.assertIs(method(df), df)
+        msg = ("TestDocValidator.test_type_path.<locals>.method: incorrect type for 'arg1' (got 'DataFrame', "
+               "expected 'DataFrame')")
+        with self.assertRaisesWith(TypeError, msg):
+            method(DataFrame())
+        self.assertIn(':py:class:`~pandas.DataFrame`', method.__doc__)
+
+    def test_type_path_not_imported(self):
+        """Test that a type given as the path of a class in a module that is not imported does not import it"""
+        @docval({'name': 'arg1', 'type': 'hdmf_not_a_module.Thing', 'doc': 'an arg'}, is_method=False)
+        def method(**kwargs):
+            return popargs('arg1', kwargs)
+
+        class Thing:
+            pass
+
+        with self.assertRaises(TypeError):
+            method(Thing())
+        self.assertNotIn('hdmf_not_a_module', sys.modules)
+
+
+class TestTrustedCalls(TestCase):
+
+    def setUp(self):
+        self.test_obj = MyTestClass()
+
+    def test_skip_type_and_shape_checks(self):
+        """Test that type and shape checks are skipped within trusted_calls(True)"""
+        @docval({'name': 'arg1', 'type': 'array_data', 'doc': 'an arg', 'shape': (None, 2)},
+                {'name': 'arg2', 'type': int, 'doc': 'an arg', 'default': 1})
+        def method(self, **kwargs):
+            return kwargs
+
+        with trusted_calls(True):
+            self.assertTrue(in_trusted_call())
+            self.assertDictEqual(method(self, 'a string', arg2='b'), {'arg1': 'a string', 'arg2': 'b'})
+            self.assertDictEqual(method(self, [1, 2, 3]), {'arg1': [1, 2, 3], 'arg2': 1})
+        self.assertFalse(in_trusted_call())
+        with self.assertRaises(TypeError):
+            method(self, 'a string')
+
+    def test_binding_errors(self):
+        """Test that missing and unrecognized arguments are still errors within trusted_calls(True)"""
+        msg = "MyTestClass.basic_add2: missing argument 'arg2'"
+        with trusted_calls(True):
+            with self.assertRaisesWith(TypeError, msg):
+                self.test_obj.basic_add2('a string')
+            msg = "MyTestClass.basic_add2_kw: unrecognized argument: 'arg4'"
+            with self.assertRaisesWith(TypeError, msg):
+                self.test_obj.basic_add2_kw('a string', 1, arg4=2)
+
+    def test_nested(self):
+        """Test that nested trusted_calls contexts restore the previous setting on exit"""
+        with trusted_calls(True):
+            with trusted_calls(False):
+                self.assertFalse(in_trusted_call())
+                with self.assertRaises(TypeError):
+                    self.test_obj.basic_add2('a string', 'not an int')
+            self.assertTrue(in_trusted_call())
+        self.assertFalse(in_trusted_call())
+
+    def test_nested_default(self):
+        """Test that a nested trusted_calls() context keeps the setting of an enclosing trusted_calls(True)"""
+        with trusted_calls(True):
+            with trusted_calls():
+                self.assertTrue(in_trusted_call())
+                self.assertDictEqual(self.test_obj.basic_add2('a string', 'not an int'),
+                                     {'arg1': 'a string', 'arg2': 'not an int'})
+            self.assertTrue(in_trusted_call())
+        self.assertFalse(in_trusted_call())
+
+    def test_default_disabled(self):
+        """Test that trusted_calls() does not skip checks unless the environment variable is set"""
+        with trusted_calls():
+            self.assertFalse(in_trusted_call())
+
+    def test_thread_local(self):
+        """Test that checks are not skipped in other threads"""
+        errors = list()
+
+        def call():
+            try:
+                self.test_obj.basic_add2('a string', 'not an int')
+            except TypeError as e:
+                errors.append(e)
+
+        with trusted_calls(True):
+            thread = threading.Thread(target=call)
+            thread.start()
+            thread.join()
+        self.assertEqual(len(errors), 1)
+
 
 class TestDocValidatorChain(TestCase):
 
@@ -1117,3 +1257,20 @@ class TestMacro(TestCase):
             pass
 
         self.assertTupleEqual(get_docval_macro('dummy'), (Dummy2, ))
+
+    def test_macro_registration_invalidates_type_checks(self):
+        """Test that registering a type with a macro updates type checks that were already made for that type"""
+        @docval({'name': 'arg1', 'type': 'test_late_macro', 'doc': 'an arg'}, is_method=False)
+        def method(**kwargs):
+            return popargs('arg1', kwargs)
+
+        class Dummy3:
+            pass
+
+        with self.assertRaises(TypeError):
+            method(Dummy3())
+
+        docval_macro('test_late_macro')(Dummy3)
+        self.addCleanup(vars(hdmf.utils)['__macros'].pop, 'test_late_macro')
+        obj = Dummy3()
+        self.assertIs(method(obj), obj)